@@ -0,0 +1,14 @@
+# coding=utf-8
+"""
+Performance benchmarks for PyOTA.
+
+Run the suite from the repository root, and save the results::
+
+   python -m benchmarks.run --output baseline.json
+
+After making changes, run it again and compare against the baseline::
+
+   python -m benchmarks.run --output candidate.json --compare baseline.json
+
+Benchmarks are defined in :py:mod:`benchmarks.cases`.
+"""
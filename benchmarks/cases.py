@@ -0,0 +1,338 @@
+# coding=utf-8
+"""
+Benchmark definitions.
+
+Each benchmark is a function that does any (untimed) setup work, and
+returns a zero-argument callable; the runner measures how long the
+callable takes.
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from codecs import decode, encode
+from collections import OrderedDict
+from typing import Callable, Dict
+
+from six import binary_type
+
+from cornode import Address, Bundle, ProposedBundle, ProposedTransaction, \
+  Tag, TransactionTrytes, TryteString, cornode
+from cornode.adapter import MockAdapter
+from cornode.adapter.local import LocalTangleAdapter
+from cornode.crypto import Curl, HASH_LENGTH
+from cornode.crypto.addresses import AddressGenerator
+from cornode.crypto.pycurl import Curl as PythonCurl
+from cornode.crypto.signing import KeyGenerator, SignatureFragmentGenerator, \
+  validate_signature_fragments
+from cornode.crypto.types import Seed
+from cornode.transaction import BundleValidator, Transaction
+
+__all__ = [
+  'benchmarks',
+]
+
+
+benchmarks = OrderedDict() # type: Dict[str, Callable[[], Callable[[], None]]]
+"""
+Registered benchmarks, indexed by name.
+"""
+
+
+def benchmark(name):
+  # type: (str) -> Callable
+  """
+  Decorator that registers a benchmark.
+  """
+  def register(setup):
+    benchmarks[name] = setup
+    return setup
+
+  return register
+
+
+# A fixed seed, so that every run does exactly the same work.
+# noinspection SpellCheckingInspection
+SEED = Seed(
+  b'TESTVALUE9DONTUSEINPRODUCTION99999GFCPDB'
+  b'DJETWLRWYJMHHSUCPVYKQBAYZMTJJVZYTCNXVDF9Q'
+)
+
+# noinspection SpellCheckingInspection
+RECIPIENT = Address(
+  b'TESTVALUE9DONTUSEINPRODUCTION99999FBFFTG'
+  b'QFWEHEL9KCAFXBJBXGE9HID9XCOHFIDABHDG9AHDR'
+)
+
+# noinspection SpellCheckingInspection
+TAG = Tag(b'PYOTA9BENCHMARK')
+
+
+def _create_bundle(inputs=0):
+  # type: (int) -> ProposedBundle
+  """
+  Creates a finalized bundle that spends from the specified number of
+  inputs (unsigned).
+  """
+  bundle = ProposedBundle()
+
+  bundle.add_transaction(ProposedTransaction(
+    address = RECIPIENT,
+    message = TryteString.from_string('Hello, benchmark!'),
+    tag     = TAG,
+    value   = inputs * 10,
+  ))
+
+  if inputs:
+    bundle.add_inputs([
+      Address(
+        trytes    = addy,
+        balance   = 10,
+        key_index = i,
+      )
+        for (i, addy) in enumerate(AddressGenerator(SEED).get_addresses(0, inputs))
+    ])
+
+  bundle.finalize()
+  return bundle
+
+
+def _signed_bundle():
+  # type: () -> Bundle
+  """
+  Creates a signed bundle with one input.
+  """
+  bundle = _create_bundle(inputs=1)
+  bundle.sign_inputs(KeyGenerator(SEED))
+
+  return Bundle.from_tryte_strings(bundle.as_tryte_strings())
+
+
+##
+# Curl
+def _absorb_squeeze(curl_type):
+  # type: (type) -> Callable[[], None]
+  """
+  Hashes a transaction's worth of trits, using the specified Curl
+  implementation.
+  """
+  trits = TransactionTrytes(b'TESTVALUE9DONTUSEINPRODUCTION').as_trits()
+
+  def run():
+    sponge = curl_type()
+    sponge.absorb(trits)
+    sponge.squeeze([0] * HASH_LENGTH)
+
+  return run
+
+
+@benchmark('curl.absorb_squeeze')
+def curl_absorb_squeeze():
+  """
+  Hashing a transaction's worth of trits, using the Curl implementation
+  that the library uses (NumPy-backed, if NumPy is installed).
+  """
+  return _absorb_squeeze(Curl)
+
+
+@benchmark('curl.absorb_squeeze.pure_python')
+def curl_absorb_squeeze_pure_python():
+  """
+  Hashing a transaction's worth of trits, using the pure-Python Curl
+  implementation.
+  """
+  return _absorb_squeeze(PythonCurl)
+
+
+@benchmark('curl.hash_many')
+def curl_hash_many():
+  """
+  Hashing a bundle's worth of transactions at once.
+  """
+  trits = [
+    TransactionTrytes(TryteString.from_string('Transaction {0}'.format(i)))
+      .as_trits()
+        for i in range(8)
+  ]
+
+  return lambda: Curl.hash_many(trits)
+
+
+##
+# Keys and addresses
+@benchmark('signing.get_keys.low_index')
+def get_keys_low_index():
+  generator = KeyGenerator(SEED)
+  return lambda: generator.get_keys(start=0, iterations=2)
+
+
+@benchmark('signing.get_keys.high_index')
+def get_keys_high_index():
+  generator = KeyGenerator(SEED)
+  return lambda: generator.get_keys(start=100000, iterations=2)
+
+
+@benchmark('addresses.get_addresses')
+def get_addresses():
+  generator = AddressGenerator(SEED)
+  return lambda: generator.get_addresses(start=0, count=2)
+
+
+@benchmark('private_key.get_digest')
+def get_digest():
+  key = KeyGenerator(SEED).get_keys(start=0, iterations=2)[0]
+  return key.get_digest
+
+
+##
+# Signatures
+@benchmark('signing.signature_fragment_generator')
+def signature_fragment_generator():
+  key         = KeyGenerator(SEED).get_keys(start=0, iterations=2)[0]
+  bundle_hash = _create_bundle().hash
+
+  return lambda: list(SignatureFragmentGenerator(key, bundle_hash))
+
+
+@benchmark('signing.validate_signature_fragments')
+def validate_signature_fragments_():
+  transactions = _signed_bundle()
+
+  # The input transactions contain the signature.
+  fragments = [
+    t.signature_message_fragment
+      for t in transactions
+      if t.address == transactions[1].address
+  ]
+
+  def run():
+    assert validate_signature_fragments(
+      fragments   = fragments,
+      hash_       = transactions[0].bundle_hash,
+      public_key  = transactions[1].address,
+    )
+
+  return run
+
+
+##
+# Transactions and bundles
+@benchmark('transaction.from_tryte_string')
+def from_tryte_string():
+  trytes = _create_bundle().as_tryte_strings()[0]
+  return lambda: Transaction.from_tryte_string(trytes)
+
+
+@benchmark('bundle.validator')
+def bundle_validator():
+  bundle = _signed_bundle()
+
+  def run():
+    assert BundleValidator(bundle).is_valid()
+
+  return run
+
+
+@benchmark('bundle.validate_bundles')
+def bundle_validate_bundles():
+  """
+  Validating several bundles at once, so that their signatures are
+  checked together.
+  """
+  bundles = [_signed_bundle() for _ in range(4)]
+
+  def run():
+    assert all(v.is_valid() for v in BundleValidator.validate_bundles(bundles))
+
+  return run
+
+
+@benchmark('proposed_bundle.finalize')
+def proposed_bundle_finalize():
+  address = AddressGenerator(SEED).get_addresses(0)[0]
+
+  def run():
+    bundle = ProposedBundle()
+    bundle.add_transaction(ProposedTransaction(
+      address = RECIPIENT,
+      tag     = TAG,
+      value   = 10,
+    ))
+    bundle.add_inputs([Address(address, balance=10, key_index=0)])
+    bundle.finalize()
+
+  return run
+
+
+@benchmark('proposed_bundle.sign_inputs')
+def proposed_bundle_sign_inputs():
+  key_generator = KeyGenerator(SEED)
+  bundle        = _create_bundle(inputs=2)
+
+  return lambda: bundle.sign_inputs(key_generator)
+
+
+##
+# Codecs
+@benchmark('codecs.trytes.encode')
+def trytes_encode():
+  data = binary_type(bytearray(range(256))) * 16
+  return lambda: encode(data, 'trytes')
+
+
+@benchmark('codecs.trytes.decode')
+def trytes_decode():
+  trytes = encode(binary_type(bytearray(range(256))) * 16, 'trytes')
+  return lambda: decode(trytes, 'trytes')
+
+
+##
+# Extended commands
+@benchmark('commands.get_new_addresses')
+def get_new_addresses():
+  """
+  Scanning for the first unused address, against a mock adapter.
+  """
+  api = cornode(MockAdapter(), SEED)
+
+  def run():
+    api.adapter.seed_response('findTransactions', {'hashes': []})
+    api.get_new_addresses()
+
+  return run
+
+
+@benchmark('commands.send_transfer')
+def send_transfer():
+  """
+  Sending a zero-value transfer to an in-memory Tangle.
+  """
+  api = cornode(LocalTangleAdapter(), SEED)
+
+  transfers = [
+    ProposedTransaction(
+      address = RECIPIENT,
+      message = TryteString.from_string('Hello, benchmark!'),
+      tag     = TAG,
+      value   = 0,
+    ),
+  ]
+
+  return lambda: api.send_transfer(depth=3, transfers=transfers)
+
+
+@benchmark('commands.get_transfers')
+def get_transfers():
+  """
+  Loading the bundles for a seed's first few addresses from an
+  in-memory Tangle.
+  """
+  api = cornode(LocalTangleAdapter(), SEED)
+
+  for addy in AddressGenerator(SEED).get_addresses(0, 3):
+    for _ in range(3):
+      api.send_transfer(
+        depth     = 3,
+        transfers = [ProposedTransaction(address=addy, tag=TAG, value=0)],
+      )
+
+  return lambda: api.get_transfers(start=0, stop=3)
@@ -0,0 +1,212 @@
+# coding=utf-8
+"""
+Runs the PyOTA benchmark suite.
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import json
+import platform
+from argparse import ArgumentParser
+from datetime import datetime
+from fnmatch import fnmatch
+from io import open
+from sys import argv, exit
+from timeit import default_timer
+from typing import Callable, Dict, List, Optional, Text
+
+from cornode import __version__
+from six import text_type
+
+from benchmarks.cases import benchmarks
+
+
+def main(output, compare, filters, repeat, min_time, threshold):
+  # type: (Optional[Text], Optional[Text], List[Text], int, float, float) -> int
+  results = {} # type: Dict[Text, dict]
+
+  for name, setup in benchmarks.items():
+    if filters and not any(fnmatch(name, f) for f in filters):
+      continue
+
+    results[name] = measure(setup(), repeat, min_time)
+
+    print('{name:<40} {best:>12}  (x{number})'.format(
+      name    = name,
+      best    = format_duration(results[name]['best']),
+      number  = results[name]['number'],
+    ))
+
+  report = {
+    'meta': {
+      'cornode':    __version__,
+      'date':       datetime.utcnow().isoformat(),
+      'platform':   platform.platform(),
+      'python':     platform.python_version(),
+      'repeat':     repeat,
+    },
+
+    'results': results,
+  }
+
+  if output:
+    with open(output, 'w', encoding='utf-8') as f:
+      f.write(text_type(json.dumps(report, indent=2, sort_keys=True)))
+
+  if compare:
+    with open(compare, encoding='utf-8') as f:
+      baseline = json.load(f)
+
+    return print_comparison(baseline['results'], results, threshold)
+
+  return 0
+
+
+def measure(run, repeat, min_time):
+  # type: (Callable[[], None], int, float) -> dict
+  """
+  Measures how long a benchmark takes.
+
+  The benchmark is run enough times per round to take at least
+  ``min_time`` seconds, and the fastest round is used (slower rounds
+  are usually caused by other processes, not the code being measured).
+  """
+  # Warm up (and find out roughly how long a single run takes).
+  start = default_timer()
+  run()
+  elapsed = default_timer() - start
+
+  number = max(1, int(min_time / elapsed)) if elapsed else 1000
+
+  timings = [] # type: List[float]
+  for _ in range(repeat):
+    start = default_timer()
+    for _ in range(number):
+      run()
+    timings.append((default_timer() - start) / number)
+
+  timings.sort()
+
+  return {
+    'best':     timings[0],
+    'median':   timings[len(timings) // 2],
+    'number':   number,
+    'timings':  timings,
+  }
+
+
+def print_comparison(baseline, candidate, threshold):
+  # type: (Dict[Text, dict], Dict[Text, dict], float) -> int
+  """
+  Compares benchmark results against a baseline.
+
+  :return:
+    Exit code: 1 if any benchmark is slower than the baseline by more
+    than ``threshold``, 0 otherwise.
+  """
+  print('')
+  print('{name:<40} {old:>12} {new:>12} {change:>8}'.format(
+    name    = 'benchmark',
+    old     = 'baseline',
+    new     = 'candidate',
+    change  = 'change',
+  ))
+
+  regressions = 0
+
+  for name in sorted(candidate):
+    if name not in baseline:
+      continue
+
+    old = baseline[name]['best']
+    new = candidate[name]['best']
+
+    change = (new - old) / old
+
+    flag = ''
+    if change > threshold:
+      flag = '  REGRESSION'
+      regressions += 1
+
+    print('{name:<40} {old:>12} {new:>12} {change:>+7.1%}{flag}'.format(
+      name    = name,
+      old     = format_duration(old),
+      new     = format_duration(new),
+      change  = change,
+      flag    = flag,
+    ))
+
+  return 1 if regressions else 0
+
+
+def format_duration(seconds):
+  # type: (float) -> Text
+  """
+  Formats a duration using a sensible unit.
+  """
+  for (unit, scale) in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+    if seconds * scale >= 1:
+      return '{value:.3f} {unit}'.format(value=seconds * scale, unit=unit)
+
+  return '{value:.3f} ns'.format(value=seconds * 1e9)
+
+
+if __name__ == '__main__':
+  parser = ArgumentParser(
+    description = __doc__,
+    epilog      = 'PyOTA v{version}'.format(version=__version__),
+  )
+
+  parser.add_argument(
+    '--output',
+      type    = text_type,
+      default = None,
+      help    = 'Write results to this JSON file.',
+  )
+
+  parser.add_argument(
+    '--compare',
+      type    = text_type,
+      default = None,
+
+      help =
+        'Compare results against a JSON file from a previous run.  '
+        'Exits with status 1 if any benchmark regressed.',
+  )
+
+  parser.add_argument(
+    '--filter',
+      dest    = 'filters',
+      action  = 'append',
+      default = [],
+
+      help =
+        'Only run benchmarks whose names match this pattern '
+        '(e.g., "signing.*").  Can be specified multiple times.',
+  )
+
+  parser.add_argument(
+    '--repeat',
+      type    = int,
+      default = 5,
+      help    = 'Number of rounds to run each benchmark (default 5).',
+  )
+
+  parser.add_argument(
+    '--min-time',
+      type    = float,
+      default = 0.2,
+      help    = 'Minimum duration of each round, in seconds (default 0.2).',
+  )
+
+  parser.add_argument(
+    '--threshold',
+      type    = float,
+      default = 0.1,
+
+      help =
+        'Slowdown (relative to the baseline) that counts as a '
+        'regression (default 0.1 = 10%%).',
+  )
+
+  exit(main(**vars(parser.parse_args(argv[1:]))))
@@ -33,6 +33,11 @@ setup(
     'typing',
   ],
 
+  extras_require = {
+    # Vectorized Curl implementation.
+    'numpy': ['numpy'],
+  },
+
   test_suite    = 'test',
   test_loader   = 'nose.loader:TestLoader',
   tests_require = [
@@ -8,9 +8,12 @@ from collections import deque
 from inspect import isabstract as is_abstract
 from logging import DEBUG, Logger
 from socket import getdefaulttimeout as get_default_timeout
-from typing import Container, Dict, List, Optional, Text, Tuple, Union
+from threading import Lock
+from typing import Callable, Container, Dict, List, Optional, Text, \
+  Tuple, Union
 
-from requests import Response, codes, request
+from requests import Response, Session, codes, request
+from requests.adapters import HTTPAdapter as RequestsHttpAdapter
 from cornode.exceptions import with_context
 from cornode.json import JsonEncoder
 from six import PY2, binary_type, moves as compat, text_type, with_metaclass
@@ -19,6 +22,7 @@ __all__ = [
   'AdapterSpec',
   'BadApiResponse',
   'InvalidUri',
+  'RequestHook',
 ]
 
 if PY2:
@@ -32,6 +36,7 @@ if PY2:
 
 # Custom types for type hints and docstrings.
 AdapterSpec = Union[Text, 'BaseAdapter']
+RequestHook = Callable[[dict], None]
 
 # Load SplitResult for IDE type hinting and autocompletion.
 if PY2:
@@ -41,6 +46,12 @@ else:
   # noinspection PyCompatibility,PyUnresolvedReferences
   from urllib.parse import SplitResult
 
+try:
+  from time import monotonic as clock
+except ImportError:
+  # :bc: py2k doesn't have :py:func:`time.monotonic`.
+  from time import time as clock
+
 
 class BadApiResponse(ValueError):
   """
@@ -138,11 +149,22 @@ class BaseAdapter(with_metaclass(AdapterMeta)):
   type.
   """
 
+  is_async = False
+  """
+  Whether :py:meth:`send_request` is a coroutine.
+
+  If ``True``, commands sent through this adapter will return
+  coroutines instead of responses (see :py:mod:`cornode.aio`).
+  """
+
   def __init__(self):
     super(BaseAdapter, self).__init__()
 
     self._logger = None # type: Logger
 
+    self._before_hooks  = [] # type: List[RequestHook]
+    self._after_hooks   = [] # type: List[RequestHook]
+
   @abstract_method
   def send_request(self, payload, **kwargs):
     # type: (dict, dict) -> dict
@@ -176,23 +198,179 @@ class BaseAdapter(with_metaclass(AdapterMeta)):
     self._logger = logger
     return self
 
+  def add_hook(self, before=None, after=None):
+    # type: (Optional[RequestHook], Optional[RequestHook]) -> BaseAdapter
+    """
+    Registers callbacks that are invoked around each HTTP request.
+
+    :param before:
+      Called before the request is sent, with a dict containing:
+
+      - ``command``: Name of the API command.
+      - ``request_bytes``: Size of the request body.
+
+    :param after:
+      Called after the response is received (or the request fails),
+      with the same dict, plus:
+
+      - ``duration``: Number of seconds the request took.
+      - ``error``: The exception that was raised, if any.
+      - ``response_bytes``: Size of the response body (``None`` if the
+        request failed).
+      - ``status``: HTTP status code (``None`` if the request failed).
+
+    Hooks are invoked in the thread (or event loop) that sends the
+    request, so they should return quickly.
+    """
+    if before is not None:
+      self._before_hooks.append(before)
+
+    if after is not None:
+      self._after_hooks.append(after)
+
+    return self
+
+  def _before_request(self, command, request_bytes):
+    # type: (Text, int) -> Optional[dict]
+    """
+    Invokes the "before" hooks for a request.
+
+    :return:
+      Info to pass to :py:meth:`_after_request`, or ``None`` if no hooks
+      are registered.
+    """
+    if not (self._before_hooks or self._after_hooks):
+      return None
+
+    info = {
+      'command':        command,
+      'request_bytes':  request_bytes,
+      'start':          clock(),
+    }
+
+    for hook in self._before_hooks:
+      hook(info)
+
+    return info
+
+  def _after_request(self, info, response=None, error=None):
+    # type: (Optional[dict], Optional[Response], Optional[Exception]) -> None
+    """
+    Invokes the "after" hooks for a request.
+    """
+    if info is None:
+      return
+
+    info['duration']  = clock() - info['start']
+    info['error']     = error
+
+    if response is None:
+      info['response_bytes']  = None
+      info['status']          = None
+    else:
+      info['response_bytes']  = len(response.content)
+      info['status']          = response.status_code
+
+    for hook in self._after_hooks:
+      hook(info)
+
+  def _is_logging(self, level):
+    # type: (int) -> bool
+    """
+    Returns whether the instance's logger will accept messages at the
+    specified level.
+
+    Use this to avoid formatting expensive log messages that would just
+    be thrown away.
+    """
+    return bool(self._logger) and self._logger.isEnabledFor(level)
+
   def _log(self, level, message, context=None):
     # type: (int, Text, Optional[dict]) -> None
     """
     Sends a message to the instance's logger, if configured.
     """
-    if self._logger:
+    if self._is_logging(level):
       self._logger.log(level, message, extra={'context': context or {}})
 
 
 class HttpAdapter(BaseAdapter):
   """
   Sends standard HTTP requests.
+
+  By default, every request opens a new connection to the node.  For
+  applications that send a lot of requests (e.g., ``get_transfers``),
+  the adapter can keep connections open and reuse them instead::
+
+     # Using constructor arguments:
+     adapter = HttpAdapter('https://localhost:14265', pooled=True)
+
+     # Using URI options:
+     adapter = HttpAdapter('https://localhost:14265?pooled=1&pool_maxsize=4')
+
+  Pool options are removed from the URI before it is sent to the node.
   """
   supported_protocols = ('http', 'https',)
 
-  def __init__(self, uri):
-    # type: (Union[Text, SplitResult]) -> None
+  DEFAULT_POOL_CONNECTIONS = 10
+  """
+  Default number of hosts that the connection pool will keep
+  connections open for.
+  """
+
+  DEFAULT_POOL_MAXSIZE = 10
+  """
+  Default number of connections that the connection pool will keep
+  open for each host.
+  """
+
+  POOL_OPTIONS = {
+    'pooled':           lambda value: value.lower() in ('1', 'true', 'yes'),
+    'pool_connections': int,
+    'pool_maxsize':     int,
+    'idle_timeout':     float,
+  }
+  """
+  Options that can be specified in the URI query string, and how to
+  parse them.
+  """
+
+  def __init__(
+      self,
+      uri,
+      pooled            = None,
+      pool_connections  = None,
+      pool_maxsize      = None,
+      idle_timeout      = None,
+  ):
+    # type: (Union[Text, SplitResult], Optional[bool], Optional[int], Optional[int], Optional[float]) -> None
+    """
+    :param uri:
+      URI of the node.
+
+    :param pooled:
+      Whether to keep connections to the node open between requests.
+
+      Defaults to ``False``, unless any of the other pool options are
+      specified.
+
+    :param pool_connections:
+      Number of hosts to keep connections open for.
+      Only used if ``pooled`` is ``True``.
+
+    :param pool_maxsize:
+      Maximum number of connections to keep open for each host.
+      Only used if ``pooled`` is ``True``.
+
+    :param idle_timeout:
+      If the adapter doesn't send any requests for this many seconds,
+      it will close its connections (they will be reopened as needed).
+
+      If ``None``, connections are kept open until the node (or
+      :py:meth:`close`) closes them.
+
+      Only used if ``pooled`` is ``True``.
+    """
     super(HttpAdapter, self).__init__()
 
     if isinstance(uri, text_type):
@@ -238,8 +416,43 @@ class HttpAdapter(BaseAdapter):
         },
       )
 
+    (uri, options) = self._extract_pool_options(uri)
+
+    # Constructor arguments take precedence over URI options.
+    for (key, value) in (
+        ('pooled',            pooled),
+        ('pool_connections',  pool_connections),
+        ('pool_maxsize',      pool_maxsize),
+        ('idle_timeout',      idle_timeout),
+    ):
+      if value is not None:
+        options[key] = value
+
+    if 'pooled' not in options:
+      options['pooled'] = bool(options)
+
+    for key in ('pool_connections', 'pool_maxsize'):
+      if options.get(key, 1) < 1:
+        raise with_context(
+          exc = ValueError('``{key}`` must be at least 1.'.format(key=key)),
+
+          context = {
+            key: options[key],
+          },
+        )
+
     self.uri = uri
 
+    self.pooled           = options['pooled'] # type: bool
+    self.pool_connections = options.get('pool_connections', self.DEFAULT_POOL_CONNECTIONS) # type: int
+    self.pool_maxsize     = options.get('pool_maxsize', self.DEFAULT_POOL_MAXSIZE) # type: int
+    self.idle_timeout     = options.get('idle_timeout') # type: Optional[float]
+
+    self._session           = None # type: Optional[Session]
+    self._session_lock      = Lock()
+    self._session_last_used = None # type: Optional[float]
+    self._session_requests  = 0
+
   @property
   def node_url(self):
     # type: () -> Text
@@ -248,20 +461,55 @@ class HttpAdapter(BaseAdapter):
     """
     return self.uri.geturl()
 
+  def close(self):
+    # type: () -> None
+    """
+    Closes any connections that the adapter is keeping open.
+
+    The adapter can still be used afterwards; it will open new
+    connections as needed.
+    """
+    with self._session_lock:
+      if self._session is not None:
+        self._session.close()
+        self._session = None
+
   def send_request(self, payload, **kwargs):
     # type: (dict, dict) -> dict
+    response = self._send_payload(payload, **kwargs)
+
+    return self._interpret_response(response, payload, {codes['ok']})
+
+  def _send_payload(self, payload, **kwargs):
+    # type: (dict, dict) -> Response
+    """
+    Encodes and sends an API request, invoking hooks.
+
+    :return:
+      The raw HTTP response.
+    """
     kwargs.setdefault('headers', {})
     kwargs['headers']['Content-type'] = 'application/json'
 
-    response = self._send_http_request(
-      # Use a custom JSON encoder that knows how to convert Tryte values.
-      payload = JsonEncoder().encode(payload),
+    # Use a custom JSON encoder that knows how to convert Tryte values.
+    # The output is ASCII, so its length is the size of the body.
+    encoded = JsonEncoder().encode(payload)
 
-      url = self.node_url,
-      **kwargs
-    )
+    info = self._before_request(payload.get('command'), len(encoded))
 
-    return self._interpret_response(response, payload, {codes['ok']})
+    try:
+      response = self._send_http_request(
+        payload = encoded,
+        url     = self.node_url,
+        **kwargs
+      )
+    except Exception as e:
+      self._after_request(info, error=e)
+      raise
+
+    self._after_request(info, response)
+
+    return response
 
   def _send_http_request(self, url, payload, method='post', **kwargs):
     # type: (Text, Optional[Text], Text, dict) -> Response
@@ -273,46 +521,160 @@ class HttpAdapter(BaseAdapter):
     """
     kwargs.setdefault('timeout', get_default_timeout())
 
-    self._log(
-      level = DEBUG,
+    # Payloads can be several megabytes (e.g., ``attachToTangle``), so
+    # don't format them unless they're actually going to be logged.
+    if self._is_logging(DEBUG):
+      self._log(
+        level = DEBUG,
 
-      message = 'Sending {method} to {url}: {payload!r}'.format(
-        method  = method,
-        payload = payload,
-        url     = url,
-      ),
+        message = 'Sending {method} to {url}: {payload!r}'.format(
+          method  = method,
+          payload = payload,
+          url     = url,
+        ),
 
-      context = {
-        'request_method':   method,
-        'request_kwargs':   kwargs,
-        'request_payload':  payload,
-        'request_url':      url,
-      },
-    )
+        context = {
+          'request_method':   method,
+          'request_kwargs':   kwargs,
+          'request_payload':  payload,
+          'request_url':      url,
+        },
+      )
 
-    response = request(method=method, url=url, data=payload, **kwargs)
+    if self.pooled:
+      session = self._get_session()
+      try:
+        response = session.request(
+          method  = method,
+          url     = url,
+          data    = payload,
+          **kwargs
+        )
+      finally:
+        self._release_session()
+    else:
+      response = request(method=method, url=url, data=payload, **kwargs)
+
+    if self._is_logging(DEBUG):
+      self._log(
+        level = DEBUG,
+
+        message = 'Receiving {method} from {url}: {response!r}'.format(
+          method    = method,
+          response  = response.content,
+          url       = url,
+        ),
 
-    self._log(
-      level = DEBUG,
+        context = {
+          'request_method':   method,
+          'request_kwargs':   kwargs,
+          'request_payload':  payload,
+          'request_url':      url,
 
-      message = 'Receiving {method} from {url}: {response!r}'.format(
-        method    = method,
-        response  = response.content,
-        url       = url,
-      ),
+          'response_headers': response.headers,
+          'response_content': response.content,
+        },
+      )
 
-      context = {
-        'request_method':   method,
-        'request_kwargs':   kwargs,
-        'request_payload':  payload,
-        'request_url':      url,
+    return response
 
-        'response_headers': response.headers,
-        'response_content': response.content,
-      },
-    )
+  def _get_session(self):
+    # type: () -> Session
+    """
+    Returns the session used to send pooled requests, creating it if
+    necessary.
 
-    return response
+    If the session has been idle for longer than
+    :py:attr:`idle_timeout`, its connections are closed first, so that
+    we don't try to reuse connections that the node (or a proxy) has
+    probably already dropped.
+
+    Every call must be followed by a call to :py:meth:`_release_session`
+    once the request has finished.
+    """
+    with self._session_lock:
+      # The session is only idle if none of its requests are still in
+      # flight (a slow request might take longer than ``idle_timeout``).
+      if (
+            (self._session is not None)
+        and (self.idle_timeout is not None)
+        and (self._session_requests == 0)
+        and (clock() - self._session_last_used > self.idle_timeout)
+      ):
+        self._log(
+          level   = DEBUG,
+          message = 'Closing idle connections to {url}.'.format(
+            url = self.node_url,
+          ),
+        )
+
+        self._session.close()
+        self._session = None
+
+      if self._session is None:
+        pool = RequestsHttpAdapter(
+          pool_connections  = self.pool_connections,
+          pool_maxsize      = self.pool_maxsize,
+
+          # Block instead of opening extra (throwaway) connections when
+          # all of the pooled connections are in use.
+          pool_block = True,
+        )
+
+        self._session = Session()
+        self._session.mount('http://', pool)
+        self._session.mount('https://', pool)
+
+      self._session_requests += 1
+
+      return self._session
+
+  def _release_session(self):
+    # type: () -> None
+    """
+    Records that a request sent using :py:meth:`_get_session` has
+    finished.
+    """
+    with self._session_lock:
+      self._session_requests -= 1
+      self._session_last_used = clock()
+
+  def _extract_pool_options(self, uri):
+    # type: (SplitResult) -> Tuple[SplitResult, dict]
+    """
+    Removes pool options from the URI's query string.
+
+    :return:
+      (uri without pool options, parsed pool options)
+    """
+    options = {}
+    query   = []
+
+    for (key, value) in compat.urllib_parse.parse_qsl(uri.query, True):
+      if key not in self.POOL_OPTIONS:
+        query.append((key, value))
+        continue
+
+      try:
+        options[key] = self.POOL_OPTIONS[key](value)
+      except ValueError:
+        raise with_context(
+          exc = InvalidUri(
+            'Invalid ``{key}`` in URI {uri!r}.'.format(
+              key = key,
+              uri = uri.geturl(),
+            ),
+          ),
+
+          context = {
+            'uri': uri,
+          },
+        )
+
+    if options:
+      uri = uri._replace(query=compat.urllib_parse.urlencode(query))
+
+    return uri, options
 
   def _interpret_response(self, response, payload, expected_status):
     # type: (Response, dict, Container[int]) -> dict
@@ -492,3 +854,9 @@ class MockAdapter(BaseAdapter):
       raise with_context(BadApiResponse(error), context={'request': payload})
 
     return response
+
+
+# Load adapters that live in their own modules, so that
+# ``resolve_adapter`` can find them.
+# noinspection PyUnresolvedReferences
+from cornode.adapter import local as _local, pow as _pow
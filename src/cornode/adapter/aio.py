@@ -0,0 +1,306 @@
+# coding=utf-8
+"""
+Adapters for use with :py:mod:`asyncio` (see :py:mod:`cornode.aio`).
+
+Requires Python 3.5 or later.
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+from logging import DEBUG, Logger
+from socket import getdefaulttimeout as get_default_timeout
+from typing import Optional, Text, Union
+
+from requests import Response, codes
+from requests.structures import CaseInsensitiveDict
+
+from cornode.adapter import AdapterSpec, BaseAdapter, HttpAdapter, \
+  SplitResult, resolve_adapter
+from cornode.json import JsonEncoder
+
+try:
+  import aiohttp
+except ImportError:
+  aiohttp = None
+
+__all__ = [
+  'AsyncHttpAdapter',
+  'BlockingAdapter',
+  'ExecutorAdapter',
+  'resolve_async_adapter',
+]
+
+
+def resolve_async_adapter(uri):
+  # type: (AdapterSpec) -> BaseAdapter
+  """
+  Given a URI, returns a properly-configured asynchronous adapter
+  instance.
+
+  HTTP(S) URIs use :py:class:`AsyncHttpAdapter`; anything else (including
+  synchronous adapter instances) is wrapped in an
+  :py:class:`ExecutorAdapter`.
+  """
+  if not isinstance(uri, BaseAdapter):
+    parsed = resolve_adapter(uri)
+
+    if type(parsed) is HttpAdapter:
+      uri = AsyncHttpAdapter(
+        uri               = parsed.uri,
+        pooled            = True,
+        pool_connections  = parsed.pool_connections,
+        pool_maxsize      = parsed.pool_maxsize,
+        idle_timeout      = parsed.idle_timeout,
+      )
+    else:
+      uri = parsed
+
+  if not uri.is_async:
+    uri = ExecutorAdapter(uri)
+
+  return uri
+
+
+class AsyncHttpAdapter(HttpAdapter):
+  """
+  Sends HTTP requests without blocking the event loop.
+
+  If ``aiohttp`` is installed, requests are sent using an
+  :py:class:`aiohttp.ClientSession`.  Otherwise, they are sent using a
+  pooled :py:class:`HttpAdapter`, in a dedicated thread pool.
+
+  Accepts the same URI options as :py:class:`HttpAdapter`, except that
+  connection pooling is enabled by default.
+  """
+  is_async = True
+
+  def __init__(
+      self,
+      uri,
+      pooled            = True,
+      pool_connections  = None,
+      pool_maxsize      = None,
+      idle_timeout      = None,
+  ):
+    # type: (Union[Text, SplitResult], Optional[bool], Optional[int], Optional[int], Optional[float]) -> None
+    super(AsyncHttpAdapter, self).__init__(
+      uri               = uri,
+      pooled            = pooled,
+      pool_connections  = pool_connections,
+      pool_maxsize      = pool_maxsize,
+      idle_timeout      = idle_timeout,
+    )
+
+    self._client_session  = None # type: Optional[aiohttp.ClientSession]
+    self._executor        = None # type: Optional[ThreadPoolExecutor]
+
+  async def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    kwargs.setdefault('headers', {})
+    kwargs['headers']['Content-type'] = 'application/json'
+
+    # Use a custom JSON encoder that knows how to convert Tryte values.
+    encoded = JsonEncoder().encode(payload)
+
+    info = self._before_request(payload.get('command'), len(encoded))
+
+    try:
+      response = await self._send_http_request_async(
+        payload = encoded,
+        url     = self.node_url,
+        **kwargs
+      )
+    except Exception as e:
+      self._after_request(info, error=e)
+      raise
+
+    self._after_request(info, response)
+
+    return self._interpret_response(response, payload, {codes['ok']})
+
+  async def aclose(self):
+    # type: () -> None
+    """
+    Closes any connections that the adapter is keeping open.
+
+    The adapter can still be used afterwards; it will open new
+    connections as needed.
+    """
+    if self._client_session is not None:
+      await self._client_session.close()
+      self._client_session = None
+
+    self.close()
+
+  async def _send_http_request_async(self, url, payload, method='post', **kwargs):
+    # type: (Text, Optional[Text], Text, dict) -> Response
+    """
+    Sends the actual HTTP request.
+
+    Split into its own method so that it can be mocked during unit
+    tests.
+    """
+    if aiohttp is None:
+      if self._executor is None:
+        # Use a dedicated pool, so that network requests can't be
+        # starved by (or deadlock with) CPU-bound work in the event
+        # loop's default executor.
+        self._executor = ThreadPoolExecutor(self.pool_maxsize)
+
+      return await asyncio.get_event_loop().run_in_executor(
+        self._executor,
+        partial(self._send_http_request, url, payload, method, **kwargs),
+      )
+
+    timeout = kwargs.pop('timeout', get_default_timeout())
+
+    if self._is_logging(DEBUG):
+      self._log(
+        level = DEBUG,
+
+        message = 'Sending {method} to {url}: {payload!r}'.format(
+          method  = method,
+          payload = payload,
+          url     = url,
+        ),
+
+        context = {
+          'request_method':   method,
+          'request_kwargs':   kwargs,
+          'request_payload':  payload,
+          'request_url':      url,
+        },
+      )
+
+    async with self._get_client_session().request(
+        method  = method,
+        url     = url,
+        data    = payload,
+        timeout = aiohttp.ClientTimeout(total=timeout),
+        **kwargs
+    ) as client_response:
+      content = await client_response.read()
+
+    # Convert the result into a :py:class:`Response`, so that we can
+    # reuse :py:meth:`_interpret_response`.
+    response = Response()
+    response.encoding     = client_response.charset or 'utf-8'
+    response.headers      = CaseInsensitiveDict(client_response.headers)
+    response.raw          = BytesIO(content)
+    response.status_code  = client_response.status
+    response.url          = url
+
+    if self._is_logging(DEBUG):
+      self._log(
+        level = DEBUG,
+
+        message = 'Receiving {method} from {url}: {response!r}'.format(
+          method    = method,
+          response  = content,
+          url       = url,
+        ),
+
+        context = {
+          'request_method':   method,
+          'request_kwargs':   kwargs,
+          'request_payload':  payload,
+          'request_url':      url,
+
+          'response_headers': response.headers,
+          'response_content': content,
+        },
+      )
+
+    return response
+
+  def _get_client_session(self):
+    # type: () -> aiohttp.ClientSession
+    """
+    Returns the ``aiohttp`` session, creating it if necessary.
+    """
+    if self._client_session is None or self._client_session.closed:
+      self._client_session = aiohttp.ClientSession(
+        connector = aiohttp.TCPConnector(
+          limit           = self.pool_connections * self.pool_maxsize,
+          limit_per_host  = self.pool_maxsize,
+          keepalive_timeout = self.idle_timeout,
+        ),
+      )
+
+    return self._client_session
+
+
+class ExecutorAdapter(BaseAdapter):
+  """
+  Wraps a synchronous adapter, so that it can be used with
+  :py:mod:`cornode.aio`.
+
+  Requests are sent in a dedicated thread pool, so that they don't
+  block the event loop.
+  """
+  is_async = True
+
+  def __init__(self, adapter, executor=None):
+    # type: (BaseAdapter, Optional[Executor]) -> None
+    """
+    :param adapter:
+      The synchronous adapter to wrap.
+
+    :param executor:
+      Executor used to send requests.
+      If ``None``, a single-threaded executor will be created, so that
+      the wrapped adapter doesn't have to be thread-safe.
+    """
+    super(ExecutorAdapter, self).__init__()
+
+    self.adapter  = adapter
+    self.executor = executor or ThreadPoolExecutor(1)
+
+  def set_logger(self, logger):
+    # type: (Logger) -> ExecutorAdapter
+    self.adapter.set_logger(logger)
+    return super(ExecutorAdapter, self).set_logger(logger)
+
+  async def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    return await asyncio.get_event_loop().run_in_executor(
+      self.executor,
+      partial(self.adapter.send_request, payload, **kwargs),
+    )
+
+
+class BlockingAdapter(BaseAdapter):
+  """
+  Wraps an asynchronous adapter, so that it can be used by synchronous
+  code running in a worker thread.
+
+  Requests are sent using the event loop; the calling thread blocks
+  until the response arrives.
+
+  **IMPORTANT:** Do not use this adapter in the event loop's own thread;
+  it will deadlock!
+  """
+  def __init__(self, adapter, loop):
+    # type: (BaseAdapter, asyncio.AbstractEventLoop) -> None
+    """
+    :param adapter:
+      The asynchronous adapter to wrap.
+
+    :param loop:
+      The event loop that will run the requests.
+    """
+    super(BlockingAdapter, self).__init__()
+
+    self.adapter  = adapter
+    self.loop     = loop
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    return asyncio.run_coroutine_threadsafe(
+      self.adapter.send_request(payload, **kwargs),
+      self.loop,
+    ).result()
@@ -0,0 +1,359 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from collections import OrderedDict
+from random import choice
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Text, Union
+
+from six import text_type
+
+from cornode import Address, Tag, TransactionHash, TransactionTrytes, \
+  TryteString, TrytesCompatible
+from cornode.adapter import BadApiResponse, BaseAdapter, SplitResult
+from cornode.exceptions import with_context
+from cornode.transaction import LazyTransaction
+
+__all__ = [
+  'LocalTangleAdapter',
+]
+
+
+class LocalTangleAdapter(BaseAdapter):
+  """
+  Simulates a node, using a Tangle that lives in memory.
+
+  Unlike :py:class:`cornode.adapter.MockAdapter`, responses don't have
+  to be seeded by hand; transactions that are stored can be found,
+  fetched, spent, etc., just like on a real node.  This makes it
+  possible to test (and benchmark) code that talks to a node, without
+  needing a network connection.
+
+  Example::
+
+     adapter = LocalTangleAdapter(balances={my_address: 1000})
+
+     cornode = cornode(adapter, seed=my_seed)
+     cornode.send_transfer(depth=3, transfers=[...], inputs=[my_address])
+     cornode.get_transfers()
+
+  Some simplifications apply:
+
+  - ``attachToTangle`` links transactions together, but it does not do
+    proof of work (``minWeightMagnitude`` is ignored).
+  - Every stored transaction is considered confirmed.
+  - Transactions are not validated (e.g., signatures and balances are
+    not checked).
+  - Initial balances are not backed by any transactions, so funded
+    addresses won't be found when scanning a seed for inputs; specify
+    them explicitly instead.
+
+  The adapter can also be created using a ``local://`` URI (e.g.,
+  ``cornode('local://')``).
+  """
+  supported_protocols = ('local',)
+
+  NULL_HASH = TransactionHash(b'')
+  """
+  Used in place of milestones, and as the trunk/branch for the very
+  first transaction.
+  """
+
+  @classmethod
+  def configure(cls, uri):
+    # type: (Union[Text, SplitResult]) -> LocalTangleAdapter
+    """
+    Creates a new instance using the specified URI.
+
+    ``local://`` URIs do not accept any options.
+    """
+    return cls()
+
+  def __init__(self, balances=None):
+    # type: (Optional[Dict[TrytesCompatible, int]]) -> None
+    """
+    :param balances:
+      Initial balance for each address (e.g., to fund the addresses
+      used in a test).
+    """
+    super(LocalTangleAdapter, self).__init__()
+
+    self.transactions = OrderedDict() # type: Dict[Text, LazyTransaction]
+    """
+    Stored transactions, indexed by hash.
+    """
+
+    self.balances = {} # type: Dict[Text, int]
+    """
+    Balance of each address, including initial balances and the values
+    of stored transactions.
+    """
+
+    for address, balance in (balances or {}).items():
+      self.balances[_as_key(address, Address.LEN)] = balance
+
+    self._addresses = {} # type: Dict[Text, List[Text]]
+    self._approvees = {} # type: Dict[Text, List[Text]]
+    self._bundles   = {} # type: Dict[Text, List[Text]]
+    self._tags      = {} # type: Dict[Text, List[Text]]
+
+    self._tips = OrderedDict() # type: Dict[Text, None]
+
+    self._lock = Lock()
+
+    self._handlers = {
+      'attachToTangle':             self._attach_to_tangle,
+      'broadcastTransactions':      self._broadcast_transactions,
+      'findTransactions':           self._find_transactions,
+      'getBalances':                self._get_balances,
+      'getInclusionStates':         self._get_inclusion_states,
+      'getNodeInfo':                self._get_node_info,
+      'getTips':                    self._get_tips,
+      'getTransactionsToApprove':   self._get_transactions_to_approve,
+      'getTrytes':                  self._get_trytes,
+      'interruptAttachingToTangle': self._interrupt_attaching_to_tangle,
+      'storeTransactions':          self._store_transactions,
+    } # type: Dict[Text, Callable[[dict], dict]]
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command = payload.get('command')
+
+    try:
+      handler = self._handlers[command]
+    except KeyError:
+      raise with_context(
+        exc = BadApiResponse(
+          '{cls} does not support {command!r}.'.format(
+            cls     = type(self).__name__,
+            command = command,
+          ),
+        ),
+
+        context = {
+          'request': payload,
+        },
+      )
+
+    with self._lock:
+      return handler(payload)
+
+  def _attach_to_tangle(self, payload):
+    # type: (dict) -> dict
+    trunk_transaction   = TransactionHash(_as_trytes(payload['trunkTransaction']))
+    branch_transaction  = TransactionHash(_as_trytes(payload['branchTransaction']))
+
+    attached  = [] # type: List[TransactionTrytes]
+    previous  = None # type: Optional[TransactionHash]
+
+    for trytes in payload['trytes']:
+      txn = LazyTransaction(trytes)
+
+      # Same as :py:class:`cornode.adapter.pow.LocalPowAdapter`, minus
+      # the proof of work.
+      if previous is None:
+        txn.trunk_transaction_hash  = trunk_transaction
+        txn.branch_transaction_hash = branch_transaction
+      else:
+        txn.trunk_transaction_hash  = previous
+        txn.branch_transaction_hash = trunk_transaction
+
+      trytes = txn.as_tryte_string()
+
+      attached.append(trytes)
+      previous = LazyTransaction(trytes).hash
+
+    return {
+      'trytes': [t.as_json_compatible() for t in reversed(attached)],
+    }
+
+  def _broadcast_transactions(self, payload):
+    # type: (dict) -> dict
+    # There are no neighbors to broadcast to, so just make sure the
+    # transactions are in the Tangle.
+    self._store(payload['trytes'])
+    return {}
+
+  def _find_transactions(self, payload):
+    # type: (dict) -> dict
+    criteria = [
+      (self._addresses, Address.LEN, payload.get('addresses')),
+      (self._approvees, TransactionHash.LEN, payload.get('approvees')),
+      (self._bundles, TransactionHash.LEN, payload.get('bundles')),
+      (self._tags, Tag.LEN, payload.get('tags')),
+    ]
+
+    hashes = None # type: Optional[List[Text]]
+
+    # Like a node, return transactions that match all of the criteria.
+    for (index, length, values) in criteria:
+      if not values:
+        continue
+
+      matches = OrderedDict() # type: Dict[Text, None]
+      for value in values:
+        for hash_ in index.get(_as_key(value, length), ()):
+          matches[hash_] = None
+
+      if hashes is None:
+        hashes = list(matches)
+      else:
+        hashes = [h for h in hashes if h in matches]
+
+    return {
+      'hashes': hashes or [],
+    }
+
+  def _get_balances(self, payload):
+    # type: (dict) -> dict
+    return {
+      'balances': [
+        self.balances.get(_as_key(address, Address.LEN), 0)
+          for address in payload['addresses']
+      ],
+
+      'milestone':      self.NULL_HASH.as_json_compatible(),
+      'milestoneIndex': len(self.transactions),
+    }
+
+  def _get_inclusion_states(self, payload):
+    # type: (dict) -> dict
+    return {
+      'states': [
+        _as_key(hash_) in self.transactions
+          for hash_ in payload['transactions']
+      ],
+    }
+
+  def _get_node_info(self, payload):
+    # type: (dict) -> dict
+    return {
+      'appName':    type(self).__name__,
+      'appVersion': '1.0.0',
+
+      'latestMilestone':                    self.NULL_HASH.as_json_compatible(),
+      'latestMilestoneIndex':               len(self.transactions),
+      'latestSolidSubtangleMilestone':      self.NULL_HASH.as_json_compatible(),
+      'latestSolidSubtangleMilestoneIndex': len(self.transactions),
+
+      'neighbors':    0,
+      'tips':         len(self._tips),
+      'transactionsToRequest':  0,
+    }
+
+  def _get_tips(self, payload):
+    # type: (dict) -> dict
+    return {
+      'hashes': list(self._tips),
+    }
+
+  def _get_transactions_to_approve(self, payload):
+    # type: (dict) -> dict
+    if self._tips:
+      tips = list(self._tips)
+
+      return {
+        'branchTransaction':  choice(tips),
+        'trunkTransaction':   choice(tips),
+      }
+
+    return {
+      'branchTransaction':  self.NULL_HASH.as_json_compatible(),
+      'trunkTransaction':   self.NULL_HASH.as_json_compatible(),
+    }
+
+  def _get_trytes(self, payload):
+    # type: (dict) -> dict
+    trytes = [] # type: List[Text]
+
+    for hash_ in payload['hashes']:
+      txn = self.transactions.get(_as_key(hash_))
+
+      # Like a node, return all 9's for unknown transactions.
+      trytes.append(
+        txn.trytes.as_json_compatible()
+          if txn
+          else TransactionTrytes(b'').as_json_compatible()
+      )
+
+    return {
+      'trytes': trytes,
+    }
+
+  def _interrupt_attaching_to_tangle(self, payload):
+    # type: (dict) -> dict
+    return {}
+
+  def _store_transactions(self, payload):
+    # type: (dict) -> dict
+    self._store(payload['trytes'])
+    return {}
+
+  def _store(self, trytes):
+    # type: (Iterable[TrytesCompatible]) -> None
+    """
+    Adds transactions to the Tangle and updates the indexes.
+    """
+    for t in trytes:
+      txn   = LazyTransaction(t)
+      hash_ = _as_key(txn.hash)
+
+      if hash_ in self.transactions:
+        continue
+
+      self.transactions[hash_] = txn
+
+      address = _as_key(txn.address, Address.LEN)
+      trunk   = _as_key(txn.trunk_transaction_hash)
+      branch  = _as_key(txn.branch_transaction_hash)
+
+      _add_to_index(self._addresses, address, hash_)
+      _add_to_index(self._bundles, _as_key(txn.bundle_hash), hash_)
+      _add_to_index(self._tags, _as_key(txn.tag, Tag.LEN), hash_)
+
+      for approvee in {trunk, branch}:
+        _add_to_index(self._approvees, approvee, hash_)
+        self._tips.pop(approvee, None)
+
+      if hash_ not in self._approvees:
+        self._tips[hash_] = None
+
+      if txn.value:
+        self.balances[address] = self.balances.get(address, 0) + txn.value
+
+
+def _add_to_index(index, key, hash_):
+  # type: (Dict[Text, List[Text]], Text, Text) -> None
+  """
+  Adds a transaction hash to an index.
+  """
+  try:
+    index[key].append(hash_)
+  except KeyError:
+    index[key] = [hash_]
+
+
+def _as_key(trytes, length=TransactionHash.LEN):
+  # type: (TrytesCompatible, int) -> Text
+  """
+  Converts a tryte sequence into a string that can be used as an index
+  key.
+  """
+  return _as_trytes(trytes, length).as_json_compatible()
+
+
+def _as_trytes(trytes, length=TransactionHash.LEN):
+  # type: (TrytesCompatible, int) -> TryteString
+  """
+  Converts a value from a request into a tryte sequence.
+
+  The value is padded/truncated to ``length`` trytes (e.g., to remove
+  address checksums).
+  """
+  if isinstance(trytes, text_type):
+    # Requests sent directly to the adapter (not via an API command)
+    # might contain unicode strings.
+    trytes = trytes.encode('ascii')
+
+  return TryteString(trytes, pad=length)[:length]
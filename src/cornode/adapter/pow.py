@@ -0,0 +1,213 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from logging import DEBUG
+from multiprocessing import Pool, cpu_count
+from threading import Event
+from typing import List, Optional, Text, Union
+
+from six import moves as compat
+
+from cornode import Hash, TransactionHash, TransactionTrytes
+from cornode.adapter import BadApiResponse, BaseAdapter, InvalidUri, \
+  SplitResult
+from cornode.crypto.pow import find_nonce
+from cornode.exceptions import with_context
+from cornode.transaction import Transaction
+
+__all__ = [
+  'LocalPowAdapter',
+]
+
+
+class LocalPowAdapter(BaseAdapter):
+  """
+  Performs proof of work locally, instead of sending it to a node.
+
+  Only ``attachToTangle`` and ``interruptAttachingToTangle`` are
+  supported, so this adapter is meant to be used with
+  :py:class:`cornode.adapter.wrappers.RoutingWrapper`.
+
+  Example::
+
+     # Do POW locally, send everything else to 12.34.56.78.
+     cornode = cornode(
+       RoutingWrapper('http://12.34.56.78:14265')
+         .add_route('attachToTangle', 'local-pow://?workers=4')
+         .add_route('interruptAttachingToTangle', 'local-pow://?workers=4')
+     )
+
+  Note that :py:class:`RoutingWrapper` reuses adapters for identical
+  URIs, so both commands will go to the same instance.
+  """
+  supported_protocols = ('local-pow',)
+
+  @classmethod
+  def configure(cls, uri):
+    # type: (Union[Text, SplitResult]) -> LocalPowAdapter
+    """
+    Creates a new instance using the specified URI.
+
+    The number of worker processes can be specified using the
+    ``workers`` query parameter (e.g., ``local-pow://?workers=4``).
+    """
+    if not isinstance(uri, SplitResult):
+      uri = compat.urllib_parse.urlsplit(uri) # type: SplitResult
+
+    query = compat.urllib_parse.parse_qs(uri.query)
+
+    workers = None
+    if 'workers' in query:
+      try:
+        workers = int(query['workers'][-1])
+      except ValueError:
+        raise with_context(
+          exc = InvalidUri(
+            'Non-numeric ``workers`` in URI {uri!r}.'.format(
+              uri = uri.geturl(),
+            ),
+          ),
+
+          context = {
+            'uri': uri,
+          },
+        )
+
+    return cls(workers)
+
+  def __init__(self, workers=None):
+    # type: (Optional[int]) -> None
+    """
+    :param workers:
+      Number of processes to use for proof of work.
+      If ``None``, one process per CPU will be used.
+
+      If ``1``, proof of work is done in the current process.
+    """
+    super(LocalPowAdapter, self).__init__()
+
+    if workers is None:
+      workers = cpu_count()
+
+    if workers < 1:
+      raise with_context(
+        exc = ValueError('``workers`` must be at least 1.'),
+
+        context = {
+          'workers': workers,
+        },
+      )
+
+    self.workers = workers
+
+    self._interrupted = Event()
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command = payload.get('command')
+
+    if command == 'attachToTangle':
+      return self._attach_to_tangle(
+        trunk_transaction     = TransactionHash(payload['trunkTransaction']),
+        branch_transaction    = TransactionHash(payload['branchTransaction']),
+        min_weight_magnitude  = payload['minWeightMagnitude'],
+
+        trytes = [TransactionTrytes(t) for t in payload['trytes']],
+      )
+
+    if command == 'interruptAttachingToTangle':
+      self._interrupted.set()
+      return {}
+
+    raise with_context(
+      exc = BadApiResponse(
+        '{cls} does not support {command!r} '
+        '(use ``RoutingWrapper`` to send it to a node instead).'.format(
+          cls     = type(self).__name__,
+          command = command,
+        ),
+      ),
+
+      context = {
+        'request': payload,
+      },
+    )
+
+  def _attach_to_tangle(
+      self,
+      trunk_transaction,
+      branch_transaction,
+      min_weight_magnitude,
+      trytes,
+  ):
+    # type: (TransactionHash, TransactionHash, int, List[TransactionTrytes]) -> dict
+    """
+    Links the transactions together and does proof of work for each
+    one, the same way a node would.
+    """
+    self._interrupted.clear()
+
+    pool = Pool(self.workers) if self.workers > 1 else None
+
+    try:
+      attached  = [] # type: List[Transaction]
+      previous  = None # type: Optional[TransactionHash]
+
+      for tryte_string in trytes:
+        txn = Transaction.from_tryte_string(tryte_string)
+
+        # The first transaction references the two tips; each
+        # subsequent transaction references the previous one.
+        if previous is None:
+          txn.trunk_transaction_hash  = trunk_transaction
+          txn.branch_transaction_hash = branch_transaction
+        else:
+          txn.trunk_transaction_hash  = previous
+          txn.branch_transaction_hash = trunk_transaction
+
+        self._log(
+          level   = DEBUG,
+
+          message = 'Doing proof of work for transaction {index}/{count}.'.format(
+            index = len(attached) + 1,
+            count = len(trytes),
+          ),
+        )
+
+        nonce = find_nonce(
+          trits                 = txn.as_tryte_string().as_trits(),
+          min_weight_magnitude  = min_weight_magnitude,
+          pool                  = pool,
+          workers               = self.workers,
+          interrupted           = self._interrupted,
+        )
+
+        if nonce is None:
+          raise with_context(
+            exc = BadApiResponse('attachToTangle was interrupted.'),
+
+            context = {
+              'attached': attached,
+            },
+          )
+
+        txn.nonce = Hash.from_trits(nonce)
+
+        # Recompute the hash, now that the transaction is complete.
+        txn = Transaction.from_tryte_string(txn.as_tryte_string())
+
+        attached.append(txn)
+        previous = txn.hash
+    finally:
+      if pool is not None:
+        pool.terminate()
+
+    # Like a node, return the transactions in the reverse order that
+    # they were attached.
+    return {
+      'trytes': [
+        t.as_tryte_string().as_json_compatible()
+          for t in reversed(attached)
+      ],
+    }
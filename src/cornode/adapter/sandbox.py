@@ -2,17 +2,20 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
+from collections import deque
+from threading import Condition, Event, Lock, Thread
 from time import sleep
-from typing import Container, Optional, Text, Union
+from typing import Callable, Container, Deque, List, Optional, Text, Union
 
 from requests import Response, codes
 from six import moves as compat, text_type
 
-from cornode.adapter import BadApiResponse, HttpAdapter, SplitResult
+from cornode.adapter import BadApiResponse, HttpAdapter, SplitResult, clock
 from cornode.exceptions import with_context
 
 __all__ = [
   'SandboxAdapter',
+  'SandboxJob',
 ]
 
 
@@ -34,6 +37,13 @@ class SandboxAdapter(HttpAdapter):
   synchronously; it blocks until it determines that a job has completed
   successfully.
 
+  To avoid blocking, use :py:meth:`submit` instead; it returns a
+  :py:class:`SandboxJob` right away, and jobs are polled in the
+  background::
+
+     jobs = [adapter.submit(payload) for payload in payloads]
+     responses = [job.result() for job in jobs]
+
   References:
     - https://github.com/cornodeledger/cornode.lib.py/issues/19
     - https://github.com/cornodeledger/documentation/blob/sandbox/source/index.html.md
@@ -48,6 +58,12 @@ class SandboxAdapter(HttpAdapter):
   Maximum number of times to poll for job status before giving up.
   """
 
+  MIN_POLL_INTERVAL = 1
+  """
+  Minimum number of seconds between status checks for a job submitted
+  using :py:meth:`submit`.
+  """
+
   def __init__(
       self,
       uri,
@@ -176,6 +192,11 @@ class SandboxAdapter(HttpAdapter):
     self.poll_interval  = poll_interval # type: int
     self.max_polls      = max_polls # type: int
 
+    self._jobs              = [] # type: List[SandboxJob]
+    self._jobs_condition    = Condition()
+    self._poller            = None # type: Optional[Thread]
+    self._completion_times  = deque(maxlen=20) # type: Deque[float]
+
   @property
   def node_url(self):
     return compat.urllib_parse.urlunsplit((
@@ -218,6 +239,80 @@ class SandboxAdapter(HttpAdapter):
 
     return super(SandboxAdapter, self).send_request(payload, **kwargs)
 
+  def submit(self, payload, **kwargs):
+    # type: (dict, dict) -> SandboxJob
+    """
+    Sends an API request without waiting for the node to finish the
+    job.
+
+    :return:
+      Handle for the job.  If the node completed the request right away,
+      the job is already done.
+
+    Outstanding jobs are polled together in a background thread.  The
+    delay before each status check adapts to how long recent jobs took
+    to finish.
+    """
+    if self.auth_token:
+      kwargs.setdefault('headers', {})
+      kwargs['headers']['Authorization'] = self.authorization_header
+
+    response = self._send_payload(payload, **kwargs)
+
+    decoded =\
+      super(SandboxAdapter, self)._interpret_response(
+        response        = response,
+        payload         = payload,
+        expected_status = {codes['ok'], codes['accepted']},
+      )
+
+    if response.status_code != codes['accepted']:
+      job = SandboxJob(payload, None)
+      job._finish(response=decoded)
+      return job
+
+    job = SandboxJob(payload, decoded['id'])
+
+    if decoded['status'] not in (STATUS_QUEUED, STATUS_RUNNING):
+      self._finish_job(job, decoded)
+      return job
+
+    with self._jobs_condition:
+      job.deadline  = job.submitted + (self.poll_interval * self.max_polls)
+      job.next_poll = job.submitted + self._get_poll_delay(job)
+
+      self._jobs.append(job)
+      self._jobs_condition.notify()
+
+      self._start_poller()
+
+    return job
+
+  def poll_jobs(self):
+    # type: () -> Optional[float]
+    """
+    Checks the status of every job that is due to be polled.
+
+    This is called automatically by the background poller thread; you
+    don't need to call it yourself.
+
+    :return:
+      Number of seconds until the next job is due to be polled, or
+      ``None`` if there are no outstanding jobs.
+    """
+    with self._jobs_condition:
+      now = clock()
+      due = [job for job in self._jobs if job.next_poll <= now]
+
+    for job in due:
+      self._poll_job(job)
+
+    with self._jobs_condition:
+      if not self._jobs:
+        return None
+
+      return max(min(job.next_poll for job in self._jobs) - clock(), 0)
+
   def _interpret_response(self, response, payload, expected_status):
     # type: (Response, dict, Container[int], bool) -> dict
     decoded =\
@@ -266,25 +361,177 @@ class SandboxAdapter(HttpAdapter):
             expected_status = {codes['ok']},
           )
 
-      if decoded['status'] == STATUS_FINISHED:
-        return decoded['{command}Response'.format(command=decoded['command'])]
+      return self._get_job_result(decoded, payload)
 
-      raise with_context(
-        exc = BadApiResponse(
-              decoded.get('error', {}).get('message')
-          or  'Command {status}: {decoded}'.format(
-                decoded = decoded,
-                status  = decoded['status'].lower(),
-              ),
-        ),
+    return decoded
 
-        context = {
-          'request':  payload,
-          'response': decoded,
-        },
+  def _get_job_result(self, decoded, payload):
+    # type: (dict, dict) -> dict
+    """
+    Extracts the command response from a completed job.
+
+    :raise:
+      - :py:class:`BadApiResponse` if the job did not finish
+        successfully.
+    """
+    if decoded['status'] == STATUS_FINISHED:
+      return decoded['{command}Response'.format(command=decoded['command'])]
+
+    raise with_context(
+      exc = BadApiResponse(
+            decoded.get('error', {}).get('message')
+        or  'Command {status}: {decoded}'.format(
+              decoded = decoded,
+              status  = decoded['status'].lower(),
+            ),
+      ),
+
+      context = {
+        'request':  payload,
+        'response': decoded,
+      },
+    )
+
+  def _get_poll_delay(self, job):
+    # type: (SandboxJob) -> float
+    """
+    Returns the number of seconds to wait before polling a job.
+
+    The first poll is scheduled for when the job is expected to finish
+    (the median time that recent jobs took).  If the job isn't done by
+    then, polls are spaced further apart each time, up to
+    :py:attr:`poll_interval`.
+
+    Must be called while holding the jobs lock.
+    """
+    if self._completion_times:
+      times     = sorted(self._completion_times)
+      expected  = times[len(times) // 2]
+    else:
+      expected  = self.poll_interval
+
+    if not job.polls:
+      return max(expected, self.MIN_POLL_INTERVAL)
+
+    return min(
+      max(expected / 4, self.MIN_POLL_INTERVAL) * (2 ** (job.polls - 1)),
+      self.poll_interval,
+    )
+
+  def _start_poller(self):
+    # type: () -> None
+    """
+    Starts the background poller thread, if it isn't running already.
+
+    Must be called while holding the jobs lock.
+    """
+    if self._poller is None:
+      self._poller = Thread(
+        name    = 'SandboxAdapter poller',
+        target  = self._run_poller,
       )
 
-    return decoded
+      self._poller.daemon = True
+      self._poller.start()
+
+  def _run_poller(self):
+    # type: () -> None
+    """
+    Polls outstanding jobs until there aren't any left.
+    """
+    while True:
+      delay = self.poll_jobs()
+
+      with self._jobs_condition:
+        if not self._jobs:
+          self._poller = None
+          return
+
+        if delay:
+          # Wake up early if a new job is submitted.
+          self._jobs_condition.wait(delay)
+
+  def _poll_job(self, job):
+    # type: (SandboxJob) -> None
+    """
+    Checks the status of a job, and resolves it if it's done.
+    """
+    try:
+      poll_response = self._send_http_request(
+        headers = {'Authorization': self.authorization_header},
+        method  = 'get',
+        payload = None,
+        url     = self.get_jobs_url(job.id),
+      )
+
+      decoded =\
+        super(SandboxAdapter, self)._interpret_response(
+          response        = poll_response,
+          payload         = job.payload,
+          expected_status = {codes['ok']},
+        )
+    except Exception as e:
+      self._remove_job(job)
+      job._finish(error=e)
+      return
+
+    if decoded['status'] not in (STATUS_QUEUED, STATUS_RUNNING):
+      with self._jobs_condition:
+        self._completion_times.append(clock() - job.submitted)
+
+      self._remove_job(job)
+      self._finish_job(job, decoded)
+      return
+
+    with self._jobs_condition:
+      now = clock()
+
+      if now >= job.deadline:
+        error = with_context(
+          exc =
+            BadApiResponse(
+              '``{command}`` job timed out after {duration} seconds '
+              '(``exc.context`` has more info).'.format(
+                command   = decoded['command'],
+                duration  = self.poll_interval * self.max_polls,
+              ),
+            ),
+
+          context = {
+            'request':  job.payload,
+            'response': decoded,
+          },
+        )
+      else:
+        error = None
+
+        job.polls    += 1
+        job.next_poll = now + self._get_poll_delay(job)
+
+    if error:
+      self._remove_job(job)
+      job._finish(error=error)
+
+  def _finish_job(self, job, decoded):
+    # type: (SandboxJob, dict) -> None
+    """
+    Resolves a job using its final status.
+    """
+    try:
+      response = self._get_job_result(decoded, job.payload)
+    except BadApiResponse as e:
+      job._finish(error=e)
+    else:
+      job._finish(response=response)
+
+  def _remove_job(self, job):
+    # type: (SandboxJob) -> None
+    """
+    Removes a job from the list of outstanding jobs.
+    """
+    with self._jobs_condition:
+      if job in self._jobs:
+        self._jobs.remove(job)
 
   def _wait_to_poll(self):
     """
@@ -294,3 +541,124 @@ class SandboxAdapter(HttpAdapter):
     unit tests ("Do you bite your thumb at us, sir?").
     """
     sleep(self.poll_interval)
+
+
+class SandboxJob(object):
+  """
+  Handle for a job submitted using :py:meth:`SandboxAdapter.submit`.
+
+  Use :py:meth:`result` to wait for the job to finish, or ``await`` the
+  job from a coroutine.
+  """
+  def __init__(self, payload, job_id):
+    # type: (dict, Optional[Text]) -> None
+    self.payload  = payload
+    self.id       = job_id
+
+    self.submitted  = clock()
+    self.deadline   = None # type: Optional[float]
+    self.next_poll  = None # type: Optional[float]
+    self.polls      = 0
+
+    self._callbacks = [] # type: List[Callable[[SandboxJob], None]]
+    self._done      = Event()
+    self._error     = None # type: Optional[Exception]
+    self._lock      = Lock()
+    self._response  = None # type: Optional[dict]
+
+  def __await__(self):
+    # :bc: Imported here, because :py:mod:`asyncio` requires Python 3.
+    import asyncio
+
+    loop    = asyncio.get_event_loop()
+    future  = loop.create_future()
+
+    def copy_result(job):
+      # type: (SandboxJob) -> None
+      if not future.cancelled():
+        if job._error is not None:
+          future.set_exception(job._error)
+        else:
+          future.set_result(job._response)
+
+    # Callbacks are invoked in the poller thread.
+    self.add_done_callback(
+      lambda job: loop.call_soon_threadsafe(copy_result, job),
+    )
+
+    return future.__await__()
+
+  def add_done_callback(self, callback):
+    # type: (Callable[[SandboxJob], None]) -> None
+    """
+    Registers a function to call when the job finishes.
+
+    If the job is already done, the function is called immediately.
+    Otherwise, it will be called from the poller thread.
+    """
+    with self._lock:
+      if not self._done.is_set():
+        self._callbacks.append(callback)
+        return
+
+    callback(self)
+
+  def done(self):
+    # type: () -> bool
+    """
+    Returns whether the job has finished (successfully or not).
+    """
+    return self._done.is_set()
+
+  def result(self, timeout=None):
+    # type: (Optional[float]) -> dict
+    """
+    Waits for the job to finish, and returns the command response.
+
+    :param timeout:
+      Max number of seconds to wait.
+      If ``None``, waits until the job finishes or times out (see
+      :py:attr:`SandboxAdapter.max_polls`).
+
+    :raise:
+      - :py:class:`BadApiResponse` if the job failed or timed out, or
+        if it is still running after ``timeout`` seconds.
+    """
+    if not self._done.wait(timeout):
+      raise with_context(
+        exc =
+          BadApiResponse(
+            '``{command}`` job {id} is still running after {timeout} seconds '
+            '(``exc.context`` has more info).'.format(
+              command = self.payload.get('command'),
+              id      = self.id,
+              timeout = timeout,
+            ),
+          ),
+
+        context = {
+          'request': self.payload,
+        },
+      )
+
+    if self._error is not None:
+      raise self._error
+
+    return self._response
+
+  def _finish(self, response=None, error=None):
+    # type: (Optional[dict], Optional[Exception]) -> None
+    """
+    Records the outcome of the job, and wakes up anything waiting for
+    it.
+    """
+    with self._lock:
+      self._error     = error
+      self._response  = response
+      self._done.set()
+
+      callbacks       = self._callbacks
+      self._callbacks = []
+
+    for callback in callbacks:
+      callback(self)
@@ -3,12 +3,35 @@ from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
 from abc import ABCMeta, abstractmethod as abstract_method
-from typing import Dict, Text
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from copy import deepcopy
+from io import open as io_open
+from logging import DEBUG, WARNING
+from math import ceil
+from os import getpid
+from threading import Lock, Thread
+from typing import Callable, Deque, Dict, Iterable, List, MutableMapping, \
+  Optional, Text, Tuple, Union
 
-from cornode.adapter import AdapterSpec, BaseAdapter, resolve_adapter
-from six import with_metaclass
+from cornode.adapter import AdapterSpec, BadApiResponse, BaseAdapter, clock, \
+  resolve_adapter
+from cornode.exceptions import with_context
+from cornode.json import JsonEncoder
+from cornode.types import TryteString
+from six import binary_type, moves as compat, text_type, with_metaclass
+
+try:
+  from os import replace as replace_file
+except ImportError:
+  # :bc: py2k doesn't have :py:func:`os.replace`.
+  from os import rename as replace_file
 
 __all__ = [
+  'CachingWrapper',
+  'HedgingWrapper',
+  'MetricsWrapper',
+  'PoolWrapper',
   'RoutingWrapper',
 ]
 
@@ -99,3 +122,1072 @@ class RoutingWrapper(BaseWrapper):
     command = payload.get('command')
 
     return self.get_adapter(command).send_request(payload, **kwargs)
+
+
+class CachingWrapper(BaseWrapper):
+  """
+  Caches responses from the node, for data that never (or rarely)
+  changes.
+
+  ``getTrytes`` results are cached per transaction hash, since a
+  transaction's trytes never change.  When a request includes hashes
+  that aren't cached yet, only those hashes are requested from the
+  node.
+
+  Optionally, responses to other commands (e.g., ``getNodeInfo`` and
+  ``getTips``) can also be cached for a limited time.
+
+  Example::
+
+     # Cache up to 10000 transactions in memory, and node info for 5
+     # seconds.
+     cornode = cornode(
+       CachingWrapper(
+         'http://localhost:14265',
+         max_size  = 10000,
+         ttls      = {'getNodeInfo': 5},
+       ),
+     )
+
+     # Cache transactions on disk instead (no size limit).
+     cornode = cornode(
+       CachingWrapper(
+         'http://localhost:14265',
+         store = shelve.open('trytes.db'),
+       ),
+     )
+  """
+  DEFAULT_MAX_SIZE = 10000
+  """
+  Default number of transactions to keep in the in-memory store.
+  """
+
+  def __init__(self, adapter, max_size=DEFAULT_MAX_SIZE, store=None, ttls=None):
+    # type: (AdapterSpec, int, Optional[MutableMapping[Text, Text]], Optional[Dict[Text, float]]) -> None
+    """
+    :param adapter:
+      The adapter to send (uncached) requests to.
+
+    :param max_size:
+      Maximum number of transactions to keep in the in-memory store.
+      The least-recently-used transactions are evicted first.
+
+      Ignored if ``store`` is provided.
+
+    :param store:
+      Mapping used to store transaction trytes, indexed by hash (both
+      as strings).  For example, a :py:mod:`shelve` instance can be
+      used to store trytes on disk.
+
+      If ``None``, a bounded in-memory store will be used.
+
+    :param ttls:
+      Number of seconds to cache responses for other commands, indexed
+      by command name (e.g., ``{'getNodeInfo': 5, 'getTips': 5}``).
+
+      Note that these responses are cached regardless of the request
+      parameters, so only commands that don't have any parameters
+      should be listed here.
+    """
+    super(CachingWrapper, self).__init__(adapter)
+
+    if store is None:
+      if max_size < 1:
+        raise with_context(
+          exc = ValueError('``max_size`` must be at least 1.'),
+
+          context = {
+            'max_size': max_size,
+          },
+        )
+
+      self.max_size = max_size
+      self.store    = OrderedDict() # type: MutableMapping[Text, Text]
+    else:
+      self.max_size = None
+      self.store    = store
+
+    self.ttls = dict(ttls or {}) # type: Dict[Text, float]
+
+    self._responses = {} # type: Dict[Text, Tuple[float, dict]]
+
+    self._lock = Lock()
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command = payload.get('command')
+
+    if command == 'getTrytes':
+      return self._get_trytes(payload, **kwargs)
+
+    if command in self.ttls:
+      return self._get_with_ttl(command, payload, **kwargs)
+
+    return self.adapter.send_request(payload, **kwargs)
+
+  def clear(self):
+    # type: () -> None
+    """
+    Removes all cached values.
+    """
+    with self._lock:
+      self.store.clear()
+      self._responses.clear()
+
+  def _get_trytes(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    """
+    Serves a ``getTrytes`` request from the store, fetching any missing
+    transactions from the node.
+    """
+    keys = [_as_text(h) for h in payload.get('hashes') or []]
+
+    with self._lock:
+      cached = {} # type: Dict[Text, Text]
+
+      for key in keys:
+        if key in self.store:
+          cached[key] = self.store[key]
+
+          if self.max_size is not None:
+            # Mark this transaction as recently-used.
+            self.store[key] = self.store.pop(key)
+
+    # Preserve order, but don't ask for the same hash twice.
+    missing = list(OrderedDict.fromkeys(k for k in keys if k not in cached))
+
+    response = {}
+    if missing:
+      missing_payload = dict(payload)
+      missing_payload['hashes'] = missing
+
+      response = self.adapter.send_request(missing_payload, **kwargs)
+
+      fetched = dict(zip(missing, map(_as_text, response.get('trytes') or [])))
+
+      with self._lock:
+        for key, trytes in fetched.items():
+          # If the node doesn't have a transaction, it returns all 9's.
+          # The transaction might show up later, so don't cache it.
+          if trytes.strip('9'):
+            self._store_trytes(key, trytes)
+
+      cached.update(fetched)
+
+    # Merge the results, in the same order as the request.
+    response = dict(response)
+    response['trytes'] = [cached.get(key) for key in keys]
+    return response
+
+  def _store_trytes(self, key, trytes):
+    # type: (Text, Text) -> None
+    """
+    Adds trytes to the store, evicting old transactions if necessary.
+
+    Must be called while holding the lock.
+    """
+    self.store[key] = trytes
+
+    if self.max_size is not None:
+      while len(self.store) > self.max_size:
+        self.store.popitem(last=False)
+
+  def _get_with_ttl(self, command, payload, **kwargs):
+    # type: (Text, dict, dict) -> dict
+    """
+    Serves a request from the TTL cache, if possible.
+    """
+    with self._lock:
+      cached = self._responses.get(command)
+
+    if cached and (cached[0] > clock()):
+      # Return a copy, in case the caller modifies the response.
+      return deepcopy(cached[1])
+
+    response = self.adapter.send_request(payload, **kwargs)
+
+    with self._lock:
+      self._responses[command] = (clock() + self.ttls[command], response)
+
+    return deepcopy(response)
+
+
+class PoolWrapper(BaseWrapper):
+  """
+  Spreads requests across several nodes.
+
+  Each request goes to the healthy node that is expected to respond
+  the fastest.  If a node returns an error or times out, it is marked
+  unhealthy for a while, and idempotent commands are retried on
+  another node.
+
+  Example::
+
+     cornode = cornode(
+       PoolWrapper([
+         'http://node1.example.com:14265',
+         'http://node2.example.com:14265',
+         'http://node3.example.com:14265',
+       ]),
+     )
+
+  Commands that only make sense for a specific node (e.g.,
+  ``addNeighbors``) should be routed to that node using
+  :py:class:`RoutingWrapper`.
+  """
+  STRATEGY_EWMA = 'ewma'
+  """
+  Pick the node with the lowest average latency (exponentially
+  weighted, so that recent requests count more).
+  """
+
+  STRATEGY_LEAST_OUTSTANDING = 'least_outstanding'
+  """
+  Pick the node with the fewest requests in progress.
+  """
+
+  IDEMPOTENT_COMMANDS = frozenset({
+    'broadcastTransactions',
+    'findTransactions',
+    'getBalances',
+    'getInclusionStates',
+    'getNodeInfo',
+    'getTips',
+    'getTransactionsToApprove',
+    'getTrytes',
+    'storeTransactions',
+  })
+  """
+  Commands that are safe to retry on a different node.
+  """
+
+  def __init__(
+      self,
+      adapters,
+      strategy    = STRATEGY_LEAST_OUTSTANDING,
+      cooldown    = 30,
+      ewma_weight = 0.3,
+  ):
+    # type: (Iterable[AdapterSpec], Text, float, float) -> None
+    """
+    :param adapters:
+      Adapters (or URIs) for each node in the pool.
+
+    :param strategy:
+      How to pick a node for each request; one of
+      :py:attr:`STRATEGY_LEAST_OUTSTANDING` or :py:attr:`STRATEGY_EWMA`.
+
+      Ties are broken using the other strategy.
+
+    :param cooldown:
+      Number of seconds that a node is considered unhealthy after it
+      fails a request.
+
+      If every node is unhealthy, requests are sent to them anyway.
+
+    :param ewma_weight:
+      Weight of the most recent request when updating a node's average
+      latency (between 0 and 1).
+    """
+    adapters = [
+      a if isinstance(a, BaseAdapter) else resolve_adapter(a)
+        for a in adapters
+    ]
+
+    if not adapters:
+      raise with_context(
+        exc = ValueError('``adapters`` must not be empty.'),
+
+        context = {
+          'adapters': adapters,
+        },
+      )
+
+    if strategy not in (self.STRATEGY_EWMA, self.STRATEGY_LEAST_OUTSTANDING):
+      raise with_context(
+        exc = ValueError('Unknown strategy {strategy!r}.'.format(
+          strategy = strategy,
+        )),
+
+        context = {
+          'strategy': strategy,
+        },
+      )
+
+    if not (0 < ewma_weight <= 1):
+      raise with_context(
+        exc = ValueError('``ewma_weight`` must be between 0 and 1.'),
+
+        context = {
+          'ewma_weight': ewma_weight,
+        },
+      )
+
+    # The first node doubles as :py:attr:`adapter`, for compatibility
+    # with :py:class:`BaseWrapper`.
+    super(PoolWrapper, self).__init__(adapters[0])
+
+    self.nodes        = [_PoolNode(a) for a in adapters] # type: List[_PoolNode]
+    self.strategy     = strategy
+    self.cooldown     = cooldown
+    self.ewma_weight  = ewma_weight
+
+    self._lock = Lock()
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command = payload.get('command')
+    retry   = command in self.IDEMPOTENT_COMMANDS
+
+    tried = [] # type: List[_PoolNode]
+
+    while True:
+      node = self._acquire_node(exclude=tried)
+      tried.append(node)
+
+      start = clock()
+      try:
+        response = node.adapter.send_request(payload, **kwargs)
+      except (BadApiResponse, IOError) as e:
+        # :py:class:`requests.RequestException` (which includes
+        # timeouts and connection errors) extends :py:class:`IOError`.
+        self._release_node(node, clock() - start, failed=True)
+
+        self._log(
+          level   = WARNING,
+          message = 'Node {index} failed {command}: {error}'.format(
+            command = command,
+            error   = e,
+            index   = self.nodes.index(node),
+          ),
+
+          context = {
+            'request': payload,
+          },
+        )
+
+        if retry and (len(tried) < len(self.nodes)):
+          continue
+
+        raise
+      else:
+        self._release_node(node, clock() - start, failed=False)
+        return response
+
+  def _acquire_node(self, exclude):
+    # type: (List[_PoolNode]) -> _PoolNode
+    """
+    Picks the node to send the next request to, and marks it busy.
+    """
+    with self._lock:
+      now = clock()
+
+      candidates = [n for n in self.nodes if n not in exclude]
+
+      # Prefer healthy nodes, but if there aren't any left, don't give
+      # up just yet.
+      healthy = [n for n in candidates if n.unhealthy_until <= now]
+
+      if self.strategy == self.STRATEGY_EWMA:
+        key = lambda n: (n.latency, n.outstanding)
+      else:
+        key = lambda n: (n.outstanding, n.latency)
+
+      node = min(healthy or candidates, key=key)
+      node.outstanding += 1
+
+      return node
+
+  def _release_node(self, node, latency, failed):
+    # type: (_PoolNode, float, bool) -> None
+    """
+    Updates the node's stats after a request completes.
+    """
+    with self._lock:
+      node.outstanding -= 1
+
+      if failed:
+        node.unhealthy_until = clock() + self.cooldown
+      else:
+        node.unhealthy_until = 0
+
+        node.latency = (
+            (self.ewma_weight * latency)
+          + ((1 - self.ewma_weight) * node.latency)
+        ) if node.requests else latency
+
+        node.requests += 1
+
+
+class _PoolNode(object):
+  """
+  Keeps track of a node in a :py:class:`PoolWrapper`.
+  """
+  def __init__(self, adapter):
+    # type: (BaseAdapter) -> None
+    self.adapter = adapter
+
+    self.latency          = 0.0
+    self.outstanding      = 0
+    self.requests         = 0
+    self.unhealthy_until  = 0.0
+
+
+class HedgingWrapper(BaseWrapper):
+  """
+  Reduces tail latency by "hedging" slow read requests.
+
+  If the primary node hasn't responded to a read request within the
+  usual time for that command, the same request is sent to a second
+  node, and whichever response arrives first is used.  The other
+  response is ignored.
+
+  The delay is a percentile of the primary node's recent latencies for
+  each command, so only the slowest requests (about 5%, by default) are
+  duplicated.
+
+  Example::
+
+     cornode = cornode(
+       HedgingWrapper(
+         'http://node1.example.com:14265',
+         'http://node2.example.com:14265',
+       ),
+     )
+
+  Hedged requests are sent from a small pool of background threads
+  shared by all requests that go through the wrapper.  Note that a
+  request that is already in progress can't be cancelled; the losing
+  request runs to completion, and keeps its thread busy until then.
+  If every thread is busy, requests are sent without hedging.
+  """
+  HEDGED_COMMANDS = frozenset({
+    'findTransactions',
+    'getBalances',
+    'getInclusionStates',
+    'getNodeInfo',
+    'getTips',
+    'getTrytes',
+  })
+  """
+  Commands that are safe to send to two nodes at once.
+  """
+
+  def __init__(
+      self,
+      adapter,
+      hedge_adapter,
+      percentile  = 0.95,
+      min_samples = 20,
+      max_samples = 100,
+      max_workers = 8,
+  ):
+    # type: (AdapterSpec, AdapterSpec, float, int, int, int) -> None
+    """
+    :param adapter:
+      Adapter (or URI) for the primary node.
+
+    :param hedge_adapter:
+      Adapter (or URI) for the node that receives duplicate requests.
+
+    :param percentile:
+      Latency percentile (between 0 and 1) after which a duplicate
+      request is sent.
+
+    :param min_samples:
+      Number of responses needed for a command before its requests
+      will be hedged.
+
+    :param max_samples:
+      Number of recent latencies to keep for each command.
+
+    :param max_workers:
+      Maximum number of background threads used to send hedged
+      requests.
+    """
+    super(HedgingWrapper, self).__init__(adapter)
+
+    if not isinstance(hedge_adapter, BaseAdapter):
+      hedge_adapter = resolve_adapter(hedge_adapter)
+
+    if not (0 < percentile <= 1):
+      raise with_context(
+        exc = ValueError('``percentile`` must be between 0 and 1.'),
+
+        context = {
+          'percentile': percentile,
+        },
+      )
+
+    if not (0 < min_samples <= max_samples):
+      raise with_context(
+        exc = ValueError(
+          '``min_samples`` must be between 1 and ``max_samples``.',
+        ),
+
+        context = {
+          'max_samples': max_samples,
+          'min_samples': min_samples,
+        },
+      )
+
+    if max_workers < 1:
+      raise with_context(
+        exc = ValueError('``max_workers`` must be at least 1.'),
+
+        context = {
+          'max_workers': max_workers,
+        },
+      )
+
+    self.hedge_adapter  = hedge_adapter # type: BaseAdapter
+    self.percentile     = percentile
+    self.min_samples    = min_samples
+    self.max_samples    = max_samples
+
+    self.latencies = {} # type: Dict[Text, Deque[float]]
+    """
+    Recent latencies of the primary node for each command, in seconds.
+
+    Responses from :py:attr:`hedge_adapter` are not included; they
+    would skew the delay towards the hedge node's latency.
+    """
+
+    self._lock    = Lock()
+    self._workers = _WorkerPool(max_workers)
+
+  def get_delay(self, command):
+    # type: (Text) -> Optional[float]
+    """
+    Returns the number of seconds to wait for the primary node before
+    hedging a request, or ``None`` if the request shouldn't be hedged.
+    """
+    if command not in self.HEDGED_COMMANDS:
+      return None
+
+    with self._lock:
+      samples = sorted(self.latencies.get(command) or ())
+
+    if len(samples) < self.min_samples:
+      return None
+
+    # Nearest-rank percentile.
+    return samples[max(int(ceil(self.percentile * len(samples))) - 1, 0)]
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command = payload.get('command')
+    delay   = self.get_delay(command)
+
+    if delay is None:
+      start     = clock()
+      response  = self.adapter.send_request(payload, **kwargs)
+
+      if command in self.HEDGED_COMMANDS:
+        self._record_latency(command, clock() - start)
+
+      return response
+
+    results = compat.queue.Queue()
+
+    started = self._start_request(
+      self.adapter,
+      command,
+      payload,
+      kwargs,
+      results,
+    )
+
+    if not started:
+      # Every worker is busy; send the request without hedging it.
+      start     = clock()
+      response  = self.adapter.send_request(payload, **kwargs)
+      self._record_latency(command, clock() - start)
+      return response
+
+    try:
+      (error, response) = results.get(timeout=delay)
+    except compat.queue.Empty:
+      started = self._start_request(
+        self.hedge_adapter,
+        command,
+        payload,
+        kwargs,
+        results,
+      )
+
+      if not started:
+        # Every worker is busy; keep waiting for the primary node.
+        (error, response) = results.get()
+
+        if error is not None:
+          raise error
+
+        return response
+
+      self._log(
+        level   = DEBUG,
+        message = 'Hedging {command} after {delay:.3f}s.'.format(
+          command = command,
+          delay   = delay,
+        ),
+
+        context = {
+          'request': payload,
+        },
+      )
+
+      (error, response) = results.get()
+
+      if error is not None:
+        # One node failed; maybe the other one will do better.
+        (_, response) = results.get()
+
+        if response is None:
+          raise error
+
+    else:
+      if error is not None:
+        raise error
+
+    return response
+
+  def _start_request(self, adapter, command, payload, kwargs, results):
+    # type: (BaseAdapter, Text, dict, dict, compat.queue.Queue) -> bool
+    """
+    Sends a request in a background thread.
+
+    The result is added to ``results`` as an ``(error, response)``
+    tuple.
+
+    :return:
+      ``False`` if every worker is busy (in which case the request is
+      not sent).
+    """
+    def run():
+      start = clock()
+
+      try:
+        response = adapter.send_request(payload, **kwargs)
+      except Exception as e:
+        results.put((e, None))
+      else:
+        if adapter is self.adapter:
+          self._record_latency(command, clock() - start)
+
+        results.put((None, response))
+
+    return self._workers.submit(run)
+
+  def _record_latency(self, command, latency):
+    # type: (Text, float) -> None
+    """
+    Adds a latency sample for the specified command.
+    """
+    with self._lock:
+      try:
+        samples = self.latencies[command]
+      except KeyError:
+        samples = self.latencies[command] = deque(maxlen=self.max_samples)
+
+      samples.append(latency)
+
+
+class _WorkerPool(object):
+  """
+  Bounded pool of daemon threads used by :py:class:`HedgingWrapper`.
+
+  Threads are started as needed, up to ``max_workers``, and then
+  reused.  Daemon threads are used so that a request that never
+  completes doesn't prevent the interpreter from exiting.
+  """
+  def __init__(self, max_workers):
+    # type: (int) -> None
+    self.max_workers = max_workers
+
+    self._idle    = 0
+    self._lock    = Lock()
+    self._tasks   = compat.queue.Queue()
+    self._workers = 0
+
+  def submit(self, task):
+    # type: (Callable[[], None]) -> bool
+    """
+    Runs ``task`` in a worker thread.
+
+    :return:
+      ``False`` if every worker is busy (in which case ``task`` is not
+      run).
+    """
+    with self._lock:
+      if self._idle:
+        self._idle -= 1
+      elif self._workers < self.max_workers:
+        self._workers += 1
+
+        thread = Thread(target=self._work)
+        thread.daemon = True
+        thread.start()
+      else:
+        return False
+
+      self._tasks.put(task)
+
+    return True
+
+  def _work(self):
+    # type: () -> None
+    while True:
+      task = self._tasks.get()
+
+      try:
+        task()
+      finally:
+        with self._lock:
+          self._idle += 1
+
+
+class MetricsWrapper(BaseWrapper):
+  """
+  Collects metrics for each command: number of requests and errors,
+  request/response sizes and a latency histogram.
+
+  Example::
+
+     metrics = MetricsWrapper('http://localhost:14265')
+     cornode = cornode(metrics)
+
+     cornode.get_transfers()
+
+     for command, stats in metrics.snapshot().items():
+       print(command, stats['requests'], stats['latency']['p99'])
+
+     # Export for Prometheus' node_exporter (textfile collector).
+     metrics.export_prometheus('/var/lib/node_exporter/cornode.prom')
+
+  Request/response sizes are the sizes of the JSON-encoded payload and
+  response of each request that passes through the wrapper.  The
+  request size matches the body that :py:class:`HttpAdapter` sends;
+  the response size may differ slightly from the body that the node
+  sent (e.g., whitespace).
+  """
+  DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+  )
+  """
+  Default upper bounds of the latency histogram buckets, in seconds.
+  """
+
+  def __init__(self, adapter, buckets=DEFAULT_BUCKETS):
+    # type: (AdapterSpec, Iterable[float]) -> None
+    """
+    :param adapter:
+      The adapter to wrap.
+
+    :param buckets:
+      Upper bounds of the latency histogram buckets, in seconds.
+      A bucket for slower requests is added automatically.
+    """
+    super(MetricsWrapper, self).__init__(adapter)
+
+    buckets = tuple(sorted(buckets))
+
+    if not buckets:
+      raise with_context(
+        exc = ValueError('``buckets`` must not be empty.'),
+
+        context = {
+          'buckets': buckets,
+        },
+      )
+
+    self.buckets = buckets
+
+    self._metrics = {} # type: Dict[Text, _CommandMetrics]
+    self._lock    = Lock()
+
+    self._encoder = JsonEncoder()
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command       = payload.get('command')
+    request_bytes = len(self._encoder.encode(payload))
+
+    start = clock()
+    try:
+      response = self.adapter.send_request(payload, **kwargs)
+    except Exception:
+      self._record_request(
+        command         = command,
+        latency         = clock() - start,
+        failed          = True,
+        request_bytes   = request_bytes,
+        response_bytes  = 0,
+      )
+      raise
+
+    self._record_request(
+      command         = command,
+      latency         = clock() - start,
+      failed          = False,
+      request_bytes   = request_bytes,
+      response_bytes  = len(self._encoder.encode(response)),
+    )
+
+    return response
+
+  def reset(self):
+    # type: () -> None
+    """
+    Discards all collected metrics.
+    """
+    with self._lock:
+      self._metrics.clear()
+
+  def snapshot(self, reset=False):
+    # type: (bool) -> Dict[Text, dict]
+    """
+    Returns the metrics collected so far, indexed by command name.
+
+    :param reset:
+      Whether to discard the metrics after taking the snapshot.
+    """
+    with self._lock:
+      metrics = self._metrics
+
+      if reset:
+        self._metrics = {}
+      else:
+        metrics = deepcopy(metrics)
+
+    return {
+      command: {
+        'errors':         m.errors,
+        'requests':       m.requests,
+        'request_bytes':  m.request_bytes,
+        'response_bytes': m.response_bytes,
+
+        'latency': {
+          'buckets':  list(zip(self.buckets + (float('inf'),), m.bucket_counts)),
+          'count':    m.requests,
+          'sum':      m.latency_sum,
+          'p50':      self._quantile(m.bucket_counts, 0.5),
+          'p90':      self._quantile(m.bucket_counts, 0.9),
+          'p99':      self._quantile(m.bucket_counts, 0.99),
+        },
+      }
+
+      for command, m in metrics.items()
+    }
+
+  def export_prometheus(self, target=None, prefix='cornode'):
+    # type: (Optional[Union[Text, Callable[[Text], None]]], Text) -> Text
+    """
+    Formats the collected metrics using the Prometheus text format.
+
+    :param target:
+      Where to send the output:
+
+      - ``None``: Only return it.
+      - A filename: Write it to the file.  The file is replaced
+        atomically, so it is safe to use with node_exporter's textfile
+        collector.
+      - A callable: Pass it to the callable.
+
+    :param prefix:
+      Prefix for metric names.
+
+    :return:
+      The formatted metrics.
+    """
+    with self._lock:
+      metrics = deepcopy(self._metrics)
+
+    commands  = sorted(metrics.keys())
+    lines     = [] # type: List[Text]
+
+    def add_metric(name, type_, help_, attr):
+      lines.append('# HELP {prefix}_{name} {help}'.format(
+        prefix  = prefix,
+        name    = name,
+        help    = help_,
+      ))
+
+      lines.append('# TYPE {prefix}_{name} {type}'.format(
+        prefix  = prefix,
+        name    = name,
+        type    = type_,
+      ))
+
+      for command in commands:
+        lines.append('{prefix}_{name}{{command="{command}"}} {value}'.format(
+          prefix  = prefix,
+          name    = name,
+          command = command,
+          value   = getattr(metrics[command], attr),
+        ))
+
+    add_metric(
+      'requests_total', 'counter', 'Number of API requests sent.', 'requests',
+    )
+
+    add_metric(
+      'errors_total', 'counter', 'Number of API requests that failed.',
+      'errors',
+    )
+
+    add_metric(
+      'request_bytes_total', 'counter', 'Size of API request bodies.',
+      'request_bytes',
+    )
+
+    add_metric(
+      'response_bytes_total', 'counter', 'Size of API response bodies.',
+      'response_bytes',
+    )
+
+    name = '{prefix}_request_duration_seconds'.format(prefix=prefix)
+    lines.append('# HELP {name} API request latency.'.format(name=name))
+    lines.append('# TYPE {name} histogram'.format(name=name))
+
+    for command in commands:
+      m = metrics[command]
+
+      cumulative = 0
+      for bound, count in zip(self.buckets + (None,), m.bucket_counts):
+        cumulative += count
+
+        lines.append(
+          '{name}_bucket{{command="{command}",le="{le}"}} {value}'.format(
+            name    = name,
+            command = command,
+            le      = '+Inf' if bound is None else repr(float(bound)),
+            value   = cumulative,
+          ),
+        )
+
+      lines.append('{name}_sum{{command="{command}"}} {value!r}'.format(
+        name    = name,
+        command = command,
+        value   = m.latency_sum,
+      ))
+
+      lines.append('{name}_count{{command="{command}"}} {value}'.format(
+        name    = name,
+        command = command,
+        value   = m.requests,
+      ))
+
+    output = '\n'.join(lines) + '\n'
+
+    if callable(target):
+      target(output)
+    elif target is not None:
+      # Write to a temporary file and rename it, so that readers never
+      # see a partially-written file.
+      temp_path = '{path}.{pid}.tmp'.format(path=target, pid=getpid())
+
+      with io_open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(output)
+
+      replace_file(temp_path, target)
+
+    return output
+
+  def _get_metrics(self, command):
+    # type: (Text) -> _CommandMetrics
+    """
+    Returns the metrics for the specified command, creating them if
+    necessary.
+
+    Must be called while holding the lock.
+    """
+    try:
+      return self._metrics[command]
+    except KeyError:
+      metrics = self._metrics[command] = _CommandMetrics(len(self.buckets) + 1)
+      return metrics
+
+  def _quantile(self, bucket_counts, q):
+    # type: (List[int], float) -> Optional[float]
+    """
+    Estimates a latency quantile from a histogram, by interpolating
+    within the bucket that contains it (same as Prometheus'
+    ``histogram_quantile``).
+    """
+    total = sum(bucket_counts)
+    if not total:
+      return None
+
+    rank        = q * total
+    cumulative  = 0
+
+    for i, count in enumerate(bucket_counts):
+      if count and (cumulative + count >= rank):
+        lower = self.buckets[i - 1] if i else 0.0
+
+        if i == len(self.buckets):
+          # The last bucket has no upper bound; the best we can do is
+          # its lower bound.
+          return lower
+
+        return lower + (self.buckets[i] - lower) * (rank - cumulative) / count
+
+      cumulative += count
+
+    return self.buckets[-1]
+
+  def _record_request(
+      self,
+      command,
+      latency,
+      failed,
+      request_bytes,
+      response_bytes,
+  ):
+    # type: (Text, float, bool, int, int) -> None
+    """
+    Records a request that passed through the wrapper.
+    """
+    with self._lock:
+      metrics = self._get_metrics(command)
+
+      metrics.requests        += 1
+      metrics.latency_sum     += latency
+      metrics.request_bytes   += request_bytes
+      metrics.response_bytes  += response_bytes
+
+      if failed:
+        metrics.errors += 1
+
+      metrics.bucket_counts[bisect_left(self.buckets, latency)] += 1
+
+
+class _CommandMetrics(object):
+  """
+  Metrics for a single command in a :py:class:`MetricsWrapper`.
+  """
+  def __init__(self, bucket_count):
+    # type: (int) -> None
+    self.errors         = 0
+    self.requests       = 0
+    self.request_bytes  = 0
+    self.response_bytes = 0
+
+    self.bucket_counts  = [0] * bucket_count
+    self.latency_sum    = 0.0
+
+
+def _as_text(trytes):
+  # type: (Union[TryteString, binary_type, Text]) -> Text
+  """
+  Converts a tryte sequence into a string, so that it can be used in a
+  cache store.
+  """
+  if isinstance(trytes, TryteString):
+    return trytes.as_json_compatible()
+
+  if isinstance(trytes, binary_type):
+    return trytes.decode('ascii')
+
+  return text_type(trytes)
@@ -0,0 +1,224 @@
+# coding=utf-8
+"""
+:py:mod:`asyncio` support.
+
+When a command is sent through an asynchronous adapter (see
+:py:mod:`cornode.adapter.aio`), it returns a coroutine instead of a
+response::
+
+   api = Asynccornode('https://localhost:14265', seed)
+
+   node_info, account_data = await asyncio.gather(
+     api.get_node_info(),
+     api.get_account_data(),
+   )
+
+Core commands await the adapter directly.  Extended commands do a lot
+of CPU-bound work (e.g., generating addresses, signing transactions),
+so they run in the event loop's default executor; their requests are
+still sent using the event loop.
+
+Requires Python 3.5 or later.
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import asyncio
+from functools import partial
+from operator import attrgetter
+from typing import Awaitable, Callable, Dict, List, Optional, Type
+
+from cornode import Address, AdapterSpec, TransactionHash, \
+  TrytesCompatible
+from cornode.adapter.aio import BlockingAdapter, resolve_async_adapter
+from cornode.api import Strictcornode, cornode
+from cornode.commands import BaseCommand
+from cornode.commands.core.find_transactions import FindTransactionsCommand
+from cornode.commands.core.get_balances import GetBalancesCommand
+from cornode.commands.extended.get_account_data import GetAccountDataCommand
+from cornode.commands.extended.utils import \
+  get_bundles_from_transaction_hashes, iter_used_addresses
+from cornode.crypto.addresses import AddressGenerator
+from cornode.crypto.types import Seed
+
+__all__ = [
+  'AsyncStrictcornode',
+  'Asynccornode',
+  'async_commands',
+  'call_command',
+]
+
+
+async_commands = {} # type: Dict[Type[BaseCommand], Callable[[BaseCommand, dict], Awaitable[dict]]]
+"""
+Native coroutine implementations of commands' ``_execute`` method,
+indexed by command class.
+
+Commands that override ``_execute`` but are not listed here run in the
+event loop's default executor.
+"""
+
+
+class AsyncStrictcornode(Strictcornode):
+  """
+  Asynchronous version of :py:class:`Strictcornode`.
+
+  Every API method returns a coroutine.
+  """
+  def __init__(self, adapter, testnet=False):
+    # type: (AdapterSpec, bool) -> None
+    """
+    :param adapter:
+      URI string or BaseAdapter instance.
+
+      Synchronous adapters will be wrapped in a
+      :py:class:`cornode.adapter.aio.ExecutorAdapter`.
+
+    :param testnet:
+      Whether to use testnet settings for this instance.
+    """
+    super(AsyncStrictcornode, self).__init__(
+      resolve_async_adapter(adapter),
+      testnet,
+    )
+
+
+class Asynccornode(cornode):
+  """
+  Asynchronous version of :py:class:`cornode`.
+
+  Every API method returns a coroutine.
+  """
+  def __init__(self, adapter, seed=None, testnet=False):
+    # type: (AdapterSpec, Optional[TrytesCompatible], bool) -> None
+    """
+    :param adapter:
+      URI string or BaseAdapter instance.
+
+      Synchronous adapters will be wrapped in a
+      :py:class:`cornode.adapter.aio.ExecutorAdapter`.
+
+    :param seed:
+      Seed used to generate new addresses.
+      If not provided, a random one will be generated.
+
+      Note: This value is never transferred to the node/network.
+
+    :param testnet:
+      Whether to use testnet settings for this instance.
+    """
+    super(Asynccornode, self).__init__(
+      resolve_async_adapter(adapter),
+      seed,
+      testnet,
+    )
+
+
+async def call_command(command, request):
+  # type: (BaseCommand, dict) -> dict
+  """
+  Asynchronous version of :py:meth:`BaseCommand.__call__`.
+  """
+  command._prepare_call(request)
+
+  execute = async_commands.get(type(command))
+
+  if execute is not None:
+    response = await execute(command, command.request)
+
+  elif type(command)._execute is BaseCommand._execute:
+    command.request['command'] = command.command
+    response = await command.adapter.send_request(command.request)
+
+  else:
+    loop    = asyncio.get_event_loop()
+    adapter = command.adapter
+
+    # Extended commands send their own requests, synchronously, from
+    # the worker thread.
+    command.adapter = BlockingAdapter(adapter, loop)
+    try:
+      response = await loop.run_in_executor(
+        None,
+        command._execute,
+        command.request,
+      )
+    finally:
+      command.adapter = adapter
+
+  return command._finish_call(response)
+
+
+async def _get_account_data(command, request):
+  # type: (GetAccountDataCommand, dict) -> dict
+  """
+  Asynchronous version of :py:meth:`GetAccountDataCommand._execute`.
+
+  Fetches balances and bundles concurrently.
+  """
+  gap_limit         = request['gapLimit'] # type: int
+  inclusion_states  = request['inclusionStates'] # type: bool
+  seed              = request['seed'] # type: Seed
+  start             = request['start'] # type: int
+  stop              = request['stop'] # type: Optional[int]
+  window_size       = request['windowSize'] # type: int
+
+  loop      = asyncio.get_event_loop()
+  blocking  = BlockingAdapter(command.adapter, loop)
+
+  if stop is None:
+    # Each address depends on the previous one being used, so there
+    # isn't much we can do in parallel here.
+    used = await loop.run_in_executor(
+      None,
+      lambda: list(iter_used_addresses(
+        adapter     = blocking,
+        seed        = seed,
+        start       = start,
+        gap_limit   = gap_limit,
+        window_size = window_size,
+      )),
+    )
+
+    my_addresses  = [addy for (addy, _) in used] # type: List[Address]
+    my_hashes     = [h for (_, hashes) in used for h in hashes] # type: List[TransactionHash]
+  else:
+    my_addresses = await loop.run_in_executor(
+      None,
+      AddressGenerator(seed).get_addresses,
+      start,
+      stop - start,
+    )
+
+    ft_response = await FindTransactionsCommand(command.adapter)(
+      addresses = my_addresses,
+    )
+
+    my_hashes = ft_response.get('hashes') or []
+
+  account_balance = 0
+  if my_hashes:
+    (gb_response, bundles) = await asyncio.gather(
+      GetBalancesCommand(command.adapter)(addresses=my_addresses),
+
+      loop.run_in_executor(None, partial(
+        get_bundles_from_transaction_hashes,
+        adapter             = blocking,
+        transaction_hashes  = my_hashes,
+        inclusion_states    = inclusion_states,
+      )),
+    )
+
+    for i, balance in enumerate(gb_response['balances']):
+      my_addresses[i].balance = balance
+      account_balance += balance
+  else:
+    bundles = []
+
+  return {
+    'addresses':  list(sorted(my_addresses, key=attrgetter('key_index'))),
+    'balance':    account_balance,
+    'bundles':    bundles,
+  }
+
+async_commands[GetAccountDataCommand] = _get_account_data
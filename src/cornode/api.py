@@ -425,8 +425,15 @@ class cornode(Strictcornode):
     """
     return extended.BroadcastAndStoreCommand(self.adapter)(trytes=trytes)
 
-  def get_account_data(self, start=0, stop=None, inclusion_states=False):
-    # type± (int, Optional[int], bool) -> dict
+  def get_account_data(
+      self,
+      start             = 0,
+      stop              = None,
+      inclusion_states  = False,
+      gap_limit         = None,
+      window_size       = None,
+  ):
+    # type: (int, Optional[int], bool, Optional[int], Optional[int]) -> dict
     """
     More comprehensive version of :py:meth:`get_transfers` that returns
     addresses and account balance in addition to bundles.
@@ -452,6 +459,20 @@ class cornode(Strictcornode):
       This requires an additional API call to the node, so it is
       disabled by default.
 
+    :param gap_limit:
+      Only applies if ``stop`` is ``None``.
+      Number of consecutive unused addresses to check before stopping.
+      Increase this to skip over gaps of unused addresses (e.g., if
+      some of the addresses were generated but never used).
+
+      If ``None`` (default), the scan stops at the first unused
+      address.
+
+    :param window_size:
+      Only applies if ``stop`` is ``None``.
+      Maximum number of addresses to check per ``findTransactions``
+      request.
+
     :return:
       Dict containing the following values::
 
@@ -472,6 +493,8 @@ class cornode(Strictcornode):
       start           = start,
       stop            = stop,
       inclusionStates = inclusion_states,
+      gapLimit        = gap_limit,
+      windowSize      = window_size,
     )
 
   def get_bundles(self, transaction):
@@ -501,8 +524,15 @@ class cornode(Strictcornode):
     """
     return extended.GetBundlesCommand(self.adapter)(transaction=transaction)
 
-  def get_inputs(self, start=0, stop=None, threshold=None):
-    # type: (int, Optional[int], Optional[int]) -> dict
+  def get_inputs(
+      self,
+      start       = 0,
+      stop        = None,
+      threshold   = None,
+      gap_limit   = None,
+      window_size = None,
+  ):
+    # type: (int, Optional[int], Optional[int], Optional[int], Optional[int]) -> dict
     """
     Gets all possible inputs of a seed and returns them with the total
     balance.
@@ -542,6 +572,20 @@ class cornode(Strictcornode):
       If ``threshold`` is ``None`` (default), this method will return
       **all** inputs in the specified key range.
 
+    :param gap_limit:
+      Only applies if ``stop`` is ``None``.
+      Number of consecutive unused addresses to check before stopping.
+      Increase this to skip over gaps of unused addresses (e.g., if
+      some of the addresses were generated but never used).
+
+      If ``None`` (default), the scan stops at the first unused
+      address.
+
+    :param window_size:
+      Only applies if ``stop`` is ``None``.
+      Maximum number of addresses to check per ``findTransactions``
+      request.
+
     :return:
       Dict with the following structure::
 
@@ -572,10 +616,12 @@ class cornode(Strictcornode):
       - https://github.com/cornodeledger/wiki/blob/master/api-proposal.md#getinputs
     """
     return extended.GetInputsCommand(self.adapter)(
-      seed      = self.seed,
-      start     = start,
-      stop      = stop,
-      threshold = threshold,
+      seed        = self.seed,
+      start       = start,
+      stop        = stop,
+      threshold   = threshold,
+      gapLimit    = gap_limit,
+      windowSize  = window_size,
     )
 
   def get_latest_inclusion(self, hashes):
@@ -599,8 +645,14 @@ class cornode(Strictcornode):
     """
     return extended.GetLatestInclusionCommand(self.adapter)(hashes=hashes)
 
-  def get_new_addresses(self, index=0, count=1):
-    # type: (int, Optional[int]) -> dict
+  def get_new_addresses(
+      self,
+      index       = 0,
+      count       = 1,
+      gap_limit   = None,
+      window_size = None,
+  ):
+    # type: (int, Optional[int], Optional[int], Optional[int]) -> dict
     """
     Generates one or more new addresses from the seed.
 
@@ -616,6 +668,19 @@ class cornode(Strictcornode):
       If ``None``, this method will scan the Tangle to find the next
       available unused address and return that.
 
+    :param gap_limit:
+      Only applies if ``count`` is ``None``.
+      The scan returns the first address of a run of this many
+      consecutive unused addresses; shorter gaps of unused addresses
+      are skipped.
+
+      If ``None`` (default), the first unused address is returned.
+
+    :param window_size:
+      Only applies if ``count`` is ``None``.
+      Maximum number of addresses to check per ``findTransactions``
+      request.
+
     :return:
       Dict with the following items::
 
@@ -628,13 +693,22 @@ class cornode(Strictcornode):
       - https://github.com/cornodeledger/wiki/blob/master/api-proposal.md#getnewaddress
     """
     return extended.GetNewAddressesCommand(self.adapter)(
-      seed  = self.seed,
-      index = index,
-      count = count,
+      seed        = self.seed,
+      index       = index,
+      count       = count,
+      gapLimit    = gap_limit,
+      windowSize  = window_size,
     )
 
-  def get_transfers(self, start=0, stop=None, inclusion_states=False):
-    # type: (int, Optional[int], bool) -> dict
+  def get_transfers(
+      self,
+      start             = 0,
+      stop              = None,
+      inclusion_states  = False,
+      gap_limit         = None,
+      window_size       = None,
+  ):
+    # type: (int, Optional[int], bool, Optional[int], Optional[int]) -> dict
     """
     Returns all transfers associated with the seed.
 
@@ -656,6 +730,20 @@ class cornode(Strictcornode):
       This requires an additional API call to the node, so it is
       disabled by default.
 
+    :param gap_limit:
+      Only applies if ``stop`` is ``None``.
+      Number of consecutive unused addresses to check before stopping.
+      Increase this to skip over gaps of unused addresses (e.g., if
+      some of the addresses were generated but never used).
+
+      If ``None`` (default), the scan stops at the first unused
+      address.
+
+    :param window_size:
+      Only applies if ``stop`` is ``None``.
+      Maximum number of addresses to check per ``findTransactions``
+      request.
+
     :return:
       Dict containing the following values::
 
@@ -672,6 +760,8 @@ class cornode(Strictcornode):
       start           = start,
       stop            = stop,
       inclusionStates = inclusion_states,
+      gapLimit        = gap_limit,
+      windowSize      = window_size,
     )
 
   def prepare_transfer(self, transfers, inputs=None, change_address=None):
@@ -2,14 +2,27 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from codecs import Codec, CodecInfo, register as lookup_function
+from codecs import BufferedIncrementalDecoder, Codec, CodecInfo, \
+  IncrementalEncoder, StreamReader, StreamWriter, \
+  register as lookup_function
+from operator import add
+from typing import Union
 
 from cornode.exceptions import with_context
-from six import PY3, binary_type
+from six import PY2, PY3, binary_type
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
 
 __all__ = [
   'TrytesCodec',
   'TrytesDecodeError',
+  'TrytesIncrementalDecoder',
+  'TrytesIncrementalEncoder',
+  'TrytesStreamReader',
+  'TrytesStreamWriter',
 ]
 
 
@@ -50,6 +63,11 @@ class TrytesCodec(Codec):
     codec_info = {
       'encode': codec.encode,
       'decode': codec.decode,
+
+      'incrementalencoder': TrytesIncrementalEncoder,
+      'incrementaldecoder': TrytesIncrementalDecoder,
+      'streamreader':       TrytesStreamReader,
+      'streamwriter':       TrytesStreamWriter,
     }
 
     # In Python 2, all codecs are made equal.
@@ -78,18 +96,12 @@ class TrytesCodec(Codec):
         },
       )
 
-    # :bc: In Python 2, iterating over a byte string yields characters
-    # instead of integers.
-    if not isinstance(input, bytearray):
-      input = bytearray(input)
-
-    trytes = bytearray()
-
-    for c in input:
-      second, first = divmod(c, len(self.alphabet))
-
-      trytes.append(self.alphabet[first])
-      trytes.append(self.alphabet[second])
+    # Each byte is encoded as a pair of trytes, so we can translate
+    # all the first trytes and all the second trytes at once, then
+    # interleave them.
+    trytes = bytearray(len(input) * 2)
+    trytes[0::2] = input.translate(_ENCODE_FIRST)
+    trytes[1::2] = input.translate(_ENCODE_SECOND)
 
     return binary_type(trytes), len(input)
 
@@ -98,6 +110,21 @@ class TrytesCodec(Codec):
     """
     Decodes a tryte string into bytes.
     """
+    return self._decode(input, errors, final=True)
+
+  # noinspection PyShadowingBuiltins
+  def _decode(self, input, errors, final):
+    """
+    Decodes a tryte string into bytes.
+
+    :param final:
+      Whether this is the end of the input.  If not, a trailing tryte
+      (i.e., half of a pair) is left undecoded instead of being treated
+      as an error.
+
+    :return:
+      ``(bytes, number of trytes consumed)``.
+    """
     if isinstance(input, memoryview):
       input = input.tobytes()
 
@@ -112,6 +139,19 @@ class TrytesCodec(Codec):
         },
       )
 
+    if not final and (len(input) % 2):
+      bytes_, _ = self._decode(input[:-1], errors, final=True)
+      return bytes_, len(input) - 1
+
+    if not (len(input) % 2):
+      try:
+        return _decode_pairs(input), len(input)
+      except ValueError:
+        # At least one pair of trytes can't be decoded; fall back to
+        # decoding one pair at a time, so that we can find out which
+        # one it is.
+        pass
+
     # :bc: In Python 2, iterating over a byte string yields characters
     #   instead of integers.
     if not isinstance(input, bytearray):
@@ -146,9 +186,10 @@ class TrytesCodec(Codec):
             self.index[first]
           + (self.index[second] * len(self.index))
         )
-      except ValueError:
+      except (KeyError, ValueError):
         # This combination of trytes yields a value > 255 when
-        # decoded.  Naturally, we can't represent this using ASCII.
+        # decoded (or one of them isn't a tryte at all).  Naturally,
+        # we can't represent this using ASCII.
         if errors == 'strict':
           raise with_context(
             exc = TrytesDecodeError(
@@ -171,6 +212,143 @@ class TrytesCodec(Codec):
     return binary_type(bytes_), len(input)
 
 
+class TrytesIncrementalEncoder(IncrementalEncoder):
+  """
+  Encodes bytes into trytes, one chunk at a time.
+  """
+  # noinspection PyShadowingBuiltins
+  def encode(self, input, final=False):
+    # Every byte maps to exactly one pair of trytes, so there is never
+    # any state to carry over to the next chunk.
+    return TrytesCodec().encode(input, self.errors)[0]
+
+
+class TrytesIncrementalDecoder(BufferedIncrementalDecoder):
+  """
+  Decodes trytes into bytes, one chunk at a time.
+
+  If a chunk has an odd number of trytes, the last one is held back
+  until the next chunk arrives.
+  """
+  # noinspection PyShadowingBuiltins
+  def _buffer_decode(self, input, errors, final):
+    return TrytesCodec()._decode(input, errors, final)
+
+
+class TrytesStreamWriter(TrytesCodec, StreamWriter):
+  """
+  Writes bytes to a stream as trytes.
+  """
+  pass
+
+
+class TrytesStreamReader(TrytesCodec, StreamReader):
+  """
+  Reads trytes from a stream and decodes them into bytes.
+
+  Example::
+
+     with open('message.trytes', 'rb') as f:
+       reader = codecs.getreader('trytes')(f)
+
+       for chunk in iter(lambda: reader.read(65536), b''):
+         ...
+  """
+  charbuffertype = binary_type
+
+  # noinspection PyShadowingBuiltins
+  def decode(self, input, errors='strict'):
+    # The stream might be split in the middle of a pair of trytes;
+    # :py:class:`StreamReader` will pass any leftover tryte back to us
+    # along with the next chunk.
+    # If there is no next chunk (i.e., ``input`` is just the leftover),
+    # we've reached the end of the stream, and a leftover tryte is
+    # handled according to ``errors``.
+    final = len(input) <= len(self.bytebuffer)
+
+    return self._decode(input, errors, final)
+
+
+def _decode_pairs(trytes):
+  # type: (Union[binary_type, bytearray]) -> binary_type
+  """
+  Decodes an even-length tryte sequence in bulk.
+
+  :raise:
+    - :py:class:`ValueError` if any pair of trytes can't be decoded
+      (the caller can decode the trytes one pair at a time to find out
+      which one).
+  """
+  if np is not None:
+    trytes  = np.frombuffer(trytes, dtype=np.uint8)
+    values  = _DECODE_FIRST_ARRAY[trytes[0::2]] + _DECODE_SECOND_ARRAY[trytes[1::2]]
+
+    if len(values) and (values.max() > 255):
+      raise ValueError('Undecodable tryte pair.')
+
+    return values.astype(np.uint8).tobytes()
+
+  # :bc: In Python 2, iterating over a byte string yields characters
+  #   instead of integers.
+  if PY2:
+    trytes = bytearray(trytes)
+
+  # :py:class:`bytearray` raises a ``ValueError`` if any value is
+  # > 255.
+  return binary_type(bytearray(map(
+    add,
+    map(_DECODE_FIRST.__getitem__, trytes[0::2]),
+    map(_DECODE_SECOND.__getitem__, trytes[1::2]),
+  )))
+
+
+_ENCODE_FIRST = binary_type(bytearray(
+  TrytesCodec.alphabet[i % len(TrytesCodec.alphabet)]
+    for i in range(256)
+))
+"""
+Translation table that maps each byte to the first tryte in its
+encoded form.
+"""
+
+_ENCODE_SECOND = binary_type(bytearray(
+  TrytesCodec.alphabet[i // len(TrytesCodec.alphabet)]
+    for i in range(256)
+))
+"""
+Translation table that maps each byte to the second tryte in its
+encoded form.
+"""
+
+# Any value > 255 can't be decoded; use one that's big enough to keep
+# the sum out of range, no matter what the other tryte is.
+_INVALID_TRYTE = 1000
+
+_DECODE_FIRST = [
+  TrytesCodec.index.get(i, _INVALID_TRYTE)
+    for i in range(256)
+]
+"""
+Maps each (ASCII code of a) tryte to its value when it is the first
+tryte in a pair.
+"""
+
+_DECODE_SECOND = [
+  TrytesCodec.index[i] * len(TrytesCodec.index)
+    if i in TrytesCodec.index
+    else _INVALID_TRYTE
+    for i in range(256)
+]
+"""
+Maps each (ASCII code of a) tryte to its value when it is the second
+tryte in a pair.
+"""
+
+if np is not None:
+  _DECODE_FIRST_ARRAY   = np.array(_DECODE_FIRST, dtype=np.uint16)
+  _DECODE_SECOND_ARRAY  = np.array(_DECODE_SECOND, dtype=np.uint16)
+
+
 @lookup_function
 def check_trytes_codec(encoding):
   if encoding == TrytesCodec.name:
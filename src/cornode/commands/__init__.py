@@ -102,6 +102,23 @@ class BaseCommand(with_metaclass(CommandMeta)):
     # type: (dict) -> dict
     """
     Sends the command to the node.
+
+    If the adapter is asynchronous, returns a coroutine instead (see
+    :py:mod:`cornode.aio`).
+    """
+    if self.adapter.is_async:
+      # :bc: Imported here because :py:mod:`cornode.aio` requires
+      # Python 3.5.
+      from cornode.aio import call_command
+      return call_command(self, kwargs)
+
+    self._prepare_call(kwargs)
+    return self._finish_call(self._execute(self.request))
+
+  def _prepare_call(self, request):
+    # type: (dict) -> None
+    """
+    Prepares the request, before the command is executed.
     """
     if self.called:
       raise with_context(
@@ -113,13 +130,18 @@ class BaseCommand(with_metaclass(CommandMeta)):
         },
       )
 
-    self.request = kwargs
+    self.request = request
 
     replacement = self._prepare_request(self.request)
     if replacement is not None:
       self.request = replacement
 
-    self.response = self._execute(self.request)
+  def _finish_call(self, response):
+    # type: (dict) -> dict
+    """
+    Prepares the response, after the command has been executed.
+    """
+    self.response = response
 
     replacement = self._prepare_response(self.response)
     if replacement is not None:
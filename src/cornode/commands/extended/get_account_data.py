@@ -10,7 +10,8 @@ from cornode import Address, TransactionHash
 from cornode.commands import FilterCommand, RequestFilter
 from cornode.commands.core.find_transactions import FindTransactionsCommand
 from cornode.commands.core.get_balances import GetBalancesCommand
-from cornode.commands.extended.utils import get_bundles_from_transaction_hashes, \
+from cornode.commands.extended.utils import DEFAULT_GAP_LIMIT, \
+  DEFAULT_WINDOW_SIZE, get_bundles_from_transaction_hashes, \
   iter_used_addresses
 from cornode.crypto.addresses import AddressGenerator
 from cornode.crypto.types import Seed
@@ -36,16 +37,26 @@ class GetAccountDataCommand(FilterCommand):
     pass
 
   def _execute(self, request):
+    gap_limit         = request['gapLimit'] # type: int
     inclusion_states  = request['inclusionStates'] # type: bool
     seed              = request['seed'] # type: Seed
     start             = request['start'] # type: int
     stop              = request['stop'] # type: Optional[int]
+    window_size       = request['windowSize'] # type: int
 
     if stop is None:
       my_addresses  = [] # type: List[Address]
       my_hashes     = [] # type: List[TransactionHash]
 
-      for addy, hashes in iter_used_addresses(self.adapter, seed, start):
+      used = iter_used_addresses(
+        adapter     = self.adapter,
+        seed        = seed,
+        start       = start,
+        gap_limit   = gap_limit,
+        window_size = window_size,
+      )
+
+      for addy, hashes in used:
         my_addresses.append(addy)
         my_hashes.extend(hashes)
     else:
@@ -98,12 +109,20 @@ class GetAccountDataRequestFilter(RequestFilter):
         'start':  f.Type(int) | f.Min(0) | f.Optional(0),
 
         'inclusionStates': f.Type(bool) | f.Optional(False),
+
+        'gapLimit':
+          f.Type(int) | f.Min(1) | f.Optional(DEFAULT_GAP_LIMIT),
+
+        'windowSize':
+          f.Type(int) | f.Min(1) | f.Optional(DEFAULT_WINDOW_SIZE),
       },
 
       allow_missing_keys = {
         'stop',
         'inclusionStates',
         'start',
+        'gapLimit',
+        'windowSize',
       },
     )
 
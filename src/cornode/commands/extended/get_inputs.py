@@ -8,7 +8,8 @@ import filters as f
 from cornode import BadApiResponse
 from cornode.commands import FilterCommand, RequestFilter
 from cornode.commands.core.get_balances import GetBalancesCommand
-from cornode.commands.extended.utils import iter_used_addresses
+from cornode.commands.extended.utils import DEFAULT_GAP_LIMIT, \
+  DEFAULT_WINDOW_SIZE, iter_used_addresses
 from cornode.crypto.addresses import AddressGenerator
 from cornode.crypto.types import Seed
 from cornode.exceptions import with_context
@@ -34,15 +35,25 @@ class GetInputsCommand(FilterCommand):
     pass
 
   def _execute(self, request):
-    stop      = request['stop'] # type: Optional[int]
-    seed      = request['seed'] # type: Seed
-    start     = request['start'] # type: int
-    threshold = request['threshold'] # type: Optional[int]
+    gap_limit   = request['gapLimit'] # type: int
+    stop        = request['stop'] # type: Optional[int]
+    seed        = request['seed'] # type: Seed
+    start       = request['start'] # type: int
+    threshold   = request['threshold'] # type: Optional[int]
+    window_size = request['windowSize'] # type: int
 
     # Determine the addresses we will be scanning.
     if stop is None:
-      addresses =\
-        [addy for addy, _ in iter_used_addresses(self.adapter, seed, start)]
+      addresses = [
+        addy
+          for addy, _ in iter_used_addresses(
+            adapter     = self.adapter,
+            seed        = seed,
+            start       = start,
+            gap_limit   = gap_limit,
+            window_size = window_size,
+          )
+      ]
     else:
       addresses = AddressGenerator(seed).get_addresses(start, stop)
 
@@ -112,6 +123,12 @@ class GetInputsRequestFilter(RequestFilter):
         'start':      f.Type(int) | f.Min(0) | f.Optional(0),
         'threshold':  f.Type(int) | f.Min(0),
 
+        'gapLimit':
+          f.Type(int) | f.Min(1) | f.Optional(DEFAULT_GAP_LIMIT),
+
+        'windowSize':
+          f.Type(int) | f.Min(1) | f.Optional(DEFAULT_WINDOW_SIZE),
+
         # These arguments are required.
         'seed': f.Required | Trytes(result_type=Seed),
       },
@@ -120,6 +137,8 @@ class GetInputsRequestFilter(RequestFilter):
         'stop',
         'start',
         'threshold',
+        'gapLimit',
+        'windowSize',
       }
     )
 
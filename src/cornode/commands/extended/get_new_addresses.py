@@ -2,12 +2,14 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from typing import Optional
+from typing import List, Optional
 
 import filters as f
 
+from cornode import Address
 from cornode.commands import FilterCommand, RequestFilter
-from cornode.commands.core.find_transactions import FindTransactionsCommand
+from cornode.commands.extended.utils import DEFAULT_GAP_LIMIT, \
+  DEFAULT_WINDOW_SIZE, iter_address_hashes
 from cornode.crypto.addresses import AddressGenerator
 from cornode.crypto.types import Seed
 from cornode.filters import Trytes
@@ -32,29 +34,47 @@ class GetNewAddressesCommand(FilterCommand):
     pass
 
   def _execute(self, request):
-    count = request['count'] # type: Optional[int]
-    index = request['index'] # type: int
-    seed  = request['seed'] # type: Seed
+    count       = request['count'] # type: Optional[int]
+    gap_limit   = request['gapLimit'] # type: int
+    index       = request['index'] # type: int
+    seed        = request['seed'] # type: Seed
+    window_size = request['windowSize'] # type: int
 
     return {
-      'addresses': self._find_addresses(seed, index, count),
+      'addresses':
+        self._find_addresses(seed, index, count, gap_limit, window_size),
     }
 
-  def _find_addresses(self, seed, index, count):
+  def _find_addresses(self, seed, index, count, gap_limit, window_size):
     """
     Find addresses matching the command parameters.
     """
-    # type: (Seed, int, Optional[int]) -> List[Address]
+    # type: (Seed, int, Optional[int], int, int) -> List[Address]
     generator = AddressGenerator(seed)
 
     if count is None:
       # Connect to Tangle and find the first address without any
-      # transactions.
-      for addy in generator.create_iterator(start=index):
-        response = FindTransactionsCommand(self.adapter)(addresses=[addy])
-
-        if not response.get('hashes'):
-          return [addy]
+      # transactions, skipping over gaps of fewer than ``gap_limit``
+      # unused addresses.
+      first_unused  = None # type: Optional[Address]
+      gap           = 0
+
+      for addy, hashes in iter_address_hashes(
+          adapter     = self.adapter,
+          seed        = seed,
+          start       = index,
+          window_size = window_size,
+      ):
+        if hashes:
+          first_unused  = None
+          gap           = 0
+        else:
+          if first_unused is None:
+            first_unused = addy
+
+          gap += 1
+          if gap >= gap_limit:
+            return [first_unused]
 
     return generator.get_addresses(start=index, count=count)
 
@@ -67,11 +87,19 @@ class GetNewAddressesRequestFilter(RequestFilter):
         'count':  f.Type(int) | f.Min(1),
         'index':  f.Type(int) | f.Min(0) | f.Optional(default=0),
 
+        'gapLimit':
+          f.Type(int) | f.Min(1) | f.Optional(DEFAULT_GAP_LIMIT),
+
+        'windowSize':
+          f.Type(int) | f.Min(1) | f.Optional(DEFAULT_WINDOW_SIZE),
+
         'seed':   f.Required | Trytes(result_type=Seed),
       },
 
       allow_missing_keys = {
         'count',
         'index',
+        'gapLimit',
+        'windowSize',
       },
     )
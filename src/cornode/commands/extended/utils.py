@@ -2,18 +2,37 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from typing import Generator, Iterable, List, Tuple
+from typing import Dict, Generator, Iterable, List, Tuple
 
-from cornode import Address, Bundle, Transaction, \
-  TransactionHash
+from cornode import Address, BadApiResponse, Bundle, BundleHash, \
+  LazyTransaction, Transaction, TransactionHash
 from cornode.adapter import BaseAdapter
 from cornode.commands.core.find_transactions import FindTransactionsCommand
 from cornode.commands.core.get_trytes import GetTrytesCommand
-from cornode.commands.extended.get_bundles import GetBundlesCommand
 from cornode.commands.extended.get_latest_inclusion import \
   GetLatestInclusionCommand
 from cornode.crypto.addresses import AddressGenerator
 from cornode.crypto.types import Seed
+from cornode.exceptions import with_context
+from cornode.transaction import BundleValidator
+
+DEFAULT_GAP_LIMIT = 1
+"""
+Default number of consecutive unused addresses that
+:py:func:`iter_used_addresses` will check before it stops.
+"""
+
+DEFAULT_WINDOW_SIZE = 32
+"""
+Default maximum number of addresses that :py:func:`iter_address_hashes`
+will check per request.
+"""
+
+GET_TRYTES_CHUNK_SIZE = 1000
+"""
+Maximum number of hashes that :py:func:`get_transaction_objects` will
+send per ``getTrytes`` request.
+"""
 
 
 def find_transaction_objects(adapter, **kwargs):
@@ -29,34 +48,141 @@ def find_transaction_objects(adapter, **kwargs):
     if hashes:
       gt_response = GetTrytesCommand(adapter)(hashes=hashes)
 
-      return list(map(
-        Transaction.from_tryte_string,
+      # Callers usually only look at a few fields of each transaction,
+      # so don't bother decoding the rest.
+      return LazyTransaction.from_tryte_strings(
         gt_response.get('trytes') or [],
-      )) # type: List[Transaction]
+      )
 
     return []
 
 
-def iter_used_addresses(adapter, seed, start):
-  # type: (BaseAdapter, Seed, int) -> Generator[Tuple[Address, List[TransactionHash]]]
+def iter_used_addresses(
+    adapter,
+    seed,
+    start,
+    gap_limit   = DEFAULT_GAP_LIMIT,
+    window_size = DEFAULT_WINDOW_SIZE,
+):
+  # type: (BaseAdapter, Seed, int, int, int) -> Generator[Tuple[Address, List[TransactionHash]]]
   """
   Scans the Tangle for used addresses.
 
   This is basically the opposite of invoking ``getNewAddresses`` with
   ``stop=None``.
-  """
-  ft_command = FindTransactionsCommand(adapter)
 
-  for addy in AddressGenerator(seed).create_iterator(start):
-    ft_response = ft_command(addresses=[addy])
+  :param gap_limit:
+    The scan stops after finding this many consecutive unused
+    addresses.  Unused addresses are not included in the result.
 
-    if ft_response['hashes']:
-      yield addy, ft_response['hashes']
+  :param window_size:
+    Maximum number of addresses to check per request (see
+    :py:func:`iter_address_hashes`).
+  """
+  gap = 0
+
+  for addy, hashes in iter_address_hashes(adapter, seed, start, window_size):
+    if hashes:
+      gap = 0
+      yield addy, hashes
     else:
-      break
+      gap += 1
+      if gap >= gap_limit:
+        break
+
+
+def iter_address_hashes(
+    adapter,
+    seed,
+    start,
+    window_size = DEFAULT_WINDOW_SIZE,
+):
+  # type: (BaseAdapter, Seed, int, int) -> Generator[Tuple[Address, List[TransactionHash]]]
+  """
+  Generates addresses, starting at ``start``, along with the hashes of
+  their transactions (if any).
 
-    # Reset the command so that we can call it again.
-    ft_command.reset()
+  Addresses are checked in windows, using a single ``findTransactions``
+  request per window.  If the window contains more than one address
+  and any of them are used, the window is split in half (repeatedly)
+  to figure out which hashes belong to which address, skipping halves
+  that are unused (see :py:func:`_find_hashes_by_address`).
+
+  Generating addresses is expensive, so the first window contains a
+  single address, and each subsequent window is twice as big as the
+  previous one, up to ``window_size`` addresses.
+
+  Note that this generator never stops on its own!
+  """
+  generator = AddressGenerator(seed)
+
+  index = start
+  size  = 1
+
+  while True:
+    addresses = generator.get_addresses(index, size)
+
+    ft_response = FindTransactionsCommand(adapter)(addresses=addresses)
+
+    hashes_by_address = _find_hashes_by_address(
+      adapter   = adapter,
+      addresses = addresses,
+      hashes    = ft_response['hashes'],
+    )
+
+    for addy in addresses:
+      yield addy, hashes_by_address[addy]
+
+    index += size
+    size = min(size * 2, window_size)
+
+
+def _find_hashes_by_address(adapter, addresses, hashes):
+  # type: (BaseAdapter, List[Address], List[TransactionHash]) -> Dict[Address, List[TransactionHash]]
+  """
+  Figures out which transaction hashes belong to which address.
+
+  :param addresses:
+    Addresses to check.
+
+  :param hashes:
+    Hashes of all the transactions for ``addresses`` (i.e., the result
+    of a ``findTransactions`` request for all of them).
+
+  Only ``findTransactions`` requests are used; unlike inspecting the
+  transactions themselves, this works even if the node can't return
+  the trytes for some of the transactions (e.g., after a snapshot).
+
+  Each transaction belongs to exactly one address, so only the first
+  half of each split has to be checked; the second half gets the rest
+  of the hashes.
+  """
+  if not hashes:
+    return {addy: [] for addy in addresses}
+
+  if len(addresses) == 1:
+    return {addresses[0]: list(hashes)}
+
+  middle = len(addresses) // 2
+
+  ft_response = FindTransactionsCommand(adapter)(addresses=addresses[:middle])
+  first_hashes = ft_response['hashes'] # type: List[TransactionHash]
+
+  first_set = set(first_hashes)
+
+  hashes_by_address = _find_hashes_by_address(
+    adapter   = adapter,
+    addresses = addresses[:middle],
+    hashes    = first_hashes,
+  )
+
+  hashes_by_address.update(_find_hashes_by_address(
+    adapter   = adapter,
+    addresses = addresses[middle:],
+    hashes    = [h for h in hashes if h not in first_set],
+  ))
+
+  return hashes_by_address
 
 
 def get_bundles_from_transaction_hashes(
@@ -73,43 +199,42 @@ def get_bundles_from_transaction_hashes(
   if not transaction_hashes:
     return []
 
-  my_bundles = [] # type: List[Bundle]
+  # The node returns trytes in the same order as the request, so we
+  # can use the hashes we asked for instead of computing them (see
+  # :py:func:`get_transaction_objects`).
+  gt_response = GetTrytesCommand(adapter)(hashes=transaction_hashes)
+  all_transactions = LazyTransaction.from_tryte_strings(
+    gt_response['trytes'],
+    transaction_hashes,
+  ) # type: List[Transaction]
+
+  # Fetch every transaction in the affected bundles at once, so that
+  # we can rebuild the bundles locally.
+  bundle_transactions = find_bundle_transactions(
+    adapter       = adapter,
+    bundle_hashes = {txn.bundle_hash for txn in all_transactions},
+  )
 
   # Sort transactions into tail and non-tail.
+  tail_transactions       = [] # type: List[Transaction]
   tail_transaction_hashes = set()
   non_tail_bundle_hashes  = set()
 
-  gt_response = GetTrytesCommand(adapter)(hashes=transaction_hashes)
-  all_transactions = list(map(
-    Transaction.from_tryte_string,
-    gt_response['trytes'],
-  )) # type: List[Transaction]
-
   for txn in all_transactions:
     if txn.is_tail:
-      tail_transaction_hashes.add(txn.hash)
+      if txn.hash not in tail_transaction_hashes:
+        tail_transactions.append(txn)
+        tail_transaction_hashes.add(txn.hash)
     else:
       # Capture the bundle ID instead of the transaction hash so that
-      # we can query the node to find the tail transaction for that
-      # bundle.
+      # we can find the tail transaction(s) for that bundle.
       non_tail_bundle_hashes.add(txn.bundle_hash)
 
-  if non_tail_bundle_hashes:
-    for txn in find_transaction_objects(
-        adapter = adapter,
-        bundles = list(non_tail_bundle_hashes)
-    ):
-      if txn.is_tail:
-        if txn.hash not in tail_transaction_hashes:
-          all_transactions.append(txn)
-          tail_transaction_hashes.add(txn.hash)
-
-  # Filter out all non-tail transactions.
-  tail_transactions = [
-    txn
-      for txn in all_transactions
-      if txn.hash in tail_transaction_hashes
-  ]
+  for txn in bundle_transactions:
+    if txn.is_tail and (txn.bundle_hash in non_tail_bundle_hashes):
+      if txn.hash not in tail_transaction_hashes:
+        tail_transactions.append(txn)
+        tail_transaction_hashes.add(txn.hash)
 
   # Attach inclusion states, if requested.
   if inclusion_states:
@@ -120,18 +245,126 @@ def get_bundles_from_transaction_hashes(
     for txn in tail_transactions:
       txn.is_confirmed = gli_response['states'].get(txn.hash)
 
-  # Find the bundles for each transaction.
-  for txn in tail_transactions:
-    gb_response = GetBundlesCommand(adapter)(transaction=txn.hash)
-    txn_bundles = gb_response['bundles'] # type: List[Bundle]
-
-    if inclusion_states:
-      for bundle in txn_bundles:
-        bundle.is_confirmed = txn.is_confirmed
+  my_bundles = build_bundles(tail_transactions, bundle_transactions)
 
-    my_bundles.extend(txn_bundles)
+  if inclusion_states:
+    for bundle in my_bundles:
+      bundle.is_confirmed = bundle.tail_transaction.is_confirmed
 
   return list(sorted(
     my_bundles,
       key = lambda bundle_: bundle_.tail_transaction.timestamp,
   ))
+
+
+def find_bundle_transactions(adapter, bundle_hashes):
+  # type: (BaseAdapter, Iterable[BundleHash]) -> List[Transaction]
+  """
+  Fetches every transaction in the specified bundles (including
+  replays), using a single ``findTransactions`` request.
+  """
+  bundle_hashes = list(bundle_hashes)
+  if not bundle_hashes:
+    return []
+
+  ft_response = FindTransactionsCommand(adapter)(bundles=bundle_hashes)
+
+  return get_transaction_objects(adapter, ft_response['hashes'])
+
+
+def get_transaction_objects(adapter, hashes):
+  # type: (BaseAdapter, Iterable[TransactionHash]) -> List[Transaction]
+  """
+  Fetches the trytes for the specified transaction hashes and converts
+  them into Transaction objects.
+
+  Requests are split into chunks of :py:data:`GET_TRYTES_CHUNK_SIZE`
+  hashes.
+
+  Note that, as with :py:class:`GetBundlesCommand`, the node is trusted
+  to return the correct trytes for each hash.
+  """
+  hashes = list(hashes)
+
+  transactions = [] # type: List[Transaction]
+
+  for i in range(0, len(hashes), GET_TRYTES_CHUNK_SIZE):
+    chunk = hashes[i:i + GET_TRYTES_CHUNK_SIZE]
+
+    gt_response = GetTrytesCommand(adapter)(hashes=chunk)
+
+    transactions.extend(
+      LazyTransaction.from_tryte_strings(gt_response['trytes'], chunk),
+    )
+
+  return transactions
+
+
+def build_bundles(tail_transactions, transactions):
+  # type: (Iterable[Transaction], Iterable[Transaction]) -> List[Bundle]
+  """
+  Rebuilds bundles from a pool of transactions, by following the trunk
+  links from each tail transaction.
+
+  This produces the same result as :py:class:`GetBundlesCommand` (in
+  particular, transactions from replayed bundles are not mixed in), but
+  without sending any requests to the node.
+
+  :param tail_transactions:
+    Tail transactions of the bundles to build.
+
+  :param transactions:
+    All of the transactions in the bundles (e.g., the result of
+    :py:func:`find_bundle_transactions`).
+  """
+  transactions_by_hash = {
+    txn.hash: txn
+      for txn in transactions
+  } # type: Dict[TransactionHash, Transaction]
+
+  bundles = [] # type: List[Bundle]
+
+  for tail in tail_transactions:
+    bundle_transactions = [tail]
+
+    txn = tail
+    for _ in range(tail.last_index):
+      txn = transactions_by_hash.get(txn.trunk_transaction_hash)
+
+      if txn is None:
+        raise with_context(
+          exc = BadApiResponse(
+            'Bundle transactions not visible '
+            '(``exc.context`` has more info).',
+          ),
+
+          context = {
+            'transaction_hash':   bundle_transactions[-1].trunk_transaction_hash,
+            'target_bundle_hash': tail.bundle_hash,
+          },
+        )
+
+      if txn.bundle_hash != tail.bundle_hash:
+        # We've hit a different bundle; let the validator sort it out.
+        break
+
+      bundle_transactions.append(txn)
+
+    bundles.append(Bundle(bundle_transactions))
+
+  # Validate all of the bundles at once, so that their signatures can
+  # be checked together.
+  for validator in BundleValidator.validate_bundles(bundles):
+    if not validator.is_valid():
+      raise with_context(
+        exc = BadApiResponse(
+          'Bundle failed validation (``exc.context`` has more info).',
+        ),
+
+        context = {
+          'bundle': validator.bundle,
+          'errors': validator.errors,
+        },
+      )
+
+  return bundles
@@ -4,9 +4,14 @@ from __future__ import absolute_import, division, print_function, \
 
 
 # Load curl library.
+# If NumPy is installed, we will prefer the vectorized implementation;
+# otherwise we fall back to the pure-Python one.
 # If a compiled c extension is available, we will prefer to load that
 # (once implemented).
-from .pycurl import *
+try:
+  from .numpycurl import *
+except ImportError:
+  from .pycurl import *
 
 
 FRAGMENT_LENGTH = 2187
@@ -4,12 +4,16 @@ from __future__ import absolute_import, division, print_function, \
 
 import hashlib
 from abc import ABCMeta, abstractmethod as abstract_method
+from collections import OrderedDict
 from contextlib import contextmanager as context_manager
-from threading import Lock
+from multiprocessing import Pool
+from os import getpid
+from sqlite3 import Binary, Connection, connect
+from threading import Condition, Lock, local
 
 from six import binary_type, with_metaclass
-from typing import Dict, Generator, Iterable, List, MutableSequence, \
-  Optional
+from typing import Dict, Generator, Iterable, List, Mapping, \
+  MutableSequence, Optional, Text
 
 from cornode import Address, TRITS_PER_TRYTE, TrytesCompatible
 from cornode.crypto import Curl
@@ -19,7 +23,9 @@ from cornode.exceptions import with_context
 
 __all__ = [
   'AddressGenerator',
+  'LruAddressCache',
   'MemoryAddressCache',
+  'SqliteAddressCache',
 ]
 
 
@@ -40,6 +46,18 @@ class BaseAddressCache(with_metaclass(ABCMeta)):
 
     self._lock = self.LockType()
 
+    # Held by the thread that has locked the entire cache, so that no
+    # other thread can lock the cache (or any of its addresses) until
+    # it is done.
+    self._cache_lock = self.LockType()
+
+    # Locks for individual seed/index pairs, along with the number of
+    # threads that are using (or waiting for) each one.
+    self._key_locks = {} # type: Dict[binary_type, List]
+
+    # Signalled when the last per-address lock is released.
+    self._key_locks_released = Condition(self._lock)
+
   @abstract_method
   def get(self, seed, index):
     # type: (Seed, int) -> Optional[Address]
@@ -52,16 +70,63 @@ class BaseAddressCache(with_metaclass(ABCMeta)):
     )
 
   @context_manager
-  def acquire_lock(self):
+  def acquire_lock(self, seed=None, index=None):
+    # type: (Optional[Seed], Optional[int]) -> Generator
     """
     Acquires a lock on the cache instance, to prevent invalid cache
     misses when multiple threads access the cache concurrently.
 
     Note: Acquire lock before checking the cache, and do not release it
     until after the cache hit/miss is resolved.
+
+    :param seed:
+      If provided (along with ``index``), only locks the address for
+      that seed and index.  Threads that need other addresses are not
+      blocked, while threads that need the same address wait for the
+      first one to resolve the cache miss.
+
+      If ``None``, locks the entire cache instance.  This waits for
+      threads that have locked individual addresses to finish, and
+      blocks any other threads from locking the cache (or any of its
+      addresses) until it is released.
+
+    :param index:
+      Key index of the address to lock.
     """
-    with self._lock:
-      yield
+    if seed is None:
+      with self._cache_lock:
+        with self._lock:
+          while self._key_locks:
+            self._key_locks_released.wait()
+
+        yield
+      return
+
+    key = self._gen_cache_key(seed, index)
+
+    # Wait for any thread that has locked the entire cache.
+    with self._cache_lock:
+      with self._lock:
+        try:
+          entry = self._key_locks[key]
+        except KeyError:
+          entry = self._key_locks[key] = [self.LockType(), 0]
+
+        entry[1] += 1
+
+    try:
+      with entry[0]:
+        yield
+    finally:
+      # Clean up the lock once nobody needs it anymore.
+      with self._lock:
+        entry[1] -= 1
+
+        if not entry[1]:
+          del self._key_locks[key]
+
+          if not self._key_locks:
+            self._key_locks_released.notify_all()
 
   @abstract_method
   def set(self, seed, index, address):
@@ -74,6 +139,43 @@ class BaseAddressCache(with_metaclass(ABCMeta)):
       'Not implemented in {cls}.'.format(cls=type(self).__name__),
     )
 
+  def get_many(self, seed, indexes):
+    # type: (Seed, Iterable[int]) -> Dict[int, Address]
+    """
+    Retrieves multiple addresses from the cache.
+
+    :return:
+      Cached addresses, indexed by key index.
+      Addresses that haven't been cached yet are omitted.
+
+    Subclasses can override this method to avoid the overhead of
+    looking up each address separately.
+    """
+    addresses = {} # type: Dict[int, Address]
+
+    for index in indexes:
+      address = self.get(seed, index)
+
+      if address:
+        addresses[index] = address
+
+    return addresses
+
+  def set_many(self, seed, addresses):
+    # type: (Seed, Mapping[int, Address]) -> None
+    """
+    Adds multiple addresses to the cache, overwriting any existing
+    addresses.
+
+    :param addresses:
+      Addresses to cache, indexed by key index.
+
+    Subclasses can override this method to avoid the overhead of
+    storing each address separately.
+    """
+    for (index, address) in addresses.items():
+      self.set(seed, index, address)
+
   @staticmethod
   def _gen_cache_key(seed, index):
     # type: (Seed, int) -> binary_type
@@ -104,6 +206,224 @@ class MemoryAddressCache(BaseAddressCache):
     self.cache[self._gen_cache_key(seed, index)] = address
 
 
+class LruAddressCache(MemoryAddressCache):
+  """
+  Caches addresses in memory, discarding the least-recently-used
+  addresses once the cache is full.
+
+  Also keeps track of hits, misses and evictions, so that you can
+  check how effective the cache is (see :py:attr:`stats`).
+  """
+  def __init__(self, max_size):
+    # type: (int) -> None
+    """
+    :param max_size:
+      Max number of addresses to keep in the cache.
+    """
+    super(LruAddressCache, self).__init__()
+
+    if max_size < 1:
+      raise with_context(
+        exc = ValueError('``max_size`` must be positive.'),
+
+        context = {
+          'max_size': max_size,
+        },
+      )
+
+    self.max_size = max_size
+
+    # Least-recently-used addresses come first.
+    self.cache = OrderedDict() # type: Dict[binary_type, Address]
+
+    self.hits       = 0
+    self.misses     = 0
+    self.evictions  = 0
+
+    # Separate from :py:meth:`acquire_lock`, which callers may already
+    # be holding when they invoke :py:meth:`get` or :py:meth:`set`.
+    self._data_lock = Lock()
+
+  @property
+  def stats(self):
+    # type: () -> Dict[Text, int]
+    """
+    Returns a snapshot of the cache's statistics.
+    """
+    with self._data_lock:
+      return {
+        'size':       len(self.cache),
+        'max_size':   self.max_size,
+        'hits':       self.hits,
+        'misses':     self.misses,
+        'evictions':  self.evictions,
+      }
+
+  def get(self, seed, index):
+    # type: (Seed, int) -> Optional[Address]
+    key = self._gen_cache_key(seed, index)
+
+    with self._data_lock:
+      try:
+        # Move the address to the end, to mark it as recently used.
+        address = self.cache.pop(key)
+      except KeyError:
+        self.misses += 1
+        return None
+
+      self.cache[key] = address
+      self.hits += 1
+
+      return address
+
+  def set(self, seed, index, address):
+    # type: (Seed, int, Address) -> None
+    key = self._gen_cache_key(seed, index)
+
+    with self._data_lock:
+      self.cache.pop(key, None)
+      self.cache[key] = address
+
+      while len(self.cache) > self.max_size:
+        self.cache.popitem(last=False)
+        self.evictions += 1
+
+  def reset_stats(self):
+    # type: () -> None
+    """
+    Resets the hit, miss and eviction counters.
+    """
+    with self._data_lock:
+      self.hits       = 0
+      self.misses     = 0
+      self.evictions  = 0
+
+
+class SqliteAddressCache(BaseAddressCache):
+  """
+  Caches addresses in an SQLite database, so that they persist across
+  process restarts.
+
+  The database can be shared by multiple processes on the same host;
+  each process (and each thread) opens its own connection, and the
+  database uses write-ahead logging so that readers don't block
+  writers.
+
+  Note: :py:meth:`acquire_lock` only applies to threads in the current
+  process.  Two processes might generate the same address
+  concurrently, but since the result is always the same, the worst
+  case is some duplicated work.
+  """
+  BULK_SIZE = 500
+  """
+  Max number of keys per query in :py:meth:`get_many` (SQLite limits
+  the number of parameters per statement).
+  """
+
+  TIMEOUT = 30
+  """
+  Number of seconds to wait for another process to release a lock on
+  the database.
+  """
+
+  def __init__(self, path):
+    # type: (Text) -> None
+    """
+    :param path:
+      Path to the database file.
+      The file will be created if it doesn't exist.
+    """
+    super(SqliteAddressCache, self).__init__()
+
+    self.path = path
+
+    self._local = local()
+
+    connection = self._get_connection()
+    with connection:
+      connection.execute(
+        'CREATE TABLE IF NOT EXISTS addresses ('
+        ' key BLOB PRIMARY KEY,'
+        ' address BLOB NOT NULL,'
+        ' key_index INTEGER NOT NULL'
+        ')',
+      )
+
+  def get(self, seed, index):
+    # type: (Seed, int) -> Optional[Address]
+    return self.get_many(seed, [index]).get(index)
+
+  def get_many(self, seed, indexes):
+    # type: (Seed, Iterable[int]) -> Dict[int, Address]
+    keys = {
+      self._gen_cache_key(seed, index): index
+        for index in indexes
+    } # type: Dict[binary_type, int]
+
+    key_list  = list(keys)
+    addresses = {} # type: Dict[int, Address]
+
+    connection = self._get_connection()
+
+    for i in range(0, len(key_list), self.BULK_SIZE):
+      chunk = key_list[i:i+self.BULK_SIZE]
+
+      rows = connection.execute(
+        'SELECT key, address FROM addresses WHERE key IN ({params})'.format(
+          params = ','.join('?' * len(chunk)),
+        ),
+
+        [Binary(key) for key in chunk],
+      )
+
+      for (key, address) in rows:
+        index = keys[binary_type(key)]
+        addresses[index] = Address(binary_type(address), key_index=index)
+
+    return addresses
+
+  def set(self, seed, index, address):
+    # type: (Seed, int, Address) -> None
+    self.set_many(seed, {index: address})
+
+  def set_many(self, seed, addresses):
+    # type: (Seed, Mapping[int, Address]) -> None
+    connection = self._get_connection()
+
+    with connection:
+      connection.executemany(
+        'INSERT OR REPLACE INTO addresses (key, address, key_index) '
+        'VALUES (?, ?, ?)',
+
+        [
+          (
+            Binary(self._gen_cache_key(seed, index)),
+            Binary(binary_type(address.address)),
+            index,
+          )
+            for (index, address) in addresses.items()
+        ],
+      )
+
+  def _get_connection(self):
+    # type: () -> Connection
+    """
+    Returns the database connection for the current thread.
+
+    SQLite connections must not be shared across threads, nor carried
+    over into a forked process, so a new connection is opened as
+    needed.
+    """
+    pid = getpid()
+
+    if getattr(self._local, 'pid', None) != pid:
+      self._local.connection = connect(self.path, timeout=self.TIMEOUT)
+      self._local.connection.execute('PRAGMA journal_mode=WAL')
+      self._local.pid = pid
+
+    return self._local.connection
+
+
 class AddressGenerator(Iterable[Address]):
   """
   Generates new addresses using a standard algorithm.
@@ -149,8 +469,8 @@ class AddressGenerator(Iterable[Address]):
     """
     return self.create_iterator()
 
-  def get_addresses(self, start, count=1, step=1):
-    # type: (int, int, int) -> List[Address]
+  def get_addresses(self, start, count=1, step=1, workers=1):
+    # type: (int, int, int, int) -> List[Address]
     """
     Generates and returns one or more addresses at the specified
     index(es).
@@ -160,8 +480,8 @@ class AddressGenerator(Iterable[Address]):
     :py:meth:`create_iterator` and sharing the resulting generator
     object instead.
 
-    Warning: This method may take awhile to run if the starting index
-    and/or the number of requested addresses is a large number!
+    Warning: This method may take awhile to run if the number of
+    requested addresses is a large number!
 
     :param start:
       Starting index.
@@ -175,6 +495,11 @@ class AddressGenerator(Iterable[Address]):
       Number of indexes to advance after each address.
       This may be any non-zero (positive or negative) integer.
 
+    :param workers:
+      Number of processes to use.
+      If greater than 1, the addresses are generated in parallel,
+      using a :py:class:`multiprocessing.pool.Pool`.
+
     :return:
       Always returns a list, even if only one address is generated.
 
@@ -204,6 +529,21 @@ class AddressGenerator(Iterable[Address]):
         },
       )
 
+    if workers < 1:
+      raise with_context(
+        exc = ValueError('``workers`` must be positive.'),
+
+        context = {
+          'start':    start,
+          'count':    count,
+          'step':     step,
+          'workers':  workers,
+        },
+      )
+
+    if workers > 1:
+      return self._get_addresses_parallel(start, count, step, workers)
+
     generator = self.create_iterator(start, step)
 
     addresses = []
@@ -226,14 +566,8 @@ class AddressGenerator(Iterable[Address]):
     :param start:
       Starting index.
 
-      Warning: This method may take awhile to reset if ``start``
-      is a large number!
-
     :param step:
       Number of indexes to advance after each address.
-
-      Warning: The generator may take awhile to advance between
-      iterations if ``step`` is a large number!
     """
     key_iterator = (
       KeyGenerator(self.seed)
@@ -242,10 +576,14 @@ class AddressGenerator(Iterable[Address]):
 
     while True:
       if self.cache:
-        with self.cache.acquire_lock():
+        with self.cache.acquire_lock(self.seed, key_iterator.current):
           address = self.cache.get(self.seed, key_iterator.current)
 
-          if not address:
+          if address:
+            # Skip the key that we would have used to generate the
+            # address.
+            key_iterator.current += key_iterator.step
+          else:
             address = self._generate_address(key_iterator)
             self.cache.set(self.seed, address.key_index, address)
       else:
@@ -253,6 +591,54 @@ class AddressGenerator(Iterable[Address]):
 
       yield address
 
+  def _get_addresses_parallel(self, start, count, step, workers):
+    # type: (int, int, int, int) -> List[Address]
+    """
+    Generates addresses using a pool of worker processes.
+
+    Addresses that are already cached are not generated again; any new
+    addresses are added to the cache.
+    """
+    # Like :py:meth:`create_iterator`, stop if we run out of indexes.
+    indexes = [
+      i for i in range(start, start + (count * step), step)
+        if i >= 0
+    ]
+
+    addresses = {} # type: Dict[int, Address]
+
+    if self.cache:
+      with self.cache.acquire_lock():
+        addresses.update(self.cache.get_many(self.seed, indexes))
+
+    missing = [i for i in indexes if i not in addresses]
+
+    if missing:
+      pool = Pool(workers)
+
+      try:
+        # Each worker gets a contiguous block of indexes.
+        trytes = pool.map(
+          _generate_address,
+          [(binary_type(self.seed), index) for index in missing],
+          chunksize = max(1, len(missing) // workers),
+        )
+      finally:
+        pool.terminate()
+
+      generated = {
+        index: Address(address_trytes, key_index=index)
+          for (index, address_trytes) in zip(missing, trytes)
+      } # type: Dict[int, Address]
+
+      if self.cache:
+        with self.cache.acquire_lock():
+          self.cache.set_many(self.seed, generated)
+
+      addresses.update(generated)
+
+    return [addresses[i] for i in indexes]
+
   @staticmethod
   def address_from_digest(digest):
     # type: (Digest) -> Address
@@ -262,7 +648,7 @@ class AddressGenerator(Iterable[Address]):
     address_trits = [0] * (Address.LEN * TRITS_PER_TRYTE) # type: MutableSequence[int]
 
     sponge = Curl()
-    sponge.absorb(digest.as_trits())
+    sponge.absorb(digest.as_trit_array())
     sponge.squeeze(address_trits)
 
     address = Address.from_trits(address_trits)
@@ -290,3 +676,26 @@ class AddressGenerator(Iterable[Address]):
     """
     private_key = next(key_iterator) # type: PrivateKey
     return private_key.get_digest()
+
+
+def _generate_address(args):
+  # type: (tuple) -> binary_type
+  """
+  Generates a single address in a worker process.
+
+  Used by :py:meth:`AddressGenerator.get_addresses` when running in
+  parallel mode.
+  """
+  (seed, index) = args
+
+  # Bypass :py:meth:`AddressGenerator.create_iterator`, so that the
+  # worker doesn't try to use its own copy of the cache.
+  key_iterator = (
+    KeyGenerator(seed)
+      .create_iterator(index, iterations=AddressGenerator.DIGEST_ITERATIONS)
+  )
+
+  # noinspection PyProtectedMember
+  digest = AddressGenerator._get_digest(key_iterator)
+
+  return binary_type(AddressGenerator.address_from_digest(digest))
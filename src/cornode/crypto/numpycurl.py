@@ -0,0 +1,136 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from array import array
+from typing import MutableSequence, Sequence
+
+import numpy as np
+
+from cornode.crypto.pycurl import BctCurl, Curl as PythonCurl, \
+  HASH_LENGTH, NUMBER_OF_ROUNDS, STATE_LENGTH, TRUTH_TABLE
+
+__all__ = [
+  'BctCurl',
+  'Curl',
+  'HASH_LENGTH',
+]
+
+
+# :py:meth:`cornode.crypto.pycurl.Curl._transform` walks the state using
+# ``index += 364 if index < 365 else -365``, which is the same as
+# ``index = (index + 364) % STATE_LENGTH``.  After ``STATE_LENGTH``
+# steps, the index wraps back around to 0, so every round reads the
+# state in exactly the same order, and we can precompute it.
+_LEFT_INDEXES = (np.arange(STATE_LENGTH) * 364) % STATE_LENGTH
+"""
+Index of the first trit used to compute each position in the new
+state.
+"""
+
+_RIGHT_INDEXES = (np.arange(1, STATE_LENGTH + 1) * 364) % STATE_LENGTH
+"""
+Index of the second trit used to compute each position in the new
+state.
+"""
+
+_TRUTH_TABLE = np.array(TRUTH_TABLE, dtype=np.int8)
+"""
+:py:data:`cornode.crypto.pycurl.TRUTH_TABLE`, as an array so that it
+can be applied to the entire state at once.
+"""
+
+
+class Curl(PythonCurl):
+  """
+  NumPy implementation of Curl.
+
+  Instead of computing the new state one trit at a time, each round
+  gathers all of the trit pairs using precomputed index arrays and
+  runs them through the truth table in a single vectorized lookup.
+
+  Produces exactly the same results as
+  :py:class:`cornode.crypto.pycurl.Curl`.
+
+  **IMPORTANT: Not thread-safe!**
+  """
+  BCT_MIN_LANES = 16
+  """
+  A single vectorized sponge is fast enough that
+  :py:class:`cornode.crypto.pycurl.BctCurl` only pays off when there
+  are quite a few sequences to hash at once.
+  """
+
+  # noinspection PyAttributeOutsideInit
+  def reset(self):
+    # type: () -> None
+    """
+    Resets internal state.
+    """
+    self._state = np.zeros(STATE_LENGTH, dtype=np.int8)
+
+  def absorb(self, trits):
+    # type: (Sequence[int]) -> None
+    """
+    Absorb trits into the sponge.
+
+    :param trits:
+      Sequence of trits to absorb.
+    """
+    length  = len(trits)
+    offset  = 0
+
+    while offset < length:
+      start = offset
+      stop  = min(start + HASH_LENGTH, length)
+
+      # As in :py:meth:`cornode.crypto.pycurl.Curl.absorb`, only the
+      # first hash of the state is "public".
+      self._state[0:stop-start] = trits[start:stop]
+
+      self._transform()
+
+      offset += HASH_LENGTH
+
+  def squeeze(self, trits):
+    # type: (MutableSequence[int]) -> None
+    """
+    Squeeze trits from the sponge.
+
+    :param trits:
+      Sequence that the squeezed trits will be copied to.
+      This may be a list or a trit array
+      (see :py:meth:`cornode.types.TryteString.as_trit_array`).
+
+      Note: this object will be modified!
+    """
+    # Ensure that ``trits`` can hold at least one hash worth of trits.
+    trits.extend([0] * max(0, HASH_LENGTH - len(trits)))
+
+    if isinstance(trits, array):
+      # Slices of trit arrays can only be assigned from other arrays.
+      trits[0:HASH_LENGTH] = array('b', self._state[0:HASH_LENGTH].tobytes())
+    else:
+      # Convert back to Python ints, so that callers don't have to deal
+      # with NumPy scalars.
+      trits[0:HASH_LENGTH] = self._state[0:HASH_LENGTH].tolist()
+
+    self._transform()
+
+  def _transform(self):
+    # type: () -> None
+    """
+    Transforms internal state.
+    """
+    # Copy some values locally so we can avoid global lookups in the
+    # loop.
+    left_indexes  = _LEFT_INDEXES
+    right_indexes = _RIGHT_INDEXES
+    truth_table   = _TRUTH_TABLE
+
+    state = self._state
+
+    for _ in range(NUMBER_OF_ROUNDS):
+      state = truth_table[state[left_indexes] + (3 * state[right_indexes]) + 4]
+
+    self._state = state
@@ -0,0 +1,271 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from threading import Event
+from typing import List, Optional, Sequence
+
+from cornode import trits_from_int
+from cornode.crypto.pycurl import BctCurl, HASH_LENGTH, STATE_LENGTH
+from cornode.exceptions import with_context
+
+__all__ = [
+  'NonceSearch',
+  'find_nonce',
+]
+
+
+DEFAULT_LANES = 3 ** 7
+"""
+Number of nonces that :py:class:`NonceSearch` tries per transform.
+
+Larger values give better throughput (the cost of a bit-sliced
+transform grows much more slowly than the number of lanes), at the
+expense of a coarser granularity when checking for interrupts.
+"""
+
+CHUNK_BATCHES = 8
+"""
+Number of batches (one transform each) that :py:func:`find_nonce`
+assigns to a worker at a time.
+"""
+
+
+class NonceSearch(BctCurl):
+  """
+  Bit-sliced search for a nonce that satisfies a min weight magnitude.
+
+  The nonce occupies the final :py:data:`HASH_LENGTH` trits of the
+  input, so everything before it only has to be absorbed once; each
+  candidate then costs a single transform, shared by every lane.
+
+  Candidates are organized into numbered batches.  Within a batch, the
+  first few trits of the nonce identify the lane, and the remaining
+  trits encode the batch number; this ensures that every candidate is
+  unique, so batches can be distributed across processes freely.
+
+  **IMPORTANT: Not thread-safe!**
+  """
+  @classmethod
+  def get_state(cls, trits):
+    # type: (Sequence[int]) -> List[int]
+    """
+    Absorbs everything except the nonce, and returns the resulting
+    sponge state (as trits).
+
+    :param trits:
+      Trits to search a nonce for (e.g., a transaction).
+      The final :py:data:`HASH_LENGTH` trits are the nonce, and will be
+      ignored.
+    """
+    if not trits or len(trits) % HASH_LENGTH:
+      raise with_context(
+        exc = ValueError(
+          'Length of trits must be a positive multiple of {length} '
+          '(``exc.context`` has more info).'.format(
+            length = HASH_LENGTH,
+          ),
+        ),
+
+        context = {
+          'trits': trits,
+        },
+      )
+
+    sponge = BctCurl(1)
+    sponge.absorb([trits[0:len(trits)-HASH_LENGTH]])
+
+    # Note that :py:class:`BctCurl` doesn't mask the state, so we have
+    # to extract the bit for lane 0 ourselves.
+    return [(h & 1) - (l & 1) for (l, h) in zip(sponge._low, sponge._high)]
+
+  def __init__(self, state, lanes=DEFAULT_LANES):
+    # type: (Sequence[int], int) -> None
+    """
+    :param state:
+      Sponge state, as returned by :py:meth:`get_state`.
+
+    :param lanes:
+      Number of candidates to try per transform.
+    """
+    super(NonceSearch, self).__init__(lanes)
+
+    if len(state) != STATE_LENGTH:
+      raise with_context(
+        exc = ValueError(
+          'State must contain exactly {length} trits '
+          '(``exc.context`` has more info).'.format(
+            length = STATE_LENGTH,
+          ),
+        ),
+
+        context = {
+          'state': state,
+        },
+      )
+
+    mask = self._mask
+
+    # Every lane starts out with the same state.
+    self._state_low   = [0 if t == 1 else mask for t in state]
+    self._state_high  = [0 if t == -1 else mask for t in state]
+
+    # Each lane puts its own index (in base 3) into the first few trits
+    # of the nonce.
+    self._lane_low  = [] # type: List[int]
+    self._lane_high = [] # type: List[int]
+
+    place = 1
+    while place < lanes:
+      digits = [(lane // place) % 3 for lane in range(lanes)]
+
+      # Lane 0 is the least-significant bit.
+      self._lane_low.append(
+        int(''.join('1' if d < 2 else '0' for d in reversed(digits)), 2),
+      )
+
+      self._lane_high.append(
+        int(''.join('1' if d > 0 else '0' for d in reversed(digits)), 2),
+      )
+
+      place *= 3
+
+  def search(self, min_weight_magnitude, start, count):
+    # type: (int, int, int) -> Optional[List[int]]
+    """
+    Tries ``count`` batches of candidates, starting with batch number
+    ``start``.
+
+    :return:
+      The first nonce (as trits) that satisfies the min weight
+      magnitude, or ``None`` if none of the candidates do.
+    """
+    mask        = self._mask
+    lane_trits  = len(self._lane_low)
+
+    for batch in range(start, start + count):
+      batch_trits = trits_from_int(batch, pad=HASH_LENGTH - lane_trits)
+
+      self._low = (
+          self._lane_low
+        + [0 if t == 1 else mask for t in batch_trits]
+        + self._state_low[HASH_LENGTH:]
+      )
+
+      self._high = (
+          self._lane_high
+        + [0 if t == -1 else mask for t in batch_trits]
+        + self._state_high[HASH_LENGTH:]
+      )
+
+      self._transform()
+
+      # A trit is 0 when both of its bits are set.
+      found = mask
+      for i in range(HASH_LENGTH - min_weight_magnitude, HASH_LENGTH):
+        found &= self._low[i] & self._high[i]
+
+      if found:
+        # Pick the lowest lane that succeeded.
+        lane = (found & -found).bit_length() - 1
+
+        return (
+            [((lane // (3 ** i)) % 3) - 1 for i in range(lane_trits)]
+          + batch_trits
+        )
+
+    return None
+
+
+def _search_chunk(args):
+  # type: (tuple) -> Optional[List[int]]
+  """
+  Runs :py:meth:`NonceSearch.search` in a worker process.
+  """
+  (state, lanes, min_weight_magnitude, start, count) = args
+  return NonceSearch(state, lanes).search(min_weight_magnitude, start, count)
+
+
+def find_nonce(
+    trits,
+    min_weight_magnitude,
+    pool        = None,
+    workers     = 1,
+    interrupted = None,
+    lanes       = DEFAULT_LANES,
+):
+  # type: (Sequence[int], int, Optional[object], int, Optional[Event], int) -> Optional[List[int]]
+  """
+  Finds a nonce for the specified trits, such that the last
+  ``min_weight_magnitude`` trits of their hash are 0.
+
+  :param trits:
+    Trits to search a nonce for (e.g., a transaction).
+    The final :py:data:`HASH_LENGTH` trits are the nonce, and will be
+    ignored.
+
+  :param min_weight_magnitude:
+    Number of trailing trits in the hash that must be 0.
+
+  :param pool:
+    :py:class:`multiprocessing.pool.Pool` used to distribute the
+    search.  If ``None``, the search runs in the current process.
+
+  :param workers:
+    Number of processes in ``pool``.
+
+  :param interrupted:
+    If provided, the search will stop (and return ``None``) once this
+    event is set.  The event is checked between chunks of work.
+
+  :param lanes:
+    Number of candidates to try per transform.
+
+  :return:
+    The nonce (as trits), or ``None`` if the search was interrupted.
+  """
+  if not (0 < min_weight_magnitude <= HASH_LENGTH):
+    raise with_context(
+      exc = ValueError(
+        '``min_weight_magnitude`` must be between 1 and {length} '
+        '(``exc.context`` has more info).'.format(
+          length = HASH_LENGTH,
+        ),
+      ),
+
+      context = {
+        'min_weight_magnitude': min_weight_magnitude,
+      },
+    )
+
+  state = NonceSearch.get_state(trits)
+
+  if pool is None:
+    workers = 1
+    searcher = NonceSearch(state, lanes)
+
+  start = 0
+  while not (interrupted and interrupted.is_set()):
+    if pool is None:
+      results = [searcher.search(min_weight_magnitude, start, CHUNK_BATCHES)]
+    else:
+      results = pool.map(_search_chunk, [
+        (
+          state,
+          lanes,
+          min_weight_magnitude,
+          start + (i * CHUNK_BATCHES),
+          CHUNK_BATCHES,
+        )
+          for i in range(workers)
+      ])
+
+    # Prefer the earliest chunk, so that the result doesn't depend on
+    # which worker happened to finish first.
+    for nonce in results:
+      if nonce is not None:
+        return nonce
+
+    start += workers * CHUNK_BATCHES
+
+  return None
@@ -2,11 +2,15 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from typing import List, MutableSequence, Optional, Sequence
+from array import array
+from typing import Dict, List, MutableSequence, Optional, Sequence
 
 from six import PY2
 
+from cornode.exceptions import with_context
+
 __all__ = [
+  'BctCurl',
   'Curl',
   'HASH_LENGTH',
 ]
@@ -42,6 +46,35 @@ References:
   - :py:meth:`Curl._transform`.
 """
 
+INDEX_PAIRS = [
+  ((364 * i) % STATE_LENGTH, (364 * (i + 1)) % STATE_LENGTH)
+    for i in range(STATE_LENGTH)
+]
+"""
+Pairs of indexes that :py:meth:`Curl._transform` reads from the
+previous state to compute each position of the new state.
+
+Each round walks the state in the same order (``index`` wraps back
+around to 0 after :py:data:`STATE_LENGTH` steps), so these can be
+computed once, up front.
+
+References:
+  - :py:meth:`BctCurl._transform`.
+"""
+
+BCT_HIGH_DIGITS = bytearray(b'110')
+BCT_LOW_DIGITS  = bytearray(b'101')
+"""
+Binary-coded ternary encoding used by :py:class:`BctCurl`, indexed by
+trit value (note that -1 wraps around to the last item).
+
+Each trit is stored as a pair of bits (low, high):
+
+- -1 => (1, 0)
+-  0 => (1, 1)
+-  1 => (0, 1)
+"""
+
 
 class Curl(object):
   """
@@ -49,6 +82,58 @@ class Curl(object):
 
   **IMPORTANT: Not thread-safe!**
   """
+  BCT_MIN_LANES = 2
+  """
+  :py:meth:`hash_many` only packs sequences into a
+  :py:class:`BctCurl` when there are at least this many sequences of
+  the same length; anything less is hashed one sequence at a time.
+  """
+
+  @classmethod
+  def hash_many(cls, trit_sequences):
+    # type: (Sequence[Sequence[int]]) -> List[List[int]]
+    """
+    Hashes many independent trit sequences at once.
+
+    Equivalent to creating a new sponge for each sequence, absorbing
+    it and squeezing out a single hash, but sequences that have the
+    same length are hashed together using :py:class:`BctCurl`.
+
+    :param trit_sequences:
+      Sequences of trits to hash.
+
+    :return:
+      One hash (list of :py:data:`HASH_LENGTH` trits) per sequence, in
+      the same order as ``trit_sequences``.
+    """
+    hashes = [None] * len(trit_sequences) # type: List[Optional[List[int]]]
+
+    # All lanes in a :py:class:`BctCurl` must absorb the same number of
+    # trits.
+    lanes_by_length = {} # type: Dict[int, List[int]]
+    for (i, trits) in enumerate(trit_sequences):
+      lanes_by_length.setdefault(len(trits), []).append(i)
+
+    for indexes in lanes_by_length.values():
+      if len(indexes) < cls.BCT_MIN_LANES:
+        # Not worth the overhead of packing the lanes.
+        for i in indexes:
+          sponge = cls()
+          sponge.absorb(trit_sequences[i])
+
+          hash_ = [0] * HASH_LENGTH
+          sponge.squeeze(hash_)
+          hashes[i] = hash_
+
+      else:
+        bct_sponge = BctCurl(len(indexes))
+        bct_sponge.absorb([trit_sequences[i] for i in indexes])
+
+        for (i, hash_) in zip(indexes, bct_sponge.squeeze()):
+          hashes[i] = hash_
+
+    return hashes
+
   def __init__(self):
     # type: (Optional[Sequence[int]]) -> None
     self.reset()
@@ -101,6 +186,9 @@ class Curl(object):
 
     :param trits:
       Sequence that the squeezed trits will be copied to.
+      This may be a list or a trit array
+      (see :py:meth:`cornode.types.TryteString.as_trit_array`).
+
       Note: this object will be modified!
     """
     #
@@ -116,7 +204,11 @@ class Curl(object):
     trits.extend([0] * max(0, HASH_LENGTH - len(trits)))
 
     # Copy exactly one hash.
-    trits[0:HASH_LENGTH] = self._state[0:HASH_LENGTH]
+    if isinstance(trits, array):
+      # Slices of trit arrays can only be assigned from other arrays.
+      trits[0:HASH_LENGTH] = array('b', self._state[0:HASH_LENGTH])
+    else:
+      trits[0:HASH_LENGTH] = self._state[0:HASH_LENGTH]
 
     # One hash worth of trits copied; now transform.
     self._transform()
@@ -168,3 +260,216 @@ class Curl(object):
       new_state   = new_state[:]
 
     self._state = new_state
+
+
+class BctCurl(object):
+  """
+  Bit-sliced implementation of Curl that advances many independent
+  sponges ("lanes") at once.
+
+  Each trit of the internal state is stored as a pair of bitplanes
+  (binary-coded ternary; see :py:data:`BCT_LOW_DIGITS`); bit ``n`` of
+  each bitplane belongs to lane ``n``.  A single pass through
+  :py:meth:`_transform` therefore transforms every lane using only
+  bitwise operations.
+
+  Python ints are not limited to the width of a machine word, so there
+  is no fixed upper limit on the number of lanes.
+
+  **IMPORTANT: Not thread-safe!**
+
+  References:
+    - :py:meth:`Curl.hash_many`
+  """
+  def __init__(self, lanes):
+    # type: (int) -> None
+    """
+    :param lanes:
+      Number of sponges to run in parallel.
+    """
+    super(BctCurl, self).__init__()
+
+    self.lanes = lanes
+
+    # All bits set, one per lane.
+    self._mask = (1 << lanes) - 1
+
+    self.reset()
+
+  # noinspection PyAttributeOutsideInit
+  def reset(self):
+    # type: () -> None
+    """
+    Resets internal state.
+    """
+    # Every trit starts out as 0, which is encoded as (1, 1).
+    self._low   = [self._mask] * STATE_LENGTH # type: List[int]
+    self._high  = [self._mask] * STATE_LENGTH # type: List[int]
+
+    # Squeezing transforms the state after copying it out.  We defer
+    # that transform until it is actually needed, so that it is skipped
+    # entirely when the sponge is discarded right after squeezing (the
+    # most common case by far).
+    self._transform_pending = False
+
+  def absorb(self, trit_sequences):
+    # type: (Sequence[Sequence[int]]) -> None
+    """
+    Absorb trits into the sponges.
+
+    :param trit_sequences:
+      One sequence of trits per lane.
+      All sequences must have the same length.
+    """
+    if len(trit_sequences) != self.lanes:
+      raise with_context(
+        exc = ValueError(
+          'Expected {lanes} trit sequences, got {actual} '
+          '(``exc.context`` has more info).'.format(
+            actual  = len(trit_sequences),
+            lanes   = self.lanes,
+          ),
+        ),
+
+        context = {
+          'trit_sequences': trit_sequences,
+        },
+      )
+
+    length = len(trit_sequences[0])
+
+    if any(len(trits) != length for trits in trit_sequences):
+      raise with_context(
+        exc = ValueError(
+          'All trit sequences must have the same length '
+          '(``exc.context`` has more info).',
+        ),
+
+        context = {
+          'trit_sequences': trit_sequences,
+        },
+      )
+
+    if self._transform_pending:
+      self._transform()
+
+    # Convert each lane into strings of binary digits.
+    # Lane 0 is stored in the least-significant bit, so when we build
+    # each bitplane as a binary number, lane 0 has to be the rightmost
+    # digit.
+    low_rows = [
+      bytes(bytearray(map(BCT_LOW_DIGITS.__getitem__, trits)))
+        for trits in reversed(trit_sequences)
+    ]
+
+    high_rows = [
+      bytes(bytearray(map(BCT_HIGH_DIGITS.__getitem__, trits)))
+        for trits in reversed(trit_sequences)
+    ]
+
+    offset = 0
+    while offset < length:
+      start = offset
+      stop  = min(start + HASH_LENGTH, length)
+
+      # Transpose so that we get one string (i.e., one bitplane) per
+      # trit.
+      lows  = zip(*(row[start:stop] for row in low_rows))
+      highs = zip(*(row[start:stop] for row in high_rows))
+
+      for (i, (low, high)) in enumerate(zip(lows, highs)):
+        self._low[i]  = int(bytes(bytearray(low)), 2)
+        self._high[i] = int(bytes(bytearray(high)), 2)
+
+      self._transform()
+
+      offset += HASH_LENGTH
+
+  def squeeze(self, trit_sequences=None):
+    # type: (Optional[Sequence[MutableSequence[int]]]) -> List[MutableSequence[int]]
+    """
+    Squeeze one hash out of each sponge.
+
+    :param trit_sequences:
+      Optional sequences (one per lane) that the squeezed trits will be
+      copied to.
+      Note: these objects will be modified!
+
+    :return:
+      The squeezed trits, one sequence per lane.
+    """
+    if trit_sequences is None:
+      trit_sequences = [[] for _ in range(self.lanes)]
+
+    if self._transform_pending:
+      self._transform()
+
+    # Format each bitplane as a string of binary digits (lane 0 last),
+    # then transpose so that we get one string per lane.
+    digits  = '0{width}b'.format(width=self.lanes)
+    mask    = self._mask
+
+    lows = zip(*(
+      bytearray(format(low & mask, digits), 'ascii')
+        for low in self._low[0:HASH_LENGTH]
+    ))
+
+    highs = zip(*(
+      bytearray(format(high & mask, digits), 'ascii')
+        for high in self._high[0:HASH_LENGTH]
+    ))
+
+    for (trits, low, high) in zip(reversed(trit_sequences), lows, highs):
+      trits.extend([0] * max(0, HASH_LENGTH - len(trits)))
+
+      # (1, 0) => -1, (1, 1) => 0, (0, 1) => 1
+      # Note that subtracting the digits' ordinals gives the same
+      # result.
+      hash_ = [h - l for (l, h) in zip(low, high)]
+
+      if isinstance(trits, array):
+        trits[0:HASH_LENGTH] = array('b', hash_)
+      else:
+        trits[0:HASH_LENGTH] = hash_
+
+    self._transform_pending = True
+
+    return trit_sequences
+
+  def _transform(self):
+    # type: () -> None
+    """
+    Transforms internal state (all lanes at once).
+    """
+    # Copy some values locally so we can avoid global lookups in the
+    # inner loop.
+    index_pairs = INDEX_PAIRS
+
+    low   = self._low
+    high  = self._high
+
+    for _ in range(NUMBER_OF_ROUNDS):
+      new_low   = []
+      new_high  = []
+
+      for (i, j) in index_pairs:
+        # This is the truth table from :py:meth:`Curl._transform`,
+        # expressed as bitwise operations.
+        #
+        # Note that we don't bother masking the results of ``~``; any
+        # extra bits are ignored when the state is squeezed.
+        alpha = low[i]
+        beta  = high[i]
+        gamma = high[j]
+        delta = (alpha | ~gamma) & (low[j] ^ beta)
+
+        new_low.append(~delta)
+        new_high.append((alpha ^ gamma) | delta)
+
+      low   = new_low
+      high  = new_high
+
+    self._low   = low
+    self._high  = high
+
+    self._transform_pending = False
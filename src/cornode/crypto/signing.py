@@ -2,11 +2,13 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
+from itertools import chain
 from typing import Iterator, List, MutableSequence, Sequence, Tuple
 
 from six import PY2
 
-from cornode import TRITS_PER_TRYTE, TryteString, TrytesCompatible, Hash
+from cornode import TRITS_PER_TRYTE, TryteString, TrytesCompatible, Hash, \
+  trits_from_int
 from cornode.crypto import Curl, FRAGMENT_LENGTH, HASH_LENGTH
 from cornode.crypto.types import PrivateKey, Seed
 from cornode.exceptions import with_context
@@ -15,6 +17,7 @@ __all__ = [
   'KeyGenerator',
   'SignatureFragmentGenerator',
   'validate_signature_fragments',
+  'validate_signatures',
 ]
 
 
@@ -79,8 +82,8 @@ class KeyGenerator(object):
     :py:meth:`create_iterator` and sharing the resulting generator
     object instead.
 
-    Warning: This method may take awhile to run if the starting index
-    and/or the number of requested keys is a large number!
+    Warning: This method may take awhile to run if the number of
+    requested keys is a large number!
 
     :param start:
       Starting index.
@@ -154,18 +157,12 @@ class KeyGenerator(object):
     :param start:
       Starting index.
 
-      Warning: This method may take awhile to reset if ``start``
-      is a large number!
-
     :param step:
       Number of indexes to advance after each key.
 
       This value can be negative; the generator will exit if it
       reaches an index < 0.
 
-      Warning: The generator may take awhile to advance between
-      iterations if ``step`` is a large number!
-
     :param iterations:
       Number of _transform iterations to apply to each key.
       Must be >= 1.
@@ -251,24 +248,37 @@ class KeyIterator(Iterator[PrivateKey]):
   if PY2:
     next = __next__
 
+  def seek(self, index):
+    # type: (int) -> None
+    """
+    Moves the iterator to the specified index; the next key it returns
+    will be the one at ``index``.
+
+    Keys are derived independently of each other, so seeking is just
+    as fast regardless of where the iterator is, or how far away
+    ``index`` is.
+    """
+    if index < 0:
+      raise with_context(
+        exc = ValueError('``index`` cannot be negative.'),
+
+        context = {
+          'index':      index,
+          'start':      self.start,
+          'step':       self.step,
+          'iterations': self.iterations,
+        },
+      )
+
+    self.current = index
+
   def _create_sponge(self, index):
     # type: (int) -> Curl
     """
     Prepares the Curl sponge for the generator.
     """
-    seed = self.seed.as_trits() # type: MutableSequence[int]
-
-    for i in range(index):
-      # Treat ``seed`` like a really big number and add ``index``.
-      # Note that addition works a little bit differently in balanced
-      # ternary.
-      for j in range(len(seed)):
-        seed[j] += 1
-
-        if seed[j] > 1:
-          seed[j] = -1
-        else:
-          break
+    # Treat ``seed`` like a really big number and add ``index``.
+    seed = _add_to_trits(self.seed.as_trits(), index) # type: MutableSequence[int]
 
     sponge = Curl()
     sponge.absorb(seed)
@@ -297,7 +307,6 @@ class SignatureFragmentGenerator(Iterator[TryteString]):
     self._key_chunks      = private_key.iter_chunks(FRAGMENT_LENGTH)
     self._iteration       = -1
     self._normalized_hash = normalize(hash_)
-    self._sponge          = Curl()
 
   def __iter__(self):
     # type: () -> SignatureFragmentGenerator
@@ -325,23 +334,22 @@ class SignatureFragmentGenerator(Iterator[TryteString]):
     normalized_chunk =\
       self._normalized_hash[self._iteration % len(self._normalized_hash)]
 
-    signature_fragment = key_trytes.as_trits()
-
-    # Build the signature, one hash at a time.
-    for i in range(key_trytes.count_chunks(Hash.LEN)):
-      hash_start  = i * HASH_LENGTH
-      hash_end    = hash_start + HASH_LENGTH
+    key_trits = key_trytes.as_trit_array()
 
-      buffer = signature_fragment[hash_start:hash_end] # type: MutableSequence[int]
+    # Build the signature; all of the hashes in the fragment are
+    # advanced together.
+    hash_count = key_trytes.count_chunks(Hash.LEN)
 
-      for _ in range(13 - normalized_chunk[i]):
-        self._sponge.reset()
-        self._sponge.absorb(buffer)
-        self._sponge.squeeze(buffer)
+    signature_fragment = _advance_hash_chains(
+      chains = [
+        key_trits[i*HASH_LENGTH:(i+1)*HASH_LENGTH]
+          for i in range(hash_count)
+      ],
 
-      signature_fragment[hash_start:hash_end] = buffer
+      lengths = [13 - normalized_chunk[i] for i in range(hash_count)],
+    )
 
-    return TryteString.from_trits(signature_fragment)
+    return TryteString.from_trits(list(chain.from_iterable(signature_fragment)))
 
   if PY2:
     next = __next__
@@ -364,35 +372,122 @@ def validate_signature_fragments(fragments, hash_, public_key):
     The public key value used to verify the signature digest (usually a
     :py:class:`cornode.types.Address` instance).
   """
-  checksum        = [0] * (HASH_LENGTH * len(fragments))
-  normalized_hash = normalize(hash_)
+  return validate_signatures([(fragments, hash_, public_key)])[0]
+
+
+def validate_signatures(signatures):
+  # type: (Sequence[Tuple[Sequence[TryteString], Hash, TryteString]]) -> List[bool]
+  """
+  Validates many signatures at once.
+
+  Equivalent to calling :py:func:`validate_signature_fragments` for
+  each signature, but the hash chains from every signature are advanced
+  together, so that each round can be hashed using as many
+  :py:class:`cornode.crypto.pycurl.BctCurl` lanes as possible.
+
+  :param signatures:
+    ``(fragments, hash_, public_key)`` for each signature to validate
+    (see :py:func:`validate_signature_fragments`).
+
+  :return:
+    Whether each signature is valid, in the same order as
+    ``signatures``.
+  """
+  chains  = [] # type: List[List[int]]
+  lengths = [] # type: List[int]
 
-  for (i, fragment) in enumerate(fragments): # type: Tuple[int, TryteString]
-    outer_sponge = Curl()
+  for (fragments, hash_, _) in signatures:
+    normalized_hash = normalize(hash_)
 
-    # If there are more than 3 iterations, loop back around to the
-    # start.
-    normalized_chunk = normalized_hash[i % len(normalized_hash)]
+    for (i, fragment) in enumerate(fragments): # type: Tuple[int, TryteString]
+      # If there are more than 3 iterations, loop back around to the
+      # start.
+      normalized_chunk = normalized_hash[i % len(normalized_hash)]
 
-    buffer = []
-    for (j, hash_trytes) in enumerate(fragment.iter_chunks(Hash.LEN)): # type: Tuple[int, TryteString]
-      buffer        = hash_trytes.as_trits() # type: MutableSequence[int]
-      inner_sponge  = Curl()
+      for (j, hash_trytes) in enumerate(fragment.iter_chunks(Hash.LEN)): # type: Tuple[int, TryteString]
+        chains.append(hash_trytes.as_trit_array())
 
-      # Note the sign flip compared to ``SignatureFragmentGenerator``.
-      for _ in range(13 + normalized_chunk[j]):
-        inner_sponge.reset()
-        inner_sponge.absorb(buffer)
-        inner_sponge.squeeze(buffer)
+        # Note the sign flip compared to ``SignatureFragmentGenerator``.
+        lengths.append(13 + normalized_chunk[j])
+
+  chains = _advance_hash_chains(chains, lengths)
+
+  # Each fragment's hashes are absorbed into a single sponge, in order.
+  fragment_trits = [] # type: List[List[int]]
+  offset = 0
+  for (fragments, _, _) in signatures:
+    for fragment in fragments: # type: TryteString
+      hash_count = fragment.count_chunks(Hash.LEN)
+      fragment_trits.append(
+        list(chain.from_iterable(chains[offset:offset + hash_count])),
+      )
+      offset += hash_count
+
+  fragment_digests = Curl.hash_many(fragment_trits)
+
+  # Then each signature's fragment digests are hashed together to get
+  # the public key.
+  checksums = [] # type: List[List[int]]
+  offset = 0
+  for (fragments, _, _) in signatures:
+    checksums.append(list(chain.from_iterable(
+      fragment_digests[offset:offset + len(fragments)],
+    )))
+    offset += len(fragments)
+
+  return [
+    actual_public_key == public_key.as_trits()
+      for (actual_public_key, (_, _, public_key))
+        in zip(Curl.hash_many(checksums), signatures)
+  ]
+
+
+def _advance_hash_chains(chains, lengths):
+  # type: (Sequence[Sequence[int]], Sequence[int]) -> List[List[int]]
+  """
+  Runs each hash through Curl the corresponding number of times.
+
+  Equivalent to resetting a sponge, absorbing the hash and squeezing it
+  back out ``lengths[i]`` times for each ``chains[i]``, but the chains
+  are advanced in lockstep so that each round can be hashed together
+  (see :py:meth:`cornode.crypto.pycurl.Curl.hash_many`).
+
+  :return:
+    The resulting hashes, in the same order as ``chains``.
+  """
+  chains = [list(c) for c in chains]
+
+  for step in range(max(lengths or [0])):
+    active = [i for (i, length) in enumerate(lengths) if length > step]
+
+    for (i, hash_) in zip(active, Curl.hash_many([chains[i] for i in active])):
+      chains[i] = hash_
+
+  return chains
+
+
+def _add_to_trits(trits, n):
+  # type: (Sequence[int], int) -> List[int]
+  """
+  Adds an integer to a sequence of trits (least-significant trit
+  first), using balanced ternary arithmetic.
+
+  The result has the same length as ``trits``; any carry out of the
+  most-significant trit is dropped (i.e., the sum wraps around).
+  """
+  addend  = trits_from_int(n)
+  result  = list(trits)
+  carry   = 0
 
-      outer_sponge.absorb(buffer)
+  for i in range(len(result)):
+    if i >= len(addend) and not carry:
+      break
 
-    outer_sponge.squeeze(buffer)
-    checksum[i*HASH_LENGTH:(i+1)*HASH_LENGTH] = buffer
+    total = result[i] + carry + (addend[i] if i < len(addend) else 0)
 
-  actual_public_key = [0] * HASH_LENGTH # type: MutableSequence[int]
-  addy_sponge = Curl()
-  addy_sponge.absorb(checksum)
-  addy_sponge.squeeze(actual_public_key)
+    # ``total`` is between -3 and 3; bring it back into the range of a
+    # single trit.
+    carry = (total + 1) // 3
+    result[i] = total - (3 * carry)
 
-  return actual_public_key == public_key.as_trits()
+  return result
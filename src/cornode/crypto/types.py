@@ -2,11 +2,12 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
+from itertools import chain
 from math import ceil
 from os import urandom
 
 from six import binary_type
-from typing import Callable, MutableSequence, Optional, Tuple
+from typing import Callable, List, Optional
 
 from cornode import Hash, TryteString, TrytesCompatible
 from cornode.crypto import Curl, FRAGMENT_LENGTH, HASH_LENGTH
@@ -102,34 +103,30 @@ class PrivateKey(TryteString):
 
     key_fragments = self.iter_chunks(FRAGMENT_LENGTH)
 
-    # The digest will contain one hash per key fragment.
-    digest = [0] * HASH_LENGTH * len(key_fragments)
-
-    for (i, fragment) in enumerate(key_fragments): # type: Tuple[int, TryteString]
-      fragment_trits = fragment.as_trits()
-
-      key_fragment  = [0] * FRAGMENT_LENGTH
-      hash_trits    = []
+    # Each key fragment is split into hashes that are run through Curl
+    # 26 times apiece.  The hashes are independent of each other, so
+    # we can process all of them together (see
+    # :py:meth:`cornode.crypto.pycurl.Curl.hash_many`).
+    hashes = [] # type: List[List[int]]
+    for fragment in key_fragments: # type: TryteString
+      fragment_trits = fragment.as_trit_array()
 
       for j in range(hashes_per_fragment):
         hash_start  = j * HASH_LENGTH
         hash_end    = hash_start + HASH_LENGTH
-        hash_trits  = fragment_trits[hash_start:hash_end] # type: MutableSequence[int]
-
-        for k in range(26):
-          sponge = Curl()
-          sponge.absorb(hash_trits)
-          sponge.squeeze(hash_trits)
+        hashes.append(fragment_trits[hash_start:hash_end])
 
-        key_fragment[hash_start:hash_end] = hash_trits
+    for _ in range(26):
+      hashes = Curl.hash_many(hashes)
 
-      sponge = Curl()
-      sponge.absorb(key_fragment)
-      sponge.squeeze(hash_trits)
-
-      fragment_start  = i * FRAGMENT_LENGTH
-      fragment_end    = fragment_start + FRAGMENT_LENGTH
-
-      digest[fragment_start:fragment_end] = hash_trits
+    # The digest will contain one hash per key fragment.
+    key_fragment_trits = [
+      list(chain.from_iterable(hashes[i:i+hashes_per_fragment]))
+        for i in range(0, len(hashes), hashes_per_fragment)
+    ]
+
+    digest = list(chain.from_iterable(
+      Curl.hash_many(key_fragment_trits),
+    )) # type: List[int]
 
     return Digest(TryteString.from_trits(digest), self.key_index)
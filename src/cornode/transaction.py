@@ -4,24 +4,26 @@ from __future__ import absolute_import, division, print_function, \
 
 from calendar import timegm as unix_timestamp
 from datetime import datetime
+from multiprocessing import Pool
 from operator import attrgetter
-from typing import Generator, Iterable, Iterator, List, MutableSequence, \
-  Optional, Sequence, Text, Tuple
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, \
+  List, MutableSequence, Optional, Sequence, Text, Tuple
 
 from cornode import Address, Hash, Tag, TryteString, TrytesCompatible, \
   TrytesDecodeError, int_from_trits, trits_from_int
 from cornode.crypto import Curl, FRAGMENT_LENGTH, HASH_LENGTH
 from cornode.crypto.addresses import AddressGenerator
 from cornode.crypto.signing import KeyGenerator, SignatureFragmentGenerator, \
-  validate_signature_fragments
+  validate_signatures
 from cornode.exceptions import with_context
 from cornode.json import JsonSerializable
-from six import PY2
+from six import PY2, binary_type
 
 __all__ = [
   'Bundle',
   'BundleHash',
   'Fragment',
+  'LazyTransaction',
   'ProposedBundle',
   'ProposedTransaction',
   'Transaction',
@@ -110,34 +112,57 @@ class Transaction(JsonSerializable):
   A transaction that has been attached to the Tangle.
   """
   @classmethod
-  def from_tryte_string(cls, trytes):
-    # type: (TrytesCompatible) -> Transaction
+  def from_tryte_string(cls, trytes, hash_=None):
+    # type: (TrytesCompatible, Optional[TransactionHash]) -> Transaction
     """
     Creates a Transaction object from a sequence of trytes.
+
+    :param trytes:
+      Raw trytes.
+
+    :param hash_:
+      The transaction hash, if it is already known.
+      If not provided, it will be computed from ``trytes``.
     """
     tryte_string = TransactionTrytes(trytes)
 
-    hash_ = [0] * HASH_LENGTH # type: MutableSequence[int]
-
-    sponge = Curl()
-    sponge.absorb(tryte_string.as_trits())
-    sponge.squeeze(hash_)
+    if hash_ is None:
+      hash_ = _hash_trytes(tryte_string)
 
     return cls(
-      hash_ = TransactionHash.from_trits(hash_),
+      hash_ = hash_,
       signature_message_fragment = Fragment(tryte_string[0:2187]),
       address = Address(tryte_string[2187:2268]),
-      value = int_from_trits(tryte_string[2268:2295].as_trits()),
+      value = int_from_trits(tryte_string[2268:2295].as_trit_array()),
       tag = Tag(tryte_string[2295:2322]),
-      timestamp = int_from_trits(tryte_string[2322:2331].as_trits()),
-      current_index = int_from_trits(tryte_string[2331:2340].as_trits()),
-      last_index = int_from_trits(tryte_string[2340:2349].as_trits()),
+      timestamp = int_from_trits(tryte_string[2322:2331].as_trit_array()),
+      current_index = int_from_trits(tryte_string[2331:2340].as_trit_array()),
+      last_index = int_from_trits(tryte_string[2340:2349].as_trit_array()),
       bundle_hash = BundleHash(tryte_string[2349:2430]),
       trunk_transaction_hash = TransactionHash(tryte_string[2430:2511]),
       branch_transaction_hash = TransactionHash(tryte_string[2511:2592]),
       nonce = Hash(tryte_string[2592:2673]),
     )
 
+  @classmethod
+  def from_tryte_strings(cls, trytes):
+    # type: (Iterable[TrytesCompatible]) -> List[Transaction]
+    """
+    Creates Transaction objects from several sequences of trytes.
+
+    Equivalent to calling :py:meth:`from_tryte_string` for each
+    sequence, but all of the transaction hashes are computed together
+    (see :py:meth:`cornode.crypto.pycurl.Curl.hash_many`).
+    """
+    tryte_strings = [TransactionTrytes(t) for t in trytes]
+
+    hashes = Curl.hash_many([t.as_trit_array() for t in tryte_strings])
+
+    return [
+      cls.from_tryte_string(t, TransactionHash.from_trits(h))
+        for (t, h) in zip(tryte_strings, hashes)
+    ]
+
   def __init__(
       self,
       hash_,
@@ -361,6 +386,139 @@ class Transaction(JsonSerializable):
     )
 
 
+class _LazyField(object):
+  """
+  Decodes a :py:class:`LazyTransaction` field from the raw trytes the
+  first time it is accessed.
+
+  The decoded value is stored on the instance, where it takes
+  precedence over the descriptor, so each field is decoded at most
+  once (and can be overwritten like a regular attribute).
+  """
+  def __init__(self, name, start, stop, decode):
+    # type: (Text, int, int, Callable[[TryteString], Any]) -> None
+    super(_LazyField, self).__init__()
+
+    self.name   = name
+    self.start  = start
+    self.stop   = stop
+    self.decode = decode
+
+  def __get__(self, instance, owner):
+    if instance is None:
+      return self
+
+    value = self.decode(instance.trytes[self.start:self.stop])
+    instance.__dict__[self.name] = value
+    return value
+
+
+def _hash_trytes(trytes):
+  # type: (TryteString) -> TransactionHash
+  """
+  Computes the hash of a transaction, given its raw trytes.
+  """
+  hash_trits = [0] * HASH_LENGTH # type: MutableSequence[int]
+
+  sponge = Curl()
+  sponge.absorb(trytes.as_trit_array())
+  sponge.squeeze(hash_trits)
+
+  return TransactionHash.from_trits(hash_trits)
+
+
+def _int_from_trytes(trytes):
+  # type: (TryteString) -> int
+  return int_from_trits(trytes.as_trit_array())
+
+
+class LazyTransaction(Transaction):
+  """
+  A Transaction that decodes its fields on demand.
+
+  Useful when parsing lots of transactions, only a few fields of which
+  will actually be used (e.g., when looking for tail transactions, the
+  signature/message fragments are never needed).
+
+  In particular, the transaction hash is not computed until it is
+  accessed, unless it is provided up front.
+  """
+  hash = _LazyField('hash', 0, TransactionTrytes.LEN, _hash_trytes)
+
+  signature_message_fragment =\
+    _LazyField('signature_message_fragment', 0, 2187, Fragment)
+
+  address = _LazyField('address', 2187, 2268, Address)
+  value = _LazyField('value', 2268, 2295, _int_from_trytes)
+  tag = _LazyField('tag', 2295, 2322, Tag)
+  timestamp = _LazyField('timestamp', 2322, 2331, _int_from_trytes)
+  current_index = _LazyField('current_index', 2331, 2340, _int_from_trytes)
+  last_index = _LazyField('last_index', 2340, 2349, _int_from_trytes)
+  bundle_hash = _LazyField('bundle_hash', 2349, 2430, BundleHash)
+
+  trunk_transaction_hash =\
+    _LazyField('trunk_transaction_hash', 2430, 2511, TransactionHash)
+
+  branch_transaction_hash =\
+    _LazyField('branch_transaction_hash', 2511, 2592, TransactionHash)
+
+  nonce = _LazyField('nonce', 2592, 2673, Hash)
+
+  @classmethod
+  def from_tryte_string(cls, trytes, hash_=None):
+    # type: (TrytesCompatible, Optional[TransactionHash]) -> LazyTransaction
+    """
+    Creates a LazyTransaction object from a sequence of trytes.
+
+    :param trytes:
+      Raw trytes.
+
+    :param hash_:
+      The transaction hash, if it is already known (e.g., the hash
+      that was used to fetch ``trytes`` from the node).
+
+      IMPORTANT: This value is trusted as-is; it is not checked against
+      ``trytes``!
+
+      If not provided, it will be computed from ``trytes`` the first
+      time it is accessed.
+    """
+    return cls(trytes, hash_)
+
+  @classmethod
+  def from_tryte_strings(cls, trytes, hashes=None):
+    # type: (Iterable[TrytesCompatible], Optional[Iterable[TransactionHash]]) -> List[LazyTransaction]
+    """
+    Creates LazyTransaction objects from several sequences of trytes.
+
+    :param trytes:
+      Raw trytes for each transaction.
+
+    :param hashes:
+      The corresponding transaction hashes, if they are already known.
+      See :py:meth:`from_tryte_string` for more info.
+    """
+    if hashes is None:
+      return [cls(t) for t in trytes]
+
+    return [cls(t, h) for (t, h) in zip(trytes, hashes)]
+
+  # noinspection PyMissingConstructor
+  def __init__(self, trytes, hash_=None):
+    # type: (TrytesCompatible, Optional[TransactionHash]) -> None
+    # Note that we don't call the parent constructor; it would
+    # overwrite all of the lazy fields.
+    self.trytes = TransactionTrytes(trytes) # type: TransactionTrytes
+    """
+    Raw trytes that the transaction fields are decoded from.
+    """
+
+    if hash_ is not None:
+      self.hash = TransactionHash(hash_)
+
+    self.is_confirmed = None # type: Optional[bool]
+
+
 class ProposedTransaction(Transaction):
   """
   A transaction that has not yet been attached to the Tangle.
@@ -438,7 +596,7 @@ class Bundle(JsonSerializable, Sequence[Transaction]):
     """
     Creates a Bundle object from a list of tryte values.
     """
-    return cls(map(Transaction.from_tryte_string, trytes))
+    return cls(Transaction.from_tryte_strings(trytes))
 
   def __init__(self, transactions=None):
     # type: (Optional[Iterable[Transaction]]) -> None
@@ -605,6 +763,54 @@ class BundleValidator(object):
   """
   Checks a bundle and its transactions for problems.
   """
+  @classmethod
+  def validate_bundles(cls, bundles):
+    # type: (Iterable[Bundle]) -> List[BundleValidator]
+    """
+    Creates validators for multiple bundles at once.
+
+    The signatures from all of the bundles are checked together (see
+    :py:func:`cornode.crypto.signing.validate_signatures`), which is
+    much faster than validating each bundle separately.
+
+    :return:
+      One validator per bundle, in the same order as ``bundles``.
+    """
+    validators = [cls(bundle) for bundle in bundles]
+
+    # As with individual bundles, signatures are only checked if the
+    # transactions are otherwise valid.
+    pending = [
+      v for v in validators
+        if not any(True for _ in v._get_structure_errors())
+    ]
+
+    cls._check_signatures(pending)
+
+    return validators
+
+  @staticmethod
+  def _check_signatures(validators):
+    # type: (Sequence[BundleValidator]) -> None
+    """
+    Checks the signatures in each validator's bundle, all at once, so
+    that their hash chains can be advanced together.
+    """
+    signatures = [
+      (fragments, txn.bundle_hash, txn.address)
+        for v in validators
+          for (txn, fragments, errors) in v._get_signature_inputs()
+            if not errors
+    ]
+
+    results = iter(validate_signatures(signatures))
+
+    for v in validators:
+      v._signatures_valid = [
+        None if errors else next(results)
+          for (_, _, errors) in v._get_signature_inputs()
+      ]
+
   def __init__(self, bundle):
     # type: (Bundle) -> None
     super(BundleValidator, self).__init__()
@@ -614,6 +820,9 @@ class BundleValidator(object):
     self._errors    = [] # type: Optional[List[Text]]
     self._validator = self._create_validator()
 
+    self._signature_inputs = None # type: Optional[List[Tuple[Transaction, List[Fragment], List[Text]]]]
+    self._signatures_valid = None # type: Optional[List[Optional[bool]]]
+
   @property
   def errors(self):
     # type: () -> List[Text]
@@ -647,6 +856,42 @@ class BundleValidator(object):
     """
     Creates a generator that does all the work.
     """
+    structure_valid = True
+    for error in self._get_structure_errors():
+      structure_valid = False
+      yield error
+
+    # Signature validation is only meaningful if the transactions are
+    # otherwise valid.
+    if not structure_valid:
+      return
+
+    inputs = self._get_signature_inputs()
+
+    for (n, (txn, signature_fragments, errors)) in enumerate(inputs):
+      for error in errors:
+        yield error
+
+      if errors:
+        continue
+
+      if self._signatures_valid is None:
+        self._check_signatures([self])
+
+      if not self._signatures_valid[n]:
+        yield (
+          'Transaction {i} has invalid signature '
+          '(using {fragments} fragments).'.format(
+            fragments = len(signature_fragments),
+            i         = txn.current_index,
+          )
+        )
+
+  def _get_structure_errors(self):
+    # type: () -> Generator[Text]
+    """
+    Checks the bundle hash, indexes and balance of each transaction.
+    """
     bundle_hash = self.bundle.hash
     last_index  = len(self.bundle) - 1
 
@@ -685,87 +930,85 @@ class BundleValidator(object):
         )
       )
 
-    # Signature validation is only meaningful if the transactions are
-    # otherwise valid.
-    if not self._errors:
-      i = 0
-      while i <= last_index:
-        txn = self.bundle[i]
-
-        if txn.value < 0:
-          signature_fragments = [txn.signature_message_fragment]
-
-          # The following transaction(s) should contain additional
-          # fragments.
-          fragments_valid = True
-          j = 0
-          for j in range(1, AddressGenerator.DIGEST_ITERATIONS):
-            i += 1
-            try:
-              next_txn = self.bundle[i]
-            except IndexError:
-              yield (
-                'Reached end of bundle while looking for '
-                'signature fragment {j} for transaction {i}.'.format(
-                  i = txn.current_index,
-                  j = j+1,
-                )
+  def _get_signature_inputs(self):
+    # type: () -> List[Tuple[Transaction, List[Fragment], List[Text]]]
+    """
+    Collects the signature fragments for each input in the bundle.
+
+    :return:
+      ``(transaction, signature_fragments, errors)`` for each input.
+      The signature should only be checked if there are no errors.
+    """
+    if self._signature_inputs is not None:
+      return self._signature_inputs
+
+    self._signature_inputs = []
+
+    last_index = len(self.bundle) - 1
+
+    i = 0
+    while i <= last_index:
+      txn = self.bundle[i]
+
+      if txn.value < 0:
+        signature_fragments = [txn.signature_message_fragment]
+        errors              = [] # type: List[Text]
+
+        # The following transaction(s) should contain additional
+        # fragments.
+        j = 0
+        for j in range(1, AddressGenerator.DIGEST_ITERATIONS):
+          i += 1
+          try:
+            next_txn = self.bundle[i]
+          except IndexError:
+            errors.append(
+              'Reached end of bundle while looking for '
+              'signature fragment {j} for transaction {i}.'.format(
+                i = txn.current_index,
+                j = j+1,
               )
-              fragments_valid = False
-              break
-
-            if next_txn.address != txn.address:
-              yield (
-                'Unable to find signature fragment {j} '
-                'for transaction {i}.'.format(
-                  i = txn.current_index,
-                  j = j+1,
-                )
+            )
+            break
+
+          if next_txn.address != txn.address:
+            errors.append(
+              'Unable to find signature fragment {j} '
+              'for transaction {i}.'.format(
+                i = txn.current_index,
+                j = j+1,
               )
-              fragments_valid = False
-              break
-
-            if next_txn.value != 0:
-              yield (
-                'Transaction {i} has invalid amount '
-                '(expected 0, actual {actual}).'.format(
-                  actual  = next_txn.value,
-                  i       = next_txn.current_index,
-                )
+            )
+            break
+
+          if next_txn.value != 0:
+            errors.append(
+              'Transaction {i} has invalid amount '
+              '(expected 0, actual {actual}).'.format(
+                actual  = next_txn.value,
+                i       = next_txn.current_index,
               )
-              fragments_valid = False
-              # Keep going, just in case there's another signature
-              # fragment next (so that we skip it in the next iteration
-              # of the outer loop).
-              continue
-
-            signature_fragments.append(next_txn.signature_message_fragment)
-
-          if fragments_valid:
-            signature_valid = validate_signature_fragments(
-              fragments   = signature_fragments,
-              hash_       = txn.bundle_hash,
-              public_key  = txn.address,
             )
+            # Keep going, just in case there's another signature
+            # fragment next (so that we skip it in the next iteration
+            # of the outer loop).
+            continue
 
-            if not signature_valid:
-              yield (
-                'Transaction {i} has invalid signature '
-                '(using {fragments} fragments).'.format(
-                  fragments = len(signature_fragments),
-                  i         = txn.current_index,
-                )
-              )
+          signature_fragments.append(next_txn.signature_message_fragment)
 
-          # Skip signature fragments in the next iteration.
-          # Note that it's possible to have
-          # ``j < AddressGenerator.DIGEST_ITERATIONS`` if the bundle is
-          # badly malformed.
-          i += j
+        self._signature_inputs.append((txn, signature_fragments, errors))
 
-        else:
-          # No signature to validate; skip this transaction.
-          i += 1
+        # Skip signature fragments in the next iteration.
+        # Note that it's possible to have
+        # ``j < AddressGenerator.DIGEST_ITERATIONS`` if the bundle is
+        # badly malformed.
+        i += j
+
+      else:
+        # No signature to validate; skip this transaction.
+        i += 1
+
+    return self._signature_inputs
 
 
 class ProposedBundle(JsonSerializable, Sequence[ProposedTransaction]):
@@ -1039,7 +1282,7 @@ class ProposedBundle(JsonSerializable, Sequence[ProposedTransaction]):
       txn.current_index = i
       txn.last_index    = last_index
 
-      sponge.absorb(txn.get_signature_validation_trytes().as_trits())
+      sponge.absorb(txn.get_signature_validation_trytes().as_trit_array())
 
     bundle_hash = [0] * HASH_LENGTH # type: MutableSequence[int]
     sponge.squeeze(bundle_hash)
@@ -1052,14 +1295,35 @@ class ProposedBundle(JsonSerializable, Sequence[ProposedTransaction]):
       # Initialize signature/message fragment.
       txn.signature_message_fragment = Fragment(txn.message or b'')
 
-  def sign_inputs(self, key_generator):
-    # type: (KeyGenerator) -> None
+  def sign_inputs(self, key_generator, workers=1):
+    # type: (KeyGenerator, int) -> None
     """
     Sign inputs in a finalized bundle.
+
+    :param key_generator:
+      Used to generate the private key for each input.
+
+    :param workers:
+      Number of processes to use.
+      If greater than 1, inputs are signed in parallel, using a
+      :py:class:`multiprocessing.pool.Pool`.
     """
     if not self.hash:
       raise RuntimeError('Cannot sign inputs until bundle is finalized.')
 
+    if workers < 1:
+      raise with_context(
+        exc = ValueError('``workers`` must be positive.'),
+
+        context = {
+          'workers': workers,
+        },
+      )
+
+    # Find the inputs first, so that we don't waste time signing any of
+    # them if one is invalid.
+    inputs = [] # type: List[int]
+
     # Use a counter for the loop so that we can skip ahead as we go.
     i = 0
     while i < len(self):
@@ -1082,23 +1346,60 @@ class ProposedBundle(JsonSerializable, Sequence[ProposedTransaction]):
             },
           )
 
-        signature_fragment_generator =\
-          self._create_signature_fragment_generator(key_generator, txn)
-
-        # We can only fit one signature fragment into each transaction,
-        # so we have to split the entire signature among the extra
-        # transactions we created for this input in
-        # :py:meth:`add_inputs`.
-        for j in range(AddressGenerator.DIGEST_ITERATIONS):
-          self[i+j].signature_message_fragment =\
-            next(signature_fragment_generator)
+        inputs.append(i)
 
+        # The extra transactions that we created for this input in
+        # :py:meth:`add_inputs` will hold the rest of its signature.
         i += AddressGenerator.DIGEST_ITERATIONS
       else:
         # No signature needed (nor even possible, in some cases); skip
         # this transaction.
         i += 1
 
+    if (workers > 1) and (len(inputs) > 1):
+      self._sign_inputs_parallel(key_generator, inputs, workers)
+      return
+
+    for i in inputs:
+      signature_fragment_generator =\
+        self._create_signature_fragment_generator(key_generator, self[i])
+
+      # We can only fit one signature fragment into each transaction,
+      # so we have to split the entire signature among the extra
+      # transactions we created for this input.
+      for j in range(AddressGenerator.DIGEST_ITERATIONS):
+        self[i+j].signature_message_fragment =\
+          next(signature_fragment_generator)
+
+  def _sign_inputs_parallel(self, key_generator, inputs, workers):
+    # type: (KeyGenerator, List[int], int) -> None
+    """
+    Signs inputs using a pool of worker processes.
+
+    :param inputs:
+      Indexes of the input transactions to sign.
+    """
+    # The seed and bundle hash are the same for every input, so only
+    # send them to each worker once.
+    pool = Pool(
+      processes   = workers,
+      initializer = _init_signing_worker,
+      initargs    = (binary_type(key_generator.seed), binary_type(self.hash)),
+    )
+
+    try:
+      signatures = pool.map(
+        _sign_input,
+        [self[i].address.key_index for i in inputs],
+        chunksize = max(1, len(inputs) // workers),
+      )
+    finally:
+      pool.terminate()
+
+    for (i, fragments) in zip(inputs, signatures):
+      for (j, fragment) in enumerate(fragments):
+        self[i+j].signature_message_fragment = Fragment(fragment)
+
   @staticmethod
   def _create_signature_fragment_generator(key_generator, txn):
     # type: (KeyGenerator, ProposedTransaction) -> SignatureFragmentGenerator
@@ -1116,3 +1417,42 @@ class ProposedBundle(JsonSerializable, Sequence[ProposedTransaction]):
 
       hash_= txn.bundle_hash,
     )
+
+
+_signing_worker_state = {} # type: Dict[Text, TryteString]
+"""
+Values that are shared by every input that a worker process signs.
+
+Set by :py:func:`_init_signing_worker`.
+"""
+
+
+def _init_signing_worker(seed, bundle_hash):
+  # type: (binary_type, binary_type) -> None
+  """
+  Initializes a worker process used by
+  :py:meth:`ProposedBundle.sign_inputs` when running in parallel mode.
+  """
+  _signing_worker_state['bundle_hash'] = BundleHash(bundle_hash)
+  _signing_worker_state['seed'] = TryteString(seed)
+
+
+def _sign_input(key_index):
+  # type: (int) -> List[binary_type]
+  """
+  Generates the signature fragments for a single input in a worker
+  process.
+  """
+  signature_fragment_generator = SignatureFragmentGenerator(
+    private_key = KeyGenerator(_signing_worker_state['seed']).get_keys(
+      start       = key_index,
+      iterations  = AddressGenerator.DIGEST_ITERATIONS,
+    )[0],
+
+    hash_ = _signing_worker_state['bundle_hash'],
+  )
+
+  return [
+    binary_type(next(signature_fragment_generator))
+      for _ in range(AddressGenerator.DIGEST_ITERATIONS)
+  ]
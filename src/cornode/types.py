@@ -2,11 +2,11 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
+from array import array
 from codecs import encode, decode
-from itertools import chain
 from math import ceil
-from typing import Generator, Iterable, Iterator, List, MutableSequence, \
-  Optional, Text, Union
+from typing import Dict, Generator, Iterable, Iterator, List, \
+  MutableSequence, Optional, Text, Union
 
 from six import PY2, binary_type
 
@@ -75,6 +75,27 @@ def int_from_trits(trits):
   return sum(base * (3 ** power) for power, base in enumerate(trits))
 
 
+_TRYTES_BY_VALUE = bytearray(b'9ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+"""
+Lookup table for converting trits to trytes, indexed by the value of
+the tryte (-13 to 13; note that negative values wrap around to the
+end).
+"""
+
+_TRITS_BY_TRYTE = {
+  # Values greater than 13 wrap around (e.g., 14 => -13).
+  # Each trit is stored as a signed byte (e.g., -1 => 0xff).
+  ordinal: binary_type(bytearray(
+    t & 0xff for t in trits_from_int(value if value < 14 else value - 27, pad=3)
+  ))
+    for (value, ordinal) in enumerate(_TRYTES_BY_VALUE)
+} # type: Dict[int, binary_type]
+"""
+Lookup table for converting trytes to trits (packed as signed bytes),
+indexed by tryte ordinal.
+"""
+
+
 class TryteString(JsonSerializable):
   """
   A string representation of a sequence of trytes.
@@ -117,18 +138,10 @@ class TryteString(JsonSerializable):
     References:
       - :py:meth:`as_trytes`
     """
-    chars = bytearray()
-
-    for t in trytes:
-      converted = int_from_trits(t)
-
-      # :py:meth:`_tryte_from_int`
-      if converted < 0:
-        converted += 27
-
-      chars.append(TrytesCodec.alphabet[converted])
-
-    return cls(chars)
+    return cls(bytearray(
+      _TRYTES_BY_VALUE[int_from_trits(t)]
+        for t in trytes
+    ))
 
   @classmethod
   def from_trits(cls, trits):
@@ -138,6 +151,7 @@ class TryteString(JsonSerializable):
 
     :param trits:
       Iterable of trit values (-1, 0, 1).
+      This may also be a trit array (see :py:meth:`as_trit_array`).
 
     References:
       - :py:func:`int_from_trits`
@@ -145,16 +159,22 @@ class TryteString(JsonSerializable):
     """
     # Allow passing a generator or other non-Sized value to this
     # method.
-    trits = list(trits)
+    if not isinstance(trits, (list, array)):
+      trits = list(trits)
 
     if len(trits) % 3:
       # Pad the trits so that it is cleanly divisible into trytes.
-      trits += [0] * (3 - (len(trits) % 3))
+      # Note that we make a copy, so that the caller's value is not
+      # modified.
+      trits = trits[:]
+      trits.extend([0] * (3 - (len(trits) % 3)))
 
-    return cls.from_trytes(
-      # :see: http://stackoverflow.com/a/1751478/
-      trits[i:i+3] for i in range(0, len(trits), 3)
-    )
+    lookup = _TRYTES_BY_VALUE
+
+    return cls(bytearray(
+      lookup[low + (3 * middle) + (9 * high)]
+        for (low, middle, high) in zip(trits[0::3], trits[1::3], trits[2::3])
+    ))
 
   def __init__(self, trytes, pad=None):
     # type: (TrytesCompatible, Optional[int]) -> None
@@ -503,8 +523,21 @@ class TryteString(JsonSerializable):
     IMPORTANT: TryteString is not a numeric type, so the result of this
     method should not be interpreted as an integer!
     """
-    # http://stackoverflow.com/a/952952/5568265#comment4204394_952952
-    return list(chain.from_iterable(self.as_trytes()))
+    return self.as_trit_array().tolist()
+
+  def as_trit_array(self):
+    # type: () -> array
+    """
+    Converts the TryteString into a compact sequence of trit values.
+
+    Same as :py:meth:`as_trits`, except that the trits are stored in a
+    signed byte array (``array('b')``), which takes up much less memory
+    than a list of ints.
+
+    Trit arrays can be used anywhere that a list of trits is accepted
+    (e.g., :py:meth:`from_trits`, :py:class:`cornode.crypto.Curl`).
+    """
+    return array('b', b''.join(map(_TRITS_BY_TRYTE.__getitem__, self._trytes)))
 
   def _repr_pretty_(self, p, cycle):
     """
@@ -0,0 +1,179 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from subprocess import check_output
+from sys import executable
+from unittest import TestCase
+
+from cornode import Address, BadApiResponse, ProposedTransaction, Tag, \
+  TryteString, cornode
+from cornode.adapter import resolve_adapter
+from cornode.adapter.local import LocalTangleAdapter
+from cornode.crypto.addresses import AddressGenerator
+from cornode.crypto.types import Seed
+
+
+class LocalTangleAdapterTestCase(TestCase):
+  # noinspection SpellCheckingInspection
+  def setUp(self):
+    super(LocalTangleAdapterTestCase, self).setUp()
+
+    self.adapter = LocalTangleAdapter()
+    self.api     = cornode(self.adapter, Seed.random())
+
+    self.address =\
+      Address(
+        b'TESTVALUE9DONTUSEINPRODUCTION99999FBFFTG'
+        b'QFWEHEL9KCAFXBJBXGE9HID9XCOHFIDABHDG9AHDR'
+      )
+
+    self.tag = Tag(b'PYOTA9LOCAL')
+
+  def _send_transfer(self, message):
+    """
+    Sends a zero-value transfer to the test address.
+    """
+    return self.api.send_transfer(
+      depth = 3,
+
+      transfers = [
+        ProposedTransaction(
+          address = self.address,
+          message = TryteString.from_string(message),
+          tag     = self.tag,
+          value   = 0,
+        ),
+      ],
+    )['bundle']
+
+  def test_resolve_adapter(self):
+    """
+    Creating the adapter using a ``local://`` URI.
+    """
+    self.assertIsInstance(resolve_adapter('local://'), LocalTangleAdapter)
+
+  def test_resolve_adapter_fresh_process(self):
+    """
+    The ``local://`` protocol is registered without having to import
+    :py:mod:`cornode.adapter.local` first.
+    """
+    output = check_output([
+      executable,
+      '-c',
+      'from cornode import cornode; '
+      'print(type(cornode("local://").adapter).__name__)',
+    ])
+
+    self.assertEqual(output.strip(), b'LocalTangleAdapter')
+
+  def test_round_trip(self):
+    """
+    Sending a transfer, then finding and loading it again.
+    """
+    bundle  = self._send_transfer('Hello, Tangle!')
+    tail    = bundle.tail_transaction
+
+    for kwargs in (
+        {'addresses': [self.address]},
+        {'bundles':   [bundle.hash]},
+        {'tags':      [self.tag]},
+    ):
+      self.assertListEqual(
+        self.api.find_transactions(**kwargs)['hashes'],
+        [tail.hash],
+      )
+
+    loaded = self.api.get_bundles(tail.hash)['bundles']
+
+    self.assertEqual(len(loaded), 1)
+    self.assertEqual(loaded[0].hash, bundle.hash)
+    self.assertEqual(
+      loaded[0].tail_transaction.signature_message_fragment,
+      tail.signature_message_fragment,
+    )
+
+    self.assertDictEqual(
+      self.api.get_latest_inclusion([tail.hash])['states'],
+      {tail.hash: True},
+    )
+
+  def test_tips(self):
+    """
+    Each transfer approves the previous one.
+    """
+    self.assertListEqual(self.api.get_tips()['hashes'], [])
+
+    first   = self._send_transfer('first').tail_transaction
+    second  = self._send_transfer('second').tail_transaction
+
+    self.assertEqual(second.trunk_transaction_hash, first.hash)
+    self.assertEqual(second.branch_transaction_hash, first.hash)
+
+    self.assertListEqual(self.api.get_tips()['hashes'], [second.hash])
+
+    self.assertListEqual(
+      self.api.find_transactions(approvees=[first.hash])['hashes'],
+      [second.hash],
+    )
+
+    # Both criteria have to match.
+    self.assertListEqual(
+      self.api.find_transactions(
+        addresses = [self.address],
+        approvees = [second.hash],
+      )['hashes'],
+
+      [],
+    )
+
+  def test_get_balances(self):
+    """
+    Balances include initial balances and stored transactions.
+    """
+    adapter = LocalTangleAdapter(balances={self.address: 42})
+
+    self.assertListEqual(
+      cornode(adapter).get_balances([self.address])['balances'],
+      [42],
+    )
+
+  def test_value_transfer(self):
+    """
+    Spending from a funded address updates balances.
+    """
+    seed = Seed.random()
+    (source, change) = AddressGenerator(seed).get_addresses(0, 2)
+
+    api = cornode(LocalTangleAdapter(balances={source: 100}), seed)
+
+    api.send_transfer(
+      depth           = 3,
+      inputs          = [source],
+      change_address  = change,
+
+      transfers = [ProposedTransaction(address=self.address, value=40)],
+    )
+
+    self.assertListEqual(
+      api.get_balances([source, change, self.address])['balances'],
+      [0, 60, 40],
+    )
+
+  def test_get_trytes_unknown(self):
+    """
+    Fetching a transaction that isn't in the Tangle.
+    """
+    response = self.adapter.send_request({
+      'command':  'getTrytes',
+      'hashes':   ['9' * 81],
+    })
+
+    self.assertListEqual(response['trytes'], ['9' * 2673])
+
+  def test_unsupported_command(self):
+    """
+    Sending a command that the adapter doesn't support.
+    """
+    with self.assertRaises(BadApiResponse):
+      self.adapter.send_request({'command': 'addNeighbors'})
@@ -0,0 +1,114 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from unittest import TestCase
+
+from mock import Mock, patch
+
+from cornode import TransactionHash, TransactionTrytes
+from cornode.adapter import BadApiResponse, InvalidUri, resolve_adapter
+from cornode.adapter.pow import LocalPowAdapter
+from cornode.transaction import Transaction
+
+
+class LocalPowAdapterTestCase(TestCase):
+  # noinspection SpellCheckingInspection
+  def setUp(self):
+    super(LocalPowAdapterTestCase, self).setUp()
+
+    self.adapter = LocalPowAdapter(workers=1)
+
+    self.trunk = TransactionHash(
+      b'TKGDZ9GEI9CPNQGHEATIISAKYPPPSXVCXBSR9EIW'
+      b'CTHHSSEQCD9YLDPEXYERCNJVASRGWMAVKFQTC9999'
+    )
+
+    self.branch = TransactionHash(
+      b'TKGDZ9GEI9CPNQGHEATIISAKYPPPSXVCXBSR9EIW'
+      b'CTHHSSEQCD9YLDPEXYERCNJVASRGWMAVKFQTCAAAA'
+    )
+
+  def test_configure(self):
+    """
+    Configuring the adapter from a URI.
+    """
+    adapter = resolve_adapter('local-pow://?workers=3')
+
+    self.assertIsInstance(adapter, LocalPowAdapter)
+    self.assertEqual(adapter.workers, 3)
+
+  def test_configure_error_workers_not_numeric(self):
+    """
+    The URI specifies a non-numeric number of workers.
+    """
+    with self.assertRaises(InvalidUri):
+      resolve_adapter('local-pow://?workers=lots')
+
+  def test_attach_to_tangle(self):
+    """
+    Doing proof of work for a sequence of transactions.
+    """
+    response = self.adapter.send_request({
+      'command':            'attachToTangle',
+      'trunkTransaction':   self.trunk,
+      'branchTransaction':  self.branch,
+      'minWeightMagnitude': 3,
+
+      'trytes': [
+        TransactionTrytes(b'A'),
+        TransactionTrytes(b'B'),
+      ],
+    })
+
+    # The trytes are returned in the reverse order that they were
+    # attached.
+    txns = [
+      Transaction.from_tryte_string(t.encode('ascii'))
+        for t in response['trytes']
+    ]
+    self.assertEqual(len(txns), 2)
+
+    self.assertEqual(txns[1].signature_message_fragment[0:1], b'A')
+    self.assertEqual(txns[1].trunk_transaction_hash, self.trunk)
+    self.assertEqual(txns[1].branch_transaction_hash, self.branch)
+
+    self.assertEqual(txns[0].signature_message_fragment[0:1], b'B')
+    self.assertEqual(txns[0].trunk_transaction_hash, txns[1].hash)
+    self.assertEqual(txns[0].branch_transaction_hash, self.trunk)
+
+    for txn in txns:
+      self.assertEqual(txn.hash.as_trits()[-3:], [0, 0, 0])
+
+  def test_attach_to_tangle_interrupted(self):
+    """
+    Proof of work is interrupted before it completes.
+    """
+    with patch('cornode.adapter.pow.find_nonce', Mock(return_value=None)):
+      with self.assertRaises(BadApiResponse):
+        self.adapter.send_request({
+          'command':            'attachToTangle',
+          'trunkTransaction':   self.trunk,
+          'branchTransaction':  self.branch,
+          'minWeightMagnitude': 3,
+          'trytes':             [TransactionTrytes(b'')],
+        })
+
+  def test_interrupt_attaching_to_tangle(self):
+    """
+    Interrupting proof of work.
+    """
+    self.assertDictEqual(
+      self.adapter.send_request({'command': 'interruptAttachingToTangle'}),
+      {},
+    )
+
+    # noinspection PyProtectedMember
+    self.assertTrue(self.adapter._interrupted.is_set())
+
+  def test_error_unsupported_command(self):
+    """
+    Sending a command that does not involve proof of work.
+    """
+    with self.assertRaises(BadApiResponse):
+      self.adapter.send_request({'command': 'getNodeInfo'})
@@ -4,6 +4,7 @@ from __future__ import absolute_import, division, print_function, \
 
 import json
 from collections import deque
+from itertools import count
 from unittest import TestCase
 
 from mock import Mock, patch
@@ -408,3 +409,150 @@ class SandboxAdapterTestCase(TestCase):
     with self.assertRaises(ValueError):
       # noinspection PyTypeChecker
       SandboxAdapter('https://localhost', 'token', max_polls=0)
+
+
+class SandboxJobTestCase(TestCase):
+  """
+  Unit tests for :py:meth:`SandboxAdapter.submit`.
+  """
+  def setUp(self):
+    super(SandboxJobTestCase, self).setUp()
+
+    self.adapter =\
+      SandboxAdapter('https://localhost', 'ACCESS-TOKEN', 1, max_polls=100)
+
+    self.expected_result = {
+      'message': 'Hello, cornode!',
+    }
+
+  def _job_response(self, status, http_status=200):
+    """
+    Creates a response containing the status of a job.
+    """
+    job = {
+      'id':       '70fef55d-6933-49fb-ae17-ec5d02bc9117',
+      'status':   status,
+      'command':  'helloWorld',
+
+      'helloWorldRequest': {
+        'command': 'helloWorld',
+      },
+    }
+
+    if status == 'FINISHED':
+      job['helloWorldResponse'] = self.expected_result
+    elif status == 'FAILED':
+      job['error'] = {'message': 'Something went wrong.'}
+
+    return create_http_response(status=http_status, content=json.dumps(job))
+
+  def _mock_responses(self, *responses):
+    """
+    Returns a mock for ``_send_http_request`` that returns the
+    specified responses in order.
+    """
+    responses = deque(responses)
+
+    # noinspection PyUnusedLocal
+    def _send_http_request(*args, **kwargs):
+      return responses.popleft()
+
+    return patch.object(self.adapter, '_send_http_request', _send_http_request)
+
+  def test_regular_command(self):
+    """
+    The node completes the request right away.
+    """
+    mocked_response = create_http_response(json.dumps(self.expected_result))
+
+    with self._mock_responses(mocked_response):
+      job = self.adapter.submit({'command': 'helloWorld'})
+
+    self.assertTrue(job.done())
+    self.assertDictEqual(job.result(), self.expected_result)
+
+  def test_background_polling(self):
+    """
+    Jobs are polled in a background thread.
+    """
+    with patch('cornode.adapter.sandbox.clock', Mock(side_effect=count())):
+      with self._mock_responses(
+        self._job_response('QUEUED', 202),
+        self._job_response('RUNNING'),
+        self._job_response('FINISHED'),
+      ):
+        job = self.adapter.submit({'command': 'helloWorld'})
+
+        self.assertDictEqual(job.result(timeout=5), self.expected_result)
+
+    self.assertEqual(job.polls, 1)
+
+  def test_adaptive_polling(self):
+    """
+    The first poll is scheduled for when recent jobs have typically
+    finished.
+    """
+    with patch.object(self.adapter, '_start_poller'):
+      with patch('cornode.adapter.sandbox.clock', Mock(return_value=100)):
+        with self._mock_responses(self._job_response('QUEUED', 202)):
+          job = self.adapter.submit({'command': 'helloWorld'})
+
+      # No history yet, so use the poll interval.
+      self.assertEqual(job.next_poll, 101)
+
+      with patch('cornode.adapter.sandbox.clock', Mock(return_value=104)):
+        with self._mock_responses(self._job_response('FINISHED')):
+          self.assertIsNone(self.adapter.poll_jobs())
+
+      self.assertDictEqual(job.result(0), self.expected_result)
+
+      with patch('cornode.adapter.sandbox.clock', Mock(return_value=200)):
+        with self._mock_responses(self._job_response('QUEUED', 202)):
+          job = self.adapter.submit({'command': 'helloWorld'})
+
+        # The previous job took 4 seconds to complete.
+        self.assertEqual(job.next_poll, 204)
+        self.assertEqual(self.adapter.poll_jobs(), 4)
+
+  def test_job_fails(self):
+    """
+    The job fails after an interval.
+    """
+    with patch('cornode.adapter.sandbox.clock', Mock(side_effect=count())):
+      with self._mock_responses(
+        self._job_response('QUEUED', 202),
+        self._job_response('FAILED'),
+      ):
+        job = self.adapter.submit({'command': 'helloWorld'})
+
+        with self.assertRaises(BadApiResponse):
+          job.result(timeout=5)
+
+  def test_job_times_out(self):
+    """
+    The job takes longer than ``poll_interval * max_polls`` seconds.
+    """
+    with patch.object(self.adapter, '_start_poller'):
+      with patch('cornode.adapter.sandbox.clock', Mock(return_value=0)):
+        with self._mock_responses(self._job_response('QUEUED', 202)):
+          job = self.adapter.submit({'command': 'helloWorld'})
+
+      with patch('cornode.adapter.sandbox.clock', Mock(return_value=100)):
+        with self._mock_responses(self._job_response('RUNNING')):
+          self.adapter.poll_jobs()
+
+    with self.assertRaises(BadApiResponse):
+      job.result(0)
+
+  def test_result_timeout(self):
+    """
+    Waiting for a job that is still running.
+    """
+    with patch.object(self.adapter, '_start_poller'):
+      with self._mock_responses(self._job_response('QUEUED', 202)):
+        job = self.adapter.submit({'command': 'helloWorld'})
+
+    self.assertFalse(job.done())
+
+    with self.assertRaises(BadApiResponse):
+      job.result(0)
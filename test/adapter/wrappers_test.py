@@ -2,10 +2,22 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
+from collections import deque
+from io import open as io_open
+from os import listdir
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event, Timer
 from unittest import TestCase
 
-from cornode.adapter import HttpAdapter, MockAdapter
-from cornode.adapter.wrappers import RoutingWrapper
+from mock import Mock, patch
+
+from cornode import BadApiResponse, TransactionHash
+from cornode.adapter import BaseAdapter, HttpAdapter, MockAdapter
+from cornode.adapter.wrappers import CachingWrapper, HedgingWrapper, \
+  MetricsWrapper, PoolWrapper, RoutingWrapper
+from test.adapter_test import create_http_response
 
 
 class RoutingWrapperTestCase(TestCase):
@@ -90,3 +102,630 @@ class RoutingWrapperTestCase(TestCase):
       wrapper2.get_adapter('echo'),
       wrapper1.get_adapter('alpha'),
     )
+
+
+# noinspection SpellCheckingInspection
+class CachingWrapperTestCase(TestCase):
+  def setUp(self):
+    super(CachingWrapperTestCase, self).setUp()
+
+    self.adapter = MockAdapter()
+
+    self.hash1 = TransactionHash(b'TESTVALUE9DONTUSEINPRODUCTION99999ONE')
+    self.hash2 = TransactionHash(b'TESTVALUE9DONTUSEINPRODUCTION99999TWO')
+    self.hash3 = TransactionHash(b'TESTVALUE9DONTUSEINPRODUCTION99999THREE')
+
+    self.trytes1 = 'TESTVALUE9TRYTES9ONE'
+    self.trytes2 = 'TESTVALUE9TRYTES9TWO'
+    self.trytes3 = 'TESTVALUE9TRYTES9THREE'
+
+  def test_get_trytes_partial(self):
+    """
+    Only uncached transactions are requested from the node.
+    """
+    wrapper = CachingWrapper(self.adapter)
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [self.trytes2],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [self.trytes1, self.trytes3],
+    })
+
+    self.assertListEqual(
+      wrapper.send_request({'command': 'getTrytes', 'hashes': [self.hash2]})['trytes'],
+      [self.trytes2],
+    )
+
+    self.assertListEqual(
+      wrapper.send_request({
+        'command':  'getTrytes',
+        'hashes':   [self.hash1, self.hash2, self.hash3],
+      })['trytes'],
+
+      # Results are merged in request order.
+      [self.trytes1, self.trytes2, self.trytes3],
+    )
+
+    self.assertListEqual(
+      [r['hashes'] for r in self.adapter.requests],
+
+      [
+        [self.hash2.as_json_compatible()],
+        [self.hash1.as_json_compatible(), self.hash3.as_json_compatible()],
+      ],
+    )
+
+  def test_get_trytes_cached(self):
+    """
+    A request for cached transactions doesn't reach the node.
+    """
+    wrapper = CachingWrapper(self.adapter)
+
+    self.adapter.seed_response('getTrytes', {'trytes': [self.trytes1]})
+
+    for _ in range(2):
+      self.assertListEqual(
+        wrapper.send_request({'command': 'getTrytes', 'hashes': [self.hash1]})['trytes'],
+        [self.trytes1],
+      )
+
+    self.assertEqual(len(self.adapter.requests), 1)
+
+  def test_get_trytes_unknown_transaction(self):
+    """
+    Transactions that the node doesn't have are not cached.
+    """
+    wrapper = CachingWrapper(self.adapter)
+
+    self.adapter.seed_response('getTrytes', {'trytes': ['9' * 2673]})
+    self.adapter.seed_response('getTrytes', {'trytes': [self.trytes1]})
+
+    for expected in ['9' * 2673, self.trytes1]:
+      self.assertListEqual(
+        wrapper.send_request({'command': 'getTrytes', 'hashes': [self.hash1]})['trytes'],
+        [expected],
+      )
+
+    self.assertEqual(len(self.adapter.requests), 2)
+
+  def test_max_size(self):
+    """
+    The least-recently-used transactions are evicted.
+    """
+    wrapper = CachingWrapper(self.adapter, max_size=2)
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [self.trytes1, self.trytes2],
+    })
+
+    self.adapter.seed_response('getTrytes', {'trytes': [self.trytes3]})
+
+    wrapper.send_request({'command': 'getTrytes', 'hashes': [self.hash1, self.hash2]})
+
+    # Use ``hash1`` so that ``hash2`` gets evicted instead.
+    wrapper.send_request({'command': 'getTrytes', 'hashes': [self.hash1]})
+    wrapper.send_request({'command': 'getTrytes', 'hashes': [self.hash3]})
+
+    self.assertListEqual(
+      list(wrapper.store.keys()),
+      [self.hash1.as_json_compatible(), self.hash3.as_json_compatible()],
+    )
+
+  def test_custom_store(self):
+    """
+    Using a custom store for transactions.
+    """
+    store   = {self.hash1.as_json_compatible(): self.trytes1}
+    wrapper = CachingWrapper(self.adapter, store=store)
+
+    self.adapter.seed_response('getTrytes', {'trytes': [self.trytes2]})
+
+    self.assertListEqual(
+      wrapper.send_request({
+        'command':  'getTrytes',
+        'hashes':   [self.hash1, self.hash2],
+      })['trytes'],
+
+      [self.trytes1, self.trytes2],
+    )
+
+    self.assertEqual(store[self.hash2.as_json_compatible()], self.trytes2)
+
+  def test_ttl(self):
+    """
+    Caching responses for a limited time.
+    """
+    wrapper = CachingWrapper(self.adapter, ttls={'getNodeInfo': 5})
+
+    self.adapter.seed_response('getNodeInfo', {'id': 'first'})
+    self.adapter.seed_response('getNodeInfo', {'id': 'second'})
+
+    with patch('cornode.adapter.wrappers.clock', Mock(return_value=100)):
+      self.assertDictEqual(wrapper.send_request({'command': 'getNodeInfo'}), {'id': 'first'})
+
+    with patch('cornode.adapter.wrappers.clock', Mock(return_value=104)):
+      self.assertDictEqual(wrapper.send_request({'command': 'getNodeInfo'}), {'id': 'first'})
+
+    with patch('cornode.adapter.wrappers.clock', Mock(return_value=106)):
+      self.assertDictEqual(wrapper.send_request({'command': 'getNodeInfo'}), {'id': 'second'})
+
+  def test_uncached_command(self):
+    """
+    Other commands are passed through to the node.
+    """
+    wrapper = CachingWrapper(self.adapter)
+
+    self.adapter.seed_response('getTips', {'hashes': ['first']})
+    self.adapter.seed_response('getTips', {'hashes': ['second']})
+
+    self.assertDictEqual(wrapper.send_request({'command': 'getTips'}), {'hashes': ['first']})
+    self.assertDictEqual(wrapper.send_request({'command': 'getTips'}), {'hashes': ['second']})
+
+
+class PoolWrapperTestCase(TestCase):
+  def setUp(self):
+    super(PoolWrapperTestCase, self).setUp()
+
+    self.node1 = MockAdapter()
+    self.node2 = MockAdapter()
+
+  def test_least_outstanding(self):
+    """
+    Requests go to the node with the fewest requests in progress.
+    """
+    wrapper = PoolWrapper([self.node1, self.node2])
+
+    # Pretend that a request is already in progress on the first node.
+    wrapper.nodes[0].outstanding = 1
+
+    self.node2.seed_response('getNodeInfo', {'id': 'node2'})
+
+    self.assertDictEqual(
+      wrapper.send_request({'command': 'getNodeInfo'}),
+      {'id': 'node2'},
+    )
+
+    self.assertEqual(wrapper.nodes[1].outstanding, 0)
+
+  def test_ewma(self):
+    """
+    Requests go to the node with the lowest average latency.
+    """
+    wrapper = PoolWrapper([self.node1, self.node2], strategy='ewma')
+
+    wrapper.nodes[0].latency  = 0.5
+    wrapper.nodes[0].requests = 1
+    wrapper.nodes[1].latency  = 0.1
+    wrapper.nodes[1].requests = 1
+
+    # Latency matters more than outstanding requests.
+    wrapper.nodes[1].outstanding = 3
+
+    self.node2.seed_response('getNodeInfo', {'id': 'node2'})
+
+    with patch('cornode.adapter.wrappers.clock', Mock(side_effect=[10, 10, 10.5])):
+      wrapper.send_request({'command': 'getNodeInfo'})
+
+    # 0.3 * 0.5 + 0.7 * 0.1
+    self.assertAlmostEqual(wrapper.nodes[1].latency, 0.22)
+
+  def test_failover(self):
+    """
+    Idempotent commands are retried on another node.
+    """
+    wrapper = PoolWrapper([self.node1, self.node2])
+
+    self.node1.seed_response('getTrytes', {'error': 'Node is syncing.'})
+    self.node2.seed_response('getTrytes', {'trytes': []})
+
+    self.assertDictEqual(
+      wrapper.send_request({'command': 'getTrytes', 'hashes': []}),
+      {'trytes': []},
+    )
+
+    self.assertGreater(wrapper.nodes[0].unhealthy_until, 0)
+    self.assertEqual(wrapper.nodes[1].unhealthy_until, 0)
+
+  def test_unhealthy_node_skipped(self):
+    """
+    Unhealthy nodes are avoided until their cooldown expires.
+    """
+    wrapper = PoolWrapper([self.node1, self.node2], cooldown=30)
+
+    self.node1.seed_response('getTips', {'error': 'Node is syncing.'})
+    self.node2.seed_response('getTips', {'hashes': []})
+    self.node2.seed_response('getNodeInfo', {'id': 'node2'})
+    self.node1.seed_response('getNodeInfo', {'id': 'node1'})
+
+    with patch('cornode.adapter.wrappers.clock', Mock(return_value=100)):
+      wrapper.send_request({'command': 'getTips'})
+
+      # The first node would normally be preferred (it's first in the
+      # list, and it has no requests in progress).
+      self.assertDictEqual(
+        wrapper.send_request({'command': 'getNodeInfo'}),
+        {'id': 'node2'},
+      )
+
+    with patch('cornode.adapter.wrappers.clock', Mock(return_value=131)):
+      self.assertDictEqual(
+        wrapper.send_request({'command': 'getNodeInfo'}),
+        {'id': 'node1'},
+      )
+
+  def test_no_retry_non_idempotent(self):
+    """
+    Commands that aren't idempotent are not retried.
+    """
+    wrapper = PoolWrapper([self.node1, self.node2])
+
+    self.node1.seed_response('attachToTangle', {'error': 'Invalid trytes.'})
+
+    with self.assertRaises(BadApiResponse):
+      wrapper.send_request({'command': 'attachToTangle'})
+
+    self.assertListEqual(self.node2.requests, [])
+
+  def test_all_nodes_fail(self):
+    """
+    Every node fails the request.
+    """
+    wrapper = PoolWrapper([self.node1, self.node2])
+
+    self.node1.seed_response('getTips', {'error': 'Node is syncing.'})
+    self.node2.seed_response('getTips', {'error': 'Node is syncing.'})
+
+    with self.assertRaises(BadApiResponse):
+      wrapper.send_request({'command': 'getTips'})
+
+    self.assertEqual(len(self.node1.requests), 1)
+    self.assertEqual(len(self.node2.requests), 1)
+
+  def test_error_no_adapters(self):
+    """
+    The pool must contain at least one node.
+    """
+    with self.assertRaises(ValueError):
+      PoolWrapper([])
+
+
+class SlowAdapter(BaseAdapter):
+  """
+  Adapter that doesn't respond until the test tells it to.
+  """
+  supported_protocols = ()
+
+  def __init__(self, response):
+    super(SlowAdapter, self).__init__()
+
+    self.response = response
+    self.release  = Event()
+    self.requests = []
+
+  def send_request(self, payload, **kwargs):
+    self.requests.append(payload)
+    self.release.wait(5)
+    return self.response
+
+
+class HedgingWrapperTestCase(TestCase):
+  def setUp(self):
+    super(HedgingWrapperTestCase, self).setUp()
+
+    self.primary  = SlowAdapter({'id': 'primary'})
+    self.hedge    = MockAdapter()
+
+    self.wrapper =\
+      HedgingWrapper(self.primary, self.hedge, min_samples=2, max_samples=4)
+
+  def tearDown(self):
+    super(HedgingWrapperTestCase, self).tearDown()
+
+    self.primary.release.set()
+
+  def test_not_enough_samples(self):
+    """
+    Requests are not hedged until there are enough latency samples.
+    """
+    self.primary.release.set()
+
+    self.assertDictEqual(
+      self.wrapper.send_request({'command': 'getBalances'}),
+      {'id': 'primary'},
+    )
+
+    self.assertEqual(len(self.wrapper.latencies['getBalances']), 1)
+    self.assertIsNone(self.wrapper.get_delay('getBalances'))
+    self.assertListEqual(self.hedge.requests, [])
+
+  def test_hedge(self):
+    """
+    The primary node takes too long to respond, so the request is sent
+    to the hedge node.
+    """
+    self.wrapper.latencies['getBalances'] = deque([0.01, 0.02], maxlen=4)
+
+    self.hedge.seed_response('getBalances', {'id': 'hedge'})
+
+    self.assertDictEqual(
+      self.wrapper.send_request({'command': 'getBalances'}),
+      {'id': 'hedge'},
+    )
+
+    self.assertListEqual(self.primary.requests, [{'command': 'getBalances'}])
+    self.assertListEqual(self.hedge.requests, [{'command': 'getBalances'}])
+
+    # Only the primary node's latencies are used to compute the delay.
+    self.assertListEqual(
+      list(self.wrapper.latencies['getBalances']),
+      [0.01, 0.02],
+    )
+
+  def test_hedge_workers_busy(self):
+    """
+    Every worker is busy, so the request is not hedged.
+    """
+    wrapper = HedgingWrapper(
+      self.primary,
+      self.hedge,
+      min_samples = 2,
+      max_workers = 1,
+    )
+
+    wrapper.latencies['getBalances'] = deque([0.01, 0.02], maxlen=4)
+
+    # The primary request occupies the only worker, so the command has
+    # to wait for the primary node.
+    timer = Timer(0.1, self.primary.release.set)
+    timer.start()
+
+    try:
+      self.assertDictEqual(
+        wrapper.send_request({'command': 'getBalances'}),
+        {'id': 'primary'},
+      )
+    finally:
+      timer.cancel()
+
+    self.assertListEqual(self.hedge.requests, [])
+
+  def test_hedge_fails(self):
+    """
+    The hedge node fails, so the primary node's response is used.
+    """
+    self.wrapper.latencies['getBalances'] = deque([0.01, 0.02], maxlen=4)
+
+    self.hedge.seed_response('getBalances', {'error': 'Node is syncing.'})
+
+    # Let the primary node respond after the hedge request fails.
+    original = self.hedge.send_request
+
+    def send_request(payload, **kwargs):
+      try:
+        return original(payload, **kwargs)
+      finally:
+        self.primary.release.set()
+
+    with patch.object(self.hedge, 'send_request', send_request):
+      self.assertDictEqual(
+        self.wrapper.send_request({'command': 'getBalances'}),
+        {'id': 'primary'},
+      )
+
+  def test_command_not_hedged(self):
+    """
+    Commands that change state are never hedged.
+    """
+    self.wrapper.latencies['attachToTangle'] = deque([0.01, 0.02], maxlen=4)
+
+    self.primary.release.set()
+
+    self.assertIsNone(self.wrapper.get_delay('attachToTangle'))
+
+    self.assertDictEqual(
+      self.wrapper.send_request({'command': 'attachToTangle'}),
+      {'id': 'primary'},
+    )
+
+    self.assertListEqual(self.hedge.requests, [])
+
+  def test_get_delay(self):
+    """
+    The delay is a percentile of recent latencies.
+    """
+    wrapper = HedgingWrapper(MockAdapter(), MockAdapter(), percentile=0.9)
+    wrapper.latencies['getTrytes'] = deque([i / 100 for i in range(20, 0, -1)])
+
+    self.assertAlmostEqual(wrapper.get_delay('getTrytes'), 0.18)
+
+  def test_error_percentile(self):
+    """
+    ``percentile`` must be between 0 and 1.
+    """
+    with self.assertRaises(ValueError):
+      HedgingWrapper(MockAdapter(), MockAdapter(), percentile=95)
+
+  def test_error_max_workers(self):
+    """
+    ``max_workers`` must be at least 1.
+    """
+    with self.assertRaises(ValueError):
+      HedgingWrapper(MockAdapter(), MockAdapter(), max_workers=0)
+
+
+class MetricsWrapperTestCase(TestCase):
+  def setUp(self):
+    super(MetricsWrapperTestCase, self).setUp()
+
+    self.adapter = MockAdapter()
+    self.wrapper = MetricsWrapper(self.adapter, buckets=[0.1, 1.0])
+
+  def _send(self, command, latency):
+    """
+    Sends a request that takes the specified number of seconds.
+    """
+    with patch('cornode.adapter.wrappers.clock', Mock(side_effect=[0, latency])):
+      try:
+        self.wrapper.send_request({'command': command})
+      except BadApiResponse:
+        pass
+
+  def test_snapshot(self):
+    """
+    Collecting metrics for each command.
+    """
+    for latency in (0.05, 0.05, 0.5, 2):
+      self.adapter.seed_response('getTrytes', {'trytes': []})
+      self._send('getTrytes', latency)
+
+    self.adapter.seed_response('getBalances', {'error': 'Node is syncing.'})
+    self._send('getBalances', 0.2)
+
+    snapshot = self.wrapper.snapshot()
+
+    self.assertListEqual(sorted(snapshot.keys()), ['getBalances', 'getTrytes'])
+
+    self.assertEqual(snapshot['getTrytes']['requests'], 4)
+    self.assertEqual(snapshot['getTrytes']['errors'], 0)
+    self.assertEqual(snapshot['getBalances']['requests'], 1)
+    self.assertEqual(snapshot['getBalances']['errors'], 1)
+
+    latency = snapshot['getTrytes']['latency']
+
+    self.assertListEqual(
+      latency['buckets'],
+      [(0.1, 2), (1.0, 1), (float('inf'), 1)],
+    )
+
+    self.assertEqual(latency['count'], 4)
+    self.assertAlmostEqual(latency['sum'], 2.6)
+    self.assertAlmostEqual(latency['p50'], 0.1)
+    self.assertAlmostEqual(latency['p90'], 1.0)
+    self.assertAlmostEqual(latency['p99'], 1.0)
+
+    self.assertAlmostEqual(snapshot['getBalances']['latency']['p50'], 0.55)
+
+  def test_reset(self):
+    """
+    Discarding metrics.
+    """
+    self.adapter.seed_response('getTips', {'hashes': []})
+    self.adapter.seed_response('getTips', {'hashes': []})
+
+    self._send('getTips', 0.01)
+
+    self.assertEqual(self.wrapper.snapshot(reset=True)['getTips']['requests'], 1)
+    self.assertDictEqual(self.wrapper.snapshot(), {})
+
+    self._send('getTips', 0.01)
+    self.wrapper.reset()
+
+    self.assertDictEqual(self.wrapper.snapshot(), {})
+
+  def test_sizes(self):
+    """
+    Recording request/response sizes.
+    """
+    wrapper = MetricsWrapper(HttpAdapter('http://localhost:14265'))
+
+    mocked_request = Mock(return_value=create_http_response('{"hashes": []}'))
+
+    with patch('cornode.adapter.request', mocked_request):
+      wrapper.send_request({'command': 'getTips'})
+
+    snapshot = wrapper.snapshot()['getTips']
+
+    self.assertEqual(snapshot['request_bytes'], 22)
+    self.assertEqual(snapshot['response_bytes'], 14)
+
+  def test_sizes_nested_wrapper(self):
+    """
+    Recording sizes when the wrapped adapter is another wrapper.
+    """
+    wrapper =\
+      MetricsWrapper(CachingWrapper(HttpAdapter('http://localhost:14265')))
+
+    mocked_request = Mock(return_value=create_http_response('{"hashes": []}'))
+
+    with patch('cornode.adapter.request', mocked_request):
+      wrapper.send_request({'command': 'getTips'})
+
+    snapshot = wrapper.snapshot()['getTips']
+
+    self.assertEqual(snapshot['request_bytes'], 22)
+    self.assertEqual(snapshot['response_bytes'], 14)
+
+  def test_sizes_shared_adapter(self):
+    """
+    Wrappers that share an adapter only record their own requests.
+    """
+    adapter = HttpAdapter('http://localhost:14265')
+
+    wrapper1 = MetricsWrapper(adapter)
+    wrapper2 = MetricsWrapper(adapter)
+
+    mocked_request =\
+      Mock(side_effect=lambda **kw: create_http_response('{"hashes": []}'))
+
+    with patch('cornode.adapter.request', mocked_request):
+      wrapper1.send_request({'command': 'getTips'})
+      wrapper2.send_request({'command': 'getTips'})
+
+    for wrapper in (wrapper1, wrapper2):
+      snapshot = wrapper.snapshot()['getTips']
+
+      self.assertEqual(snapshot['requests'], 1)
+      self.assertEqual(snapshot['request_bytes'], 22)
+      self.assertEqual(snapshot['response_bytes'], 14)
+
+  def test_export_prometheus(self):
+    """
+    Exporting metrics using the Prometheus text format.
+    """
+    self.adapter.seed_response('getTips', {'hashes': []})
+    self._send('getTips', 0.5)
+
+    output = []
+    self.wrapper.export_prometheus(output.append)
+
+    self.assertEqual(
+      output[0],
+
+      '# HELP cornode_requests_total Number of API requests sent.\n'
+      '# TYPE cornode_requests_total counter\n'
+      'cornode_requests_total{command="getTips"} 1\n'
+      '# HELP cornode_errors_total Number of API requests that failed.\n'
+      '# TYPE cornode_errors_total counter\n'
+      'cornode_errors_total{command="getTips"} 0\n'
+      '# HELP cornode_request_bytes_total Size of API request bodies.\n'
+      '# TYPE cornode_request_bytes_total counter\n'
+      'cornode_request_bytes_total{command="getTips"} 22\n'
+      '# HELP cornode_response_bytes_total Size of API response bodies.\n'
+      '# TYPE cornode_response_bytes_total counter\n'
+      'cornode_response_bytes_total{command="getTips"} 14\n'
+      '# HELP cornode_request_duration_seconds API request latency.\n'
+      '# TYPE cornode_request_duration_seconds histogram\n'
+      'cornode_request_duration_seconds_bucket{command="getTips",le="0.1"} 0\n'
+      'cornode_request_duration_seconds_bucket{command="getTips",le="1.0"} 1\n'
+      'cornode_request_duration_seconds_bucket{command="getTips",le="+Inf"} 1\n'
+      'cornode_request_duration_seconds_sum{command="getTips"} 0.5\n'
+      'cornode_request_duration_seconds_count{command="getTips"} 1\n',
+    )
+
+  def test_export_prometheus_file(self):
+    """
+    Exporting metrics to a file.
+    """
+    directory = mkdtemp()
+    self.addCleanup(rmtree, directory)
+
+    path = join(directory, 'cornode.prom')
+
+    output = self.wrapper.export_prometheus(path)
+
+    with io_open(path, encoding='utf-8') as f:
+      self.assertEqual(f.read(), output)
+
+    self.assertListEqual(listdir(directory), ['cornode.prom'])
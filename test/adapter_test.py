@@ -3,6 +3,8 @@ from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
 import json
+from logging import DEBUG
+from threading import Event, Thread
 from typing import Text
 from unittest import TestCase
 
@@ -346,3 +348,263 @@ class HttpAdapterTestCase(TestCase):
         'Content-type': 'application/json',
       },
     )
+
+
+class HttpAdapterPoolTestCase(TestCase):
+  """
+  Unit tests for :py:class:`HttpAdapter` in pooled mode.
+  """
+  def test_not_pooled_by_default(self):
+    """
+    Pooling is disabled unless the caller asks for it.
+    """
+    adapter = HttpAdapter('http://localhost:14265')
+
+    mocked_request = Mock(return_value=create_http_response('{}'))
+
+    with patch('cornode.adapter.request', mocked_request):
+      adapter.send_request({'command': 'helloWorld'})
+
+    self.assertFalse(adapter.pooled)
+    self.assertEqual(mocked_request.call_count, 1)
+    self.assertIsNone(adapter._session)
+
+  def test_uri_options(self):
+    """
+    Configuring the pool using URI options.
+    """
+    adapter = resolve_adapter(
+      'https://localhost:14265/?pooled=1&pool_maxsize=4&idle_timeout=30',
+    )
+
+    self.assertTrue(adapter.pooled)
+    self.assertEqual(adapter.pool_connections, adapter.DEFAULT_POOL_CONNECTIONS)
+    self.assertEqual(adapter.pool_maxsize, 4)
+    self.assertEqual(adapter.idle_timeout, 30)
+
+    # Pool options are not sent to the node.
+    self.assertEqual(adapter.node_url, 'https://localhost:14265/')
+
+  def test_uri_options_imply_pooled(self):
+    """
+    Specifying pool options without ``pooled`` enables pooling.
+    """
+    adapter = HttpAdapter('http://localhost:14265/?pool_maxsize=2&foo=bar')
+
+    self.assertTrue(adapter.pooled)
+    self.assertEqual(adapter.node_url, 'http://localhost:14265/?foo=bar')
+
+  def test_constructor_overrides_uri(self):
+    """
+    Constructor arguments take precedence over URI options.
+    """
+    adapter = HttpAdapter(
+      'http://localhost:14265/?pooled=1&pool_maxsize=4',
+      pooled        = False,
+      pool_maxsize  = 8,
+    )
+
+    self.assertFalse(adapter.pooled)
+    self.assertEqual(adapter.pool_maxsize, 8)
+
+  def test_error_invalid_uri_option(self):
+    """
+    The URI contains a pool option that can't be parsed.
+    """
+    with self.assertRaises(InvalidUri):
+      HttpAdapter('http://localhost:14265/?pool_maxsize=lots')
+
+  def test_error_invalid_pool_size(self):
+    """
+    The pool size is too small.
+    """
+    with self.assertRaises(ValueError):
+      HttpAdapter('http://localhost:14265', pool_maxsize=0)
+
+  def test_session_reused(self):
+    """
+    Pooled requests reuse the same session.
+    """
+    adapter = HttpAdapter('http://localhost:14265', pooled=True)
+
+    mocked_request = Mock(side_effect=lambda **kw: create_http_response('{}'))
+
+    with patch('cornode.adapter.Session.request', mocked_request):
+      adapter.send_request({'command': 'helloWorld'})
+      session = adapter._session
+      adapter.send_request({'command': 'helloWorld'})
+
+    self.assertEqual(mocked_request.call_count, 2)
+    self.assertIs(adapter._session, session)
+
+    pool = session.get_adapter(adapter.node_url)
+    self.assertEqual(pool._pool_maxsize, adapter.pool_maxsize)
+
+  def test_idle_eviction(self):
+    """
+    The session is replaced after it has been idle for too long.
+    """
+    adapter = HttpAdapter('http://localhost:14265', idle_timeout=30)
+
+    with patch('cornode.adapter.clock', Mock(return_value=100)):
+      session = adapter._get_session()
+      adapter._release_session()
+
+    with patch('cornode.adapter.clock', Mock(return_value=120)):
+      self.assertIs(adapter._get_session(), session)
+      adapter._release_session()
+
+    with patch('cornode.adapter.clock', Mock(return_value=151)):
+      self.assertIsNot(adapter._get_session(), session)
+
+  def test_idle_eviction_request_in_flight(self):
+    """
+    The session is not closed while a request is still in flight, even
+    if that request takes longer than the idle timeout.
+    """
+    adapter = HttpAdapter('http://localhost:14265', idle_timeout=30)
+
+    started   = Event()
+    finish    = Event()
+    responses = []
+
+    # noinspection PyUnusedLocal
+    def mock_request(**kwargs):
+      if not started.is_set():
+        started.set()
+        finish.wait(5)
+
+      return create_http_response('{}')
+
+    def send_slow_request():
+      responses.append(adapter.send_request({'command': 'helloWorld'}))
+
+    mocked_clock = Mock(return_value=100)
+
+    with patch('cornode.adapter.clock', mocked_clock):
+      with patch('cornode.adapter.Session.request', Mock(side_effect=mock_request)):
+        slow_request = Thread(target=send_slow_request)
+        slow_request.start()
+        self.assertTrue(started.wait(5))
+
+        session = adapter._session
+
+        # The first request is still in flight, long after the timeout.
+        mocked_clock.return_value = 200
+
+        with patch.object(session, 'close') as mocked_close:
+          adapter.send_request({'command': 'helloWorld'})
+          self.assertIs(adapter._session, session)
+
+          finish.set()
+          slow_request.join(5)
+
+          mocked_close.assert_not_called()
+
+    self.assertListEqual(responses, [{}])
+
+    # Once the requests have finished, the session is idle again.
+    with patch('cornode.adapter.clock', Mock(return_value=231)):
+      self.assertIsNot(adapter._get_session(), session)
+
+  def test_close(self):
+    """
+    Closing the adapter's connections.
+    """
+    adapter = HttpAdapter('http://localhost:14265', pooled=True)
+    session = adapter._get_session()
+
+    adapter.close()
+
+    self.assertIsNone(adapter._session)
+    self.assertIsNot(adapter._get_session(), session)
+
+
+class HttpAdapterHooksTestCase(TestCase):
+  """
+  Unit tests for :py:meth:`HttpAdapter.add_hook`.
+  """
+  def test_hooks(self):
+    """
+    Hooks are invoked before and after each request.
+    """
+    before  = []
+    after   = []
+
+    adapter = HttpAdapter('http://localhost:14265').add_hook(
+      before  = lambda info: before.append(dict(info)),
+      after   = lambda info: after.append(dict(info)),
+    )
+
+    mocked_request = Mock(return_value=create_http_response('{"id": 42}'))
+
+    with patch('cornode.adapter.clock', Mock(side_effect=[10, 10.25])):
+      with patch('cornode.adapter.request', mocked_request):
+        adapter.send_request({'command': 'helloWorld'})
+
+    self.assertListEqual(
+      before,
+
+      [{
+        'command':        'helloWorld',
+        'request_bytes':  25,
+        'start':          10,
+      }],
+    )
+
+    self.assertListEqual(
+      after,
+
+      [{
+        'command':        'helloWorld',
+        'duration':       0.25,
+        'error':          None,
+        'request_bytes':  25,
+        'response_bytes': 10,
+        'start':          10,
+        'status':         200,
+      }],
+    )
+
+  def test_hooks_error(self):
+    """
+    The "after" hooks are invoked even if the request fails.
+    """
+    after   = []
+    error   = requests.ConnectionError('Connection refused.')
+    adapter = HttpAdapter('http://localhost:14265').add_hook(after=after.append)
+
+    with patch('cornode.adapter.request', Mock(side_effect=error)):
+      with self.assertRaises(requests.ConnectionError):
+        adapter.send_request({'command': 'helloWorld'})
+
+    self.assertEqual(len(after), 1)
+    self.assertIs(after[0]['error'], error)
+    self.assertIsNone(after[0]['response_bytes'])
+    self.assertIsNone(after[0]['status'])
+
+  def test_logging_disabled(self):
+    """
+    Requests are not formatted for the logger unless it will actually
+    log them.
+    """
+    logger = Mock()
+    logger.isEnabledFor.return_value = False
+
+    adapter = HttpAdapter('http://localhost:14265')
+    adapter.set_logger(logger)
+
+    mocked_request = Mock(return_value=create_http_response('{}'))
+
+    with patch('cornode.adapter.request', mocked_request):
+      adapter.send_request({'command': 'helloWorld'})
+
+    logger.isEnabledFor.assert_called_with(DEBUG)
+    self.assertFalse(logger.log.called)
+
+    logger.isEnabledFor.return_value = True
+
+    with patch('cornode.adapter.request', mocked_request):
+      adapter.send_request({'command': 'helloWorld'})
+
+    self.assertEqual(logger.log.call_count, 2)
@@ -0,0 +1,265 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import asyncio
+import json
+from itertools import count
+from unittest import TestCase
+
+from mock import Mock, patch
+
+from cornode import Address, Bundle, TransactionHash
+from cornode.adapter import MockAdapter
+from cornode.adapter.aio import AsyncHttpAdapter, ExecutorAdapter
+from cornode.adapter.sandbox import SandboxAdapter
+from cornode.aio import AsyncStrictcornode, Asynccornode
+from cornode.commands.core import GetNeighborsCommand
+from cornode.crypto.types import Seed
+from test.adapter_test import create_http_response
+
+
+def run(coroutine):
+  """
+  Runs a coroutine in a new event loop.
+  """
+  loop = asyncio.new_event_loop()
+  try:
+    return loop.run_until_complete(coroutine)
+  finally:
+    loop.close()
+
+
+class AsyncStrictcornodeTestCase(TestCase):
+  def setUp(self):
+    super(AsyncStrictcornodeTestCase, self).setUp()
+
+    self.adapter = MockAdapter()
+
+  def test_resolve_http(self):
+    """
+    HTTP URIs use the asynchronous HTTP adapter.
+    """
+    api = AsyncStrictcornode('http://localhost:14265/?pool_maxsize=4')
+
+    self.assertIsInstance(api.adapter, AsyncHttpAdapter)
+    self.assertEqual(api.adapter.pool_maxsize, 4)
+    self.assertEqual(api.adapter.node_url, 'http://localhost:14265/')
+
+  def test_wrap_sync_adapter(self):
+    """
+    Synchronous adapters are sent to an executor.
+    """
+    api = AsyncStrictcornode(self.adapter)
+
+    self.assertIsInstance(api.adapter, ExecutorAdapter)
+    self.assertIs(api.adapter.adapter, self.adapter)
+
+  def test_core_command(self):
+    """
+    Sending a core command.
+    """
+    self.adapter.seed_response('getNeighbors', {'neighbors': []})
+
+    api = AsyncStrictcornode(self.adapter)
+
+    self.assertDictEqual(run(api.get_neighbors()), {'neighbors': []})
+    self.assertListEqual(self.adapter.requests, [{'command': 'getNeighbors'}])
+
+  def test_core_command_wireup(self):
+    """
+    Commands created using attribute access also return coroutines.
+    """
+    self.adapter.seed_response('getNeighbors', {'neighbors': []})
+
+    command = AsyncStrictcornode(self.adapter).getNeighbors
+    self.assertIsInstance(command, GetNeighborsCommand)
+
+    self.assertDictEqual(run(command()), {'neighbors': []})
+    self.assertTrue(command.called)
+
+  def test_concurrent_requests(self):
+    """
+    Sending multiple requests concurrently.
+    """
+    self.adapter.seed_response('getNeighbors', {'neighbors': []})
+    self.adapter.seed_response('getTips', {'hashes': []})
+
+    api = AsyncStrictcornode(self.adapter)
+
+    async def send_requests():
+      return await asyncio.gather(api.get_neighbors(), api.get_tips())
+
+    self.assertListEqual(
+      run(send_requests()),
+      [{'neighbors': []}, {'hashes': []}],
+    )
+
+  def test_invalid_request(self):
+    """
+    Requests are validated when the coroutine runs.
+    """
+    api = AsyncStrictcornode(self.adapter)
+
+    with self.assertRaises(ValueError):
+      run(api.get_trytes(hashes=[b'not valid']))
+
+    self.assertListEqual(self.adapter.requests, [])
+
+  def test_http_adapter(self):
+    """
+    Sending a command through the asynchronous HTTP adapter.
+    """
+    api = AsyncStrictcornode('http://localhost:14265')
+
+    mocked_sender = Mock(return_value=create_http_response('{"neighbors": []}'))
+
+    with patch('cornode.adapter.aio.aiohttp', None):
+      with patch.object(api.adapter, '_send_http_request', mocked_sender):
+        response = run(api.get_neighbors())
+
+    self.assertDictEqual(response, {'neighbors': []})
+    self.assertEqual(mocked_sender.call_count, 1)
+
+
+class AsynccornodeTestCase(TestCase):
+  # noinspection SpellCheckingInspection
+  def setUp(self):
+    super(AsynccornodeTestCase, self).setUp()
+
+    self.adapter = MockAdapter()
+
+    self.addy1 =\
+      Address(
+        b'TESTVALUEONE9DONTUSEINPRODUCTION99999YDZ'
+        b'E9TAFAJGJA9CECKDAEPHBICDR9LHFCOFRBQDHC9IG',
+
+        key_index = 0,
+      )
+
+    self.addy2 =\
+      Address(
+        b'TESTVALUETWO9DONTUSEINPRODUCTION99999TES'
+        b'GINEIDLEEHRAOGEBMDLENFDAFCHEIHZ9EBZDD9YHL',
+
+        key_index = 1,
+      )
+
+    self.hash1 =\
+      TransactionHash(
+        b'TESTVALUE9DONTUSEINPRODUCTION99999O99IDB'
+        b'MBPAPDXBSDWAMHV9DASEGCOGHBV9VAF9UGRHFDPFJ'
+      )
+
+  def test_extended_command(self):
+    """
+    Sending an extended command, which runs in an executor.
+    """
+    self.adapter.seed_response('getNodeInfo', {
+      'latestSolidSubtangleMilestone': self.hash1,
+    })
+
+    self.adapter.seed_response('getInclusionStates', {
+      'states': [True],
+    })
+
+    api = Asynccornode(self.adapter)
+
+    self.assertDictEqual(
+      run(api.get_latest_inclusion([self.hash1])),
+      {'states': {self.hash1: True}},
+    )
+
+  def test_get_account_data(self):
+    """
+    Loading account data, with balances and bundles fetched
+    concurrently.
+    """
+    self.adapter.seed_response('getBalances', {
+      'balances': [42, 0],
+      'milestone': self.hash1,
+      'milestoneIndex': 1,
+    })
+
+    # noinspection PyUnusedLocal
+    def mock_iter_used_addresses(
+        adapter,
+        seed,
+        start,
+        gap_limit,
+        window_size,
+    ):
+      yield self.addy1, [self.hash1]
+      yield self.addy2, [self.hash1]
+
+    bundles = [Bundle(), Bundle()]
+    mock_get_bundles = Mock(return_value=bundles)
+
+    api = Asynccornode(self.adapter, Seed.random())
+
+    with patch('cornode.aio.iter_used_addresses', mock_iter_used_addresses):
+      with patch('cornode.aio.get_bundles_from_transaction_hashes', mock_get_bundles):
+        response = run(api.get_account_data())
+
+    self.assertDictEqual(
+      response,
+
+      {
+        'addresses':  [self.addy1, self.addy2],
+        'balance':    42,
+        'bundles':    bundles,
+      },
+    )
+
+    self.assertListEqual(
+      mock_get_bundles.call_args[1]['transaction_hashes'],
+      [self.hash1, self.hash1],
+    )
+
+  def test_get_account_data_no_transactions(self):
+    """
+    Loading account data for a seed that hasn't been used yet.
+    """
+    with patch('cornode.aio.iter_used_addresses', Mock(return_value=[])):
+      response = run(Asynccornode(self.adapter).get_account_data())
+
+    self.assertDictEqual(
+      response,
+
+      {
+        'addresses':  [],
+        'balance':    0,
+        'bundles':    [],
+      },
+    )
+
+
+class SandboxJobAwaitTestCase(TestCase):
+  def test_await(self):
+    """
+    Waiting for a :py:class:`cornode.adapter.sandbox.SandboxJob` in a
+    coroutine.
+    """
+    adapter = SandboxAdapter('https://localhost', 'ACCESS-TOKEN', 1, 100)
+
+    job = {
+      'id':       '70fef55d-6933-49fb-ae17-ec5d02bc9117',
+      'status':   'QUEUED',
+      'command':  'helloWorld',
+    }
+
+    finished = dict(job, status='FINISHED', helloWorldResponse={'id': 42})
+
+    mocked_sender = Mock(side_effect=[
+      create_http_response(status=202, content=json.dumps(job)),
+      create_http_response(json.dumps(finished)),
+    ])
+
+    async def submit():
+      return await adapter.submit({'command': 'helloWorld'})
+
+    with patch('cornode.adapter.sandbox.clock', Mock(side_effect=count())):
+      with patch.object(adapter, '_send_http_request', mocked_sender):
+        response = run(asyncio.wait_for(submit(), 5))
+
+    self.assertDictEqual(response, {'id': 42})
@@ -2,9 +2,13 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from codecs import encode, decode
+from codecs import decode, encode, getincrementaldecoder, \
+  getincrementalencoder, getreader, getwriter
+from io import BytesIO
 from unittest import TestCase
 
+from mock import patch
+from six import binary_type
 
 # noinspection SpellCheckingInspection
 from cornode.codecs import TrytesDecodeError
@@ -104,3 +108,132 @@ class TrytesCodecTestCase(TestCase):
       decode(b'ZJVYUGTDRPDYFGFXMK', 'trytes', 'replace'),
       b'??\xd2\x80??\xc3??',
     )
+
+  def test_decode_invalid_character_errors_strict(self):
+    """
+    Attempting to decode a sequence that contains a character that is
+      not a tryte, with errors='strict'.
+    """
+    with self.assertRaises(TrytesDecodeError):
+      decode(b'RBTC9D9DCDQAEASBYBCCKBF!', 'trytes', 'strict')
+
+  def test_decode_invalid_character_errors_replace(self):
+    """
+    Attempting to decode a sequence that contains a character that is
+      not a tryte, with errors='replace'.
+    """
+    self.assertEqual(
+      decode(b'RBTC9D9DCDQAEASBYBCCKBF!', 'trytes', 'replace'),
+      b'Hello, IOTA?',
+    )
+
+  def test_round_trip_all_bytes(self):
+    """
+    Every byte value survives a round trip, with and without NumPy.
+    """
+    bytes_ = binary_type(bytearray(range(256))) * 4
+    trytes = encode(bytes_, 'trytes')
+
+    self.assertEqual(len(trytes), len(bytes_) * 2)
+    self.assertEqual(decode(trytes, 'trytes'), bytes_)
+
+    with patch('cornode.codecs.np', None):
+      self.assertEqual(encode(bytes_, 'trytes'), trytes)
+      self.assertEqual(decode(trytes, 'trytes'), bytes_)
+
+      with self.assertRaises(TrytesDecodeError):
+        decode(b'ZJVYUGTDRPDYFGFXMK', 'trytes', 'strict')
+
+
+# noinspection SpellCheckingInspection
+class TrytesIncrementalCodecTestCase(TestCase):
+  def test_incremental_encoder(self):
+    """
+    Encoding bytes one chunk at a time.
+    """
+    encoder = getincrementalencoder('trytes')()
+
+    self.assertEqual(
+      b''.join([
+        encoder.encode(b'Hello, '),
+        encoder.encode(b'IOTA!'),
+        encoder.encode(b'', final=True),
+      ]),
+
+      b'RBTC9D9DCDQAEASBYBCCKBFA',
+    )
+
+  def test_incremental_decoder(self):
+    """
+    Decoding trytes one chunk at a time, with pairs of trytes split
+    across chunks.
+    """
+    decoder = getincrementaldecoder('trytes')()
+
+    self.assertEqual(decoder.decode(b'RBTC9'), b'He')
+    self.assertEqual(decoder.decode(b'D9DCDQAEAS'), b'llo, ')
+    self.assertEqual(decoder.decode(b'BYBCCKBFA', final=True), b'IOTA!')
+
+  def test_incremental_decoder_wrong_length(self):
+    """
+    The final chunk leaves half of a pair of trytes undecoded.
+    """
+    decoder = getincrementaldecoder('trytes')()
+
+    self.assertEqual(decoder.decode(b'RBTC9'), b'He')
+
+    with self.assertRaises(TrytesDecodeError):
+      decoder.decode(b'', final=True)
+
+  def test_stream_reader(self):
+    """
+    Decoding trytes from a stream.
+    """
+    reader = getreader('trytes')(BytesIO(b'RBTC9D9DCDQAEASBYBCCKBFA'))
+
+    self.assertEqual(reader.read(chars=2), b'He')
+    self.assertEqual(reader.read(), b'llo, IOTA!')
+
+  def test_stream_reader_chunks(self):
+    """
+    Decoding trytes from a stream, in chunks that split pairs of
+    trytes.
+    """
+    reader = getreader('trytes')(BytesIO(b'RBTC9D9DCDQAEASBYBCCKBFA'))
+
+    self.assertEqual(
+      b''.join(iter(lambda: reader.read(5), b'')),
+      b'Hello, IOTA!',
+    )
+
+  def test_stream_reader_truncated_errors_strict(self):
+    """
+    The stream ends in the middle of a pair of trytes, with
+      errors='strict'.
+    """
+    reader = getreader('trytes')(BytesIO(b'RBTC9D9DCDQAEASBYBCCKBFA9'))
+
+    with self.assertRaises(TrytesDecodeError):
+      reader.read()
+
+  def test_stream_reader_truncated_errors_replace(self):
+    """
+    The stream ends in the middle of a pair of trytes, with
+      errors='replace'.
+    """
+    reader =\
+      getreader('trytes')(BytesIO(b'RBTC9D9DCDQAEASBYBCCKBFA9'), 'replace')
+
+    self.assertEqual(reader.read(), b'Hello, IOTA!?')
+
+  def test_stream_writer(self):
+    """
+    Encoding bytes to a stream.
+    """
+    stream = BytesIO()
+    writer = getwriter('trytes')(stream)
+
+    writer.write(b'Hello, ')
+    writer.write(b'IOTA!')
+
+    self.assertEqual(stream.getvalue(), b'RBTC9D9DCDQAEASBYBCCKBFA')
@@ -37,6 +37,8 @@ class GetAccountDataRequestFilterTestCase(BaseFilterTestCase):
       'start':            0,
       'stop':             10,
       'inclusionStates':  True,
+      'gapLimit':         2,
+      'windowSize':       8,
     }
 
     filter_ = self._filter(request)
@@ -58,6 +60,8 @@ class GetAccountDataRequestFilterTestCase(BaseFilterTestCase):
       'start':            42,
       'stop':             86,
       'inclusionStates':  True,
+      'gapLimit':         2,
+      'windowSize':       8,
     })
 
     self.assertFilterPasses(filter_)
@@ -69,6 +73,8 @@ class GetAccountDataRequestFilterTestCase(BaseFilterTestCase):
         'start':            42,
         'stop':             86,
         'inclusionStates':  True,
+        'gapLimit':         2,
+        'windowSize':       8,
       },
     )
 
@@ -89,6 +95,8 @@ class GetAccountDataRequestFilterTestCase(BaseFilterTestCase):
         'start':            0,
         'stop':             None,
         'inclusionStates':  False,
+        'gapLimit':         1,
+        'windowSize':       32,
       }
     )
 
@@ -367,7 +375,13 @@ class GetAccountDataCommandTestCase(TestCase):
     Loading account data for an account.
     """
     # noinspection PyUnusedLocal
-    def mock_iter_used_addresses(adapter, seed, start):
+    def mock_iter_used_addresses(
+        adapter,
+        seed,
+        start,
+        gap_limit,
+        window_size,
+    ):
       """
       Mocks the ``iter_used_addresses`` function, so that we can
       simulate its functionality without actually connecting to the
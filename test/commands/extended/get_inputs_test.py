@@ -37,6 +37,8 @@ class GetInputsRequestFilterTestCase(BaseFilterTestCase):
       'start':      0,
       'stop':       10,
       'threshold':  100,
+      'gapLimit':   2,
+      'windowSize': 8,
     }
 
     filter_ = self._filter(request)
@@ -58,6 +60,8 @@ class GetInputsRequestFilterTestCase(BaseFilterTestCase):
       'start':      42,
       'stop':       86,
       'threshold':  99,
+      'gapLimit':   2,
+      'windowSize': 8,
     })
 
     self.assertFilterPasses(filter_)
@@ -69,6 +73,8 @@ class GetInputsRequestFilterTestCase(BaseFilterTestCase):
         'start':      42,
         'stop':       86,
         'threshold':  99,
+        'gapLimit':   2,
+        'windowSize': 8,
       },
     )
 
@@ -89,6 +95,8 @@ class GetInputsRequestFilterTestCase(BaseFilterTestCase):
         'start':      0,
         'stop':       None,
         'threshold':  None,
+        'gapLimit':   1,
+        'windowSize': 32,
       }
     )
 
@@ -566,8 +574,17 @@ class GetInputsCommandTestCase(TestCase):
       ],
     })
 
+    # The second and third addresses are checked in the same request,
+    # so ``getInputs`` has to check the second address by itself to
+    # figure out which of the addresses are used.
+    # noinspection SpellCheckingInspection
     self.adapter.seed_response('findTransactions', {
-      'hashes': [],
+      'hashes': [
+        TransactionHash(
+          b'TESTVALUE9DONTUSEINPRODUCTION99999YFXGOD'
+          b'GISBJAX9PDJIRDMDV9DCRDCAEG9FN9KECCBDDFZ9H'
+        ),
+      ],
     })
 
     # To keep the unit test nice and speedy, we will mock the address
@@ -663,8 +680,17 @@ class GetInputsCommandTestCase(TestCase):
       ],
     })
 
+    # The second and third addresses are checked in the same request,
+    # so ``getInputs`` has to check the second address by itself to
+    # figure out which of the addresses are used.
+    # noinspection SpellCheckingInspection
     self.adapter.seed_response('findTransactions', {
-      'hashes': [],
+      'hashes': [
+        TransactionHash(
+          b'TESTVALUE9DONTUSEINPRODUCTION99999YFXGOD'
+          b'GISBJAX9PDJIRDMDV9DCRDCAEG9FN9KECCBDDFZ9H'
+        ),
+      ],
     })
 
     # To keep the unit test nice and speedy, we will mock the address
@@ -726,8 +752,17 @@ class GetInputsCommandTestCase(TestCase):
       ],
     })
 
+    # The second and third addresses are checked in the same request,
+    # so ``getInputs`` has to check the second address by itself to
+    # figure out which of the addresses are used.
+    # noinspection SpellCheckingInspection
     self.adapter.seed_response('findTransactions', {
-      'hashes': [],
+      'hashes': [
+        TransactionHash(
+          b'TESTVALUE9DONTUSEINPRODUCTION99999YFXGOD'
+          b'GISBJAX9PDJIRDMDV9DCRDCAEG9FN9KECCBDDFZ9H'
+        ),
+      ],
     })
 
     # To keep the unit test nice and speedy, we will mock the address
@@ -764,6 +799,88 @@ class GetInputsCommandTestCase(TestCase):
     self.assertEqual(input1.balance, 29)
     self.assertEqual(input1.key_index, 1)
 
+  def test_no_stop_gap_limit(self):
+    """
+    No ``stop`` provided, using ``gapLimit`` to skip over a gap of
+    unused addresses.
+    """
+    addy3 = Address(b'TESTVALUE9DONTUSEINPRODUCTION99999ADDYTHREE')
+    addy4 = Address(b'TESTVALUE9DONTUSEINPRODUCTION99999ADDYFOUR')
+
+    self.adapter.seed_response('getBalances', {
+      'balances': [42, 86],
+    })
+
+    # ``self.addy1`` is unused, but ``self.addy2`` is used, so the
+    # command has to keep going until it finds two unused addresses in
+    # a row.
+    # noinspection SpellCheckingInspection
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [
+        TransactionHash(
+          b'TESTVALUE9DONTUSEINPRODUCTION99999WBL9KD'
+          b'EIZDMEDFPEYDIIA9LEMEUCC9MFPBY9TEVCUGSEGGN'
+        ),
+      ],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    # noinspection SpellCheckingInspection
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [
+        TransactionHash(
+          b'TESTVALUE9DONTUSEINPRODUCTION99999YFXGOD'
+          b'GISBJAX9PDJIRDMDV9DCRDCAEG9FN9KECCBDDFZ9H'
+        ),
+      ],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    # To keep the unit test nice and speedy, we will mock the address
+    # generator.  We already have plenty of unit tests for that
+    # functionality, so we can get away with mocking it here.
+    # noinspection PyUnusedLocal
+    def mock_address_generator(ag, start, step=1):
+      addresses = [self.addy0, self.addy1, self.addy2, addy3, addy4]
+
+      for addy in addresses[start::step]:
+        yield addy
+
+    with patch(
+        'cornode.crypto.addresses.AddressGenerator.create_iterator',
+        mock_address_generator,
+    ):
+      response = self.command(
+        seed        = Seed.random(),
+        gapLimit    = 2,
+        windowSize  = 1,
+      )
+
+    self.assertEqual(response['totalBalance'], 128)
+    self.assertListEqual(response['inputs'], [self.addy0, self.addy2])
+
+    # Each address was checked separately, and the scan stopped after
+    # the second unused address in a row.
+    self.assertListEqual(
+      [r['addresses'] for r in self.adapter.requests[:-1]],
+      [[self.addy0], [self.addy1], [self.addy2], [addy3], [addy4]],
+    )
+
+    self.assertListEqual(
+      self.adapter.requests[-1]['addresses'],
+      [self.addy0, self.addy2],
+    )
+
   def test_start(self):
     """
     Using ``start`` to offset the key range.
@@ -31,9 +31,11 @@ class GetNewAddressesRequestFilterTestCase(BaseFilterTestCase):
     Request is valid.
     """
     request = {
-      'seed':   Seed(self.seed),
-      'index':  1,
-      'count':  1,
+      'seed':       Seed(self.seed),
+      'index':      1,
+      'count':      1,
+      'gapLimit':   2,
+      'windowSize': 8,
     }
 
     filter_ = self._filter(request)
@@ -54,9 +56,11 @@ class GetNewAddressesRequestFilterTestCase(BaseFilterTestCase):
       filter_.cleaned_data,
 
       {
-        'seed':   Seed(self.seed),
-        'index':  0,
-        'count':  None,
+        'seed':       Seed(self.seed),
+        'index':      0,
+        'count':      None,
+        'gapLimit':   1,
+        'windowSize': 32,
       },
     )
 
@@ -70,8 +74,10 @@ class GetNewAddressesRequestFilterTestCase(BaseFilterTestCase):
       'seed': binary_type(self.seed),
 
       # These values must be integers, however.
-      'index': 100,
-      'count': 8,
+      'index':      100,
+      'count':      8,
+      'gapLimit':   2,
+      'windowSize': 8,
     })
 
     self.assertFilterPasses(filter_)
@@ -79,9 +85,11 @@ class GetNewAddressesRequestFilterTestCase(BaseFilterTestCase):
       filter_.cleaned_data,
 
       {
-        'seed':   Seed(self.seed),
-        'index':  100,
-        'count':  8,
+        'seed':       Seed(self.seed),
+        'index':      100,
+        'count':      8,
+        'gapLimit':   2,
+        'windowSize': 8,
       },
     )
 
@@ -384,3 +392,63 @@ class GetNewAddressesCommandTestCase(TestCase):
         },
       ],
     )
+
+  def test_get_addresses_online_gap_limit(self):
+    """
+    Generate address in online mode, using ``gapLimit`` to skip over a
+    gap of unused addresses.
+    """
+    addy3 = Address(b'ADDYTHREE9')
+    addy4 = Address(b'ADDYFOUR99')
+    addy5 = Address(b'ADDYFIVE99')
+
+    # ``self.addy2`` is unused, but ``addy3`` is used, so the command
+    # returns ``addy4`` (the first of two unused addresses in a row).
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [
+        'ZJVYUGTDRPDYFGFXMKOTV9ZWSGFK9CFPXTITQLQN'
+        'LPPG9YNAARMKNKYQO9GSCSBIOTGMLJUFLZWSY9999',
+      ],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [
+        'TESTVALUE9DONTUSEINPRODUCTION99999YFXGOD'
+        'GISBJAX9PDJIRDMDV9DCRDCAEG9FN9KECCBDDFZ9H',
+      ],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    # noinspection PyUnusedLocal
+    def create_generator(ag, start, step=1):
+      for addy in [self.addy1, self.addy2, addy3, addy4, addy5][start::step]:
+        yield addy
+
+    with patch(
+        target  = 'cornode.crypto.addresses.AddressGenerator.create_iterator',
+        new     = create_generator,
+    ):
+      response = self.command(
+        index       = 0,
+        seed        = b'TESTSEED9DONTUSEINPRODUCTION99999',
+        gapLimit    = 2,
+        windowSize  = 1,
+      )
+
+    self.assertDictEqual(response, {'addresses': [addy4]})
+
+    self.assertListEqual(
+      [r['addresses'] for r in self.adapter.requests],
+      [[self.addy1], [self.addy2], [addy3], [addy4], [addy5]],
+    )
@@ -6,7 +6,10 @@ from unittest import TestCase
 
 import filters as f
 from filters.test import BaseFilterTestCase
-from cornode import Address, cornode, Bundle, Tag, Transaction, TryteString
+from typing import List
+
+from cornode import Address, BadApiResponse, cornode, Bundle, ProposedBundle, \
+  ProposedTransaction, Transaction, TransactionHash, TransactionTrytes
 from cornode.adapter import MockAdapter
 from cornode.commands.extended.get_transfers import GetTransfersCommand, \
   GetTransfersRequestFilter
@@ -36,6 +39,8 @@ class GetTransfersRequestFilterTestCase(BaseFilterTestCase):
       'start':            0,
       'stop':             10,
       'inclusionStates':  True,
+      'gapLimit':         2,
+      'windowSize':       8,
     }
 
     filter_ = self._filter(request)
@@ -57,6 +62,8 @@ class GetTransfersRequestFilterTestCase(BaseFilterTestCase):
       'start':            42,
       'stop':             86,
       'inclusionStates':  True,
+      'gapLimit':         2,
+      'windowSize':       8,
     })
 
     self.assertFilterPasses(filter_)
@@ -68,6 +75,8 @@ class GetTransfersRequestFilterTestCase(BaseFilterTestCase):
         'start':            42,
         'stop':             86,
         'inclusionStates':  True,
+        'gapLimit':         2,
+        'windowSize':       8,
       },
     )
 
@@ -88,6 +97,8 @@ class GetTransfersRequestFilterTestCase(BaseFilterTestCase):
         'start':            0,
         'stop':             None,
         'inclusionStates':  False,
+        'gapLimit':         1,
+        'windowSize':       32,
       }
     )
 
@@ -345,6 +356,56 @@ class GetTransfersCommandTestCase(TestCase):
       GetTransfersCommand,
     )
 
+  def _create_bundle(self):
+    # type: () -> List[TransactionTrytes]
+    """
+    Creates a valid bundle, with each transaction's trunk referencing
+    the next one (the same way that the node would attach it).
+
+    :return:
+      The trytes for each transaction, starting with the tail.
+    """
+    proposed = ProposedBundle([
+      ProposedTransaction(address=self.addy1, value=0, timestamp=1483033814),
+      ProposedTransaction(address=self.addy2, value=0, timestamp=1483033814),
+    ])
+
+    proposed.finalize()
+
+    trytes  = []
+    trunk   = TransactionHash(b'')
+
+    for txn in reversed(list(proposed)):
+      txn.trunk_transaction_hash = trunk
+
+      attached = Transaction.from_tryte_string(txn.as_tryte_string())
+      trytes.insert(0, attached.as_tryte_string())
+      trunk = attached.hash
+
+    return trytes
+
+  def _seed_bundle_responses(self, trytes):
+    # type: (List[TransactionTrytes]) -> None
+    """
+    Seeds the responses that the command uses to fetch the bundle for
+    the tail transaction.
+    """
+    hashes = [Transaction.from_tryte_string(t).hash for t in trytes]
+
+    # The command looks up the tail transaction...
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [trytes[0]],
+    })
+
+    # ... then fetches the rest of its bundle in bulk.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': hashes,
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': trytes,
+    })
+
   def test_full_scan(self):
     """
     Scanning the Tangle for all transfers.
@@ -358,17 +419,16 @@ class GetTransfersCommandTestCase(TestCase):
       for addy in [self.addy1, self.addy2][start::step]:
         yield addy
 
+    trytes = self._create_bundle()
+    tail_hash = Transaction.from_tryte_string(trytes[0]).hash
+
     # The first address received cornode.
     self.adapter.seed_response(
       'findTransactions',
 
       {
         'duration': 42,
-
-        'hashes': [
-          'TESTVALUEFIVE9DONTUSEINPRODUCTION99999VH'
-          'YHRHJETGYCAFZGABTEUBWCWAS9WF99UHBHRHLIOFJ',
-        ],
+        'hashes':   [tail_hash],
       },
     )
 
@@ -382,60 +442,87 @@ class GetTransfersCommandTestCase(TestCase):
       },
     )
 
-    self.adapter.seed_response(
-      'getTrytes',
+    self._seed_bundle_responses(trytes)
 
-      {
-        'duration': 99,
+    with patch(
+        'cornode.crypto.addresses.AddressGenerator.create_iterator',
+        create_generator,
+    ):
+      response = self.command(seed=Seed.random())
 
-        # Thankfully, we do not have to seed a realistic response for
-        # ``getTrytes``, as we will be mocking the ``getBundles``
-        # command that uses on it.
-        'trytes': [''],
-      },
+    self.assertEqual(len(response['bundles']), 1)
+
+    self.assertListEqual(
+      response['bundles'][0].as_tryte_strings(head_to_tail=False),
+      trytes,
     )
 
-    bundle = Bundle([
-      Transaction(
-        address = self.addy1,
-        timestamp = 1483033814,
-
-        # These values are not relevant to the test.
-        hash_ = None,
-        signature_message_fragment = None,
-        value = 42,
-        tag = Tag(b''),
-        current_index = 0,
-        last_index = 0,
-        bundle_hash = None,
-        trunk_transaction_hash = None,
-        branch_transaction_hash = None,
-        nonce = None,
-      )
-    ])
+    self.assertListEqual(
+      [r['command'] for r in self.adapter.requests],
 
-    mock_get_bundles = Mock(return_value={
-      'bundles': [bundle],
-    })
+      [
+        'findTransactions',
+        'findTransactions',
+        'getTrytes',
+        'findTransactions',
+        'getTrytes',
+      ],
+    )
+
+  def test_non_tail_transaction(self):
+    """
+    One of the addresses is only referenced by a non-tail transaction.
+    """
+    # noinspection PyUnusedLocal
+    def create_generator(ag, start, step=1):
+      for addy in [self.addy2][start::step]:
+        yield addy
+
+    trytes  = self._create_bundle()
+    hashes  = [Transaction.from_tryte_string(t).hash for t in trytes]
+
+    self.adapter.seed_response('findTransactions', {'hashes': [hashes[1]]})
+    self.adapter.seed_response('getTrytes', {'trytes': [trytes[1]]})
+    self.adapter.seed_response('findTransactions', {'hashes': hashes})
+    self.adapter.seed_response('getTrytes', {'trytes': trytes})
 
     with patch(
         'cornode.crypto.addresses.AddressGenerator.create_iterator',
         create_generator,
     ):
-      with patch(
-          'cornode.commands.extended.get_bundles.GetBundlesCommand._execute',
-          mock_get_bundles,
-      ):
-        response = self.command(seed=Seed.random())
+      response = self.command(seed=Seed.random(), stop=1)
 
-    self.assertDictEqual(
-      response,
+    self.assertEqual(len(response['bundles']), 1)
 
-      {
-        'bundles': [bundle],
-      },
+    self.assertListEqual(
+      response['bundles'][0].as_tryte_strings(head_to_tail=False),
+      trytes,
     )
 
+  def test_bundle_not_visible(self):
+    """
+    The node is missing one of the transactions in a bundle.
+    """
+    # noinspection PyUnusedLocal
+    def create_generator(ag, start, step=1):
+      for addy in [self.addy1][start::step]:
+        yield addy
+
+    trytes    = self._create_bundle()
+    tail_hash = Transaction.from_tryte_string(trytes[0]).hash
+
+    self.adapter.seed_response('findTransactions', {'hashes': [tail_hash]})
+    self.adapter.seed_response('getTrytes', {'trytes': [trytes[0]]})
+    self.adapter.seed_response('findTransactions', {'hashes': [tail_hash]})
+    self.adapter.seed_response('getTrytes', {'trytes': [trytes[0]]})
+
+    with patch(
+        'cornode.crypto.addresses.AddressGenerator.create_iterator',
+        create_generator,
+    ):
+      with self.assertRaises(BadApiResponse):
+        self.command(seed=Seed.random(), stop=1)
+
   def test_no_transactions(self):
     """
     There are no transactions for the specified seed.
@@ -477,17 +564,16 @@ class GetTransfersCommandTestCase(TestCase):
       for addy in [None, self.addy1, self.addy2][start::step]:
         yield addy
 
+    trytes = self._create_bundle()
+    tail_hash = Transaction.from_tryte_string(trytes[0]).hash
+
     # The first address received cornode.
     self.adapter.seed_response(
       'findTransactions',
 
       {
         'duration': 42,
-
-        'hashes': [
-          'TESTVALUEFIVE9DONTUSEINPRODUCTION99999VH'
-          'YHRHJETGYCAFZGABTEUBWCWAS9WF99UHBHRHLIOFJ',
-        ],
+        'hashes':   [tail_hash],
       },
     )
 
@@ -501,54 +587,19 @@ class GetTransfersCommandTestCase(TestCase):
       },
     )
 
-    self.adapter.seed_response(
-      'getTrytes',
-
-      {
-        'duration': 99,
-        'trytes':   [''],
-      },
-    )
-
-    bundle = Bundle([
-      Transaction(
-        address = self.addy1,
-        timestamp = 1483033814,
-
-        # These values are not relevant to the test.
-        hash_ = None,
-        signature_message_fragment = None,
-        value = 42,
-        tag = Tag(b''),
-        current_index = 0,
-        last_index = 0,
-        bundle_hash = None,
-        trunk_transaction_hash = None,
-        branch_transaction_hash = None,
-        nonce = None,
-      )
-    ])
-
-    mock_get_bundles = Mock(return_value={
-      'bundles': [bundle],
-    })
+    self._seed_bundle_responses(trytes)
 
     with patch(
         'cornode.crypto.addresses.AddressGenerator.create_iterator',
         create_generator,
     ):
-      with patch(
-          'cornode.commands.extended.get_bundles.GetBundlesCommand._execute',
-          mock_get_bundles,
-      ):
-        response = self.command(seed=Seed.random(), start=1)
+      response = self.command(seed=Seed.random(), start=1)
 
-    self.assertDictEqual(
-      response,
+    self.assertEqual(len(response['bundles']), 1)
 
-      {
-        'bundles': [bundle],
-      },
+    self.assertListEqual(
+      response['bundles'][0].as_tryte_strings(head_to_tail=False),
+      trytes,
     )
 
   def test_stop(self):
@@ -562,68 +613,32 @@ class GetTransfersCommandTestCase(TestCase):
       for addy in [self.addy1, None][start::step]:
         yield addy
 
+    trytes = self._create_bundle()
+    tail_hash = Transaction.from_tryte_string(trytes[0]).hash
+
     # The first address received cornode.
     self.adapter.seed_response(
       'findTransactions',
 
       {
         'duration': 42,
-
-        'hashes': [
-          'TESTVALUEFIVE9DONTUSEINPRODUCTION99999VH'
-          'YHRHJETGYCAFZGABTEUBWCWAS9WF99UHBHRHLIOFJ',
-        ],
+        'hashes':   [tail_hash],
       },
     )
 
-    self.adapter.seed_response(
-      'getTrytes',
-
-      {
-        'duration': 99,
-        'trytes':   [''],
-      },
-    )
-
-    bundle = Bundle([
-      Transaction(
-        address = self.addy1,
-        timestamp = 1483033814,
-
-        # These values are not relevant to the test.
-        hash_ = None,
-        signature_message_fragment = None,
-        value = 42,
-        tag = Tag(b''),
-        current_index = 0,
-        last_index = 0,
-        bundle_hash = None,
-        trunk_transaction_hash = None,
-        branch_transaction_hash = None,
-        nonce = None,
-      )
-    ])
-
-    mock_get_bundles = Mock(return_value={
-      'bundles': [bundle],
-    })
+    self._seed_bundle_responses(trytes)
 
     with patch(
         'cornode.crypto.addresses.AddressGenerator.create_iterator',
         create_generator,
     ):
-      with patch(
-          'cornode.commands.extended.get_bundles.GetBundlesCommand._execute',
-          mock_get_bundles,
-      ):
-        response = self.command(seed=Seed.random(), stop=1)
+      response = self.command(seed=Seed.random(), stop=1)
 
-    self.assertDictEqual(
-      response,
+    self.assertEqual(len(response['bundles']), 1)
 
-      {
-        'bundles': [bundle],
-      },
+    self.assertListEqual(
+      response['bundles'][0].as_tryte_strings(head_to_tail=False),
+      trytes,
     )
 
   def test_get_inclusion_states(self):
@@ -635,84 +650,24 @@ class GetTransfersCommandTestCase(TestCase):
       for addy in [self.addy1][start::step]:
         yield addy
 
+    trytes = self._create_bundle()
+    tail_hash = Transaction.from_tryte_string(trytes[0]).hash
+
     # The first address received cornode.
     self.adapter.seed_response(
       'findTransactions',
 
       {
         'duration': 42,
-
-        'hashes': [
-          'TESTVALUEFIVE9DONTUSEINPRODUCTION99999VH'
-          'YHRHJETGYCAFZGABTEUBWCWAS9WF99UHBHRHLIOFJ',
-        ],
+        'hashes':   [tail_hash],
       },
     )
 
-    # For this test, we have to generate a real TryteString.
-    transaction_trytes =\
-      TryteString(
-        b'KMYUMNEUAYODAQSNGWTAERRRHNZBZCOLMVVOBTVWLOFYCJKYMGRAMH9RQ9MTZOSZMH'
-        b'QNZFHFEJEDFQ99HSUNVOTULDJGXEDULS9ZHABVDZODJUMCNWVCPNSCUVKVYWCEXBHW'
-        b'RBZBSWFPQLWZWMUPGQIGAEGOVE9DDXBVCIPKQYCFZFBELTSMVFSIXLPTACTKAFMCTK'
-        b'CPYD9BWDJMLKWAOBDSJNQYAHS9GFIQKZCROLFZJVUEIVXVNBRRLEIWTYVHURUXHSCG'
-        b'DKEIEGPOCXKCYWIBUG9ABYCALYJVFLBNGMS9ARHGTQXBZFLENXCJVKHPVKD9KSAEOL'
-        b'FFVAJCNKLDVHOCDARWUNKARDYMVKFKRSMUTYOUXSBFFYTKRREBDJZTLVUROQFCBXQN'
-        b'SXDDYTZTEBRSXOBMLXHJKSJAVOOVCXATOWNQDWHT9CCUAAJUJKDOQLMAEZACSNFKXZ'
-        b'IGWDQEUEFRZYAOSDNVMSXWYLVDAUXZSHNHAIBEMNPFUGORYUETNJK9UCEMSUJYBBDK'
-        b'BHIPKEINQCGOVYCPKUPJMUCUVZOJSIWYRFMFXYUVSMOUALAQBWIMXBUBXSAETGKJRP'
-        b'AHVAXHQJDMEVSRFYEXUSIEBKMGYCUKFD9JPGUV9AIYUVCRUURKMYUHMVE9OJCYYWTQ'
-        b'WUWFMTBZYFXASHHVCMSWXKBRQFHHQVEQMEULJRWZKLWFFSGGKEHUZZFNDNITSRAUH9'
-        b'PQK9OGLYMVBSHXQLLZHOBBIM9KVUWDLHZRDKQQVLQXGWYXEEVQPDZUO9PVXMALOMRQ'
-        b'VCTHGIZLILSCFKTBRESYZGBZKHXEODNDJZ9GK9ROWYXNGFHZCCBHHZEYEOGWXRGSUD'
-        b'SUZFUAUBXVXZHCUVJSYBWTCYCEDYKZNGWFZYKSQLW9FUYMWDVXKZEWT9SCVMQCODZK'
-        b'DRNKTINTPNOJOLGQJDAJMFWRFSWZJLYZGSTSIDSXLUJBZRZNLEDNBKAUNGTCYUPDRW'
-        b'JOCEBQ9YG9IZLLRMJITISJOTLQMOGXVQIZXHMTJVMMWM9FOIOT9KFZMANEPOEOV9HX'
-        b'JNEGURUKRWDGYNPVGAWMWQVABIJNL9MDXKONEPMYACOZ9BE9UZMAFTKYWPFWIQWAPK'
-        b'GUXQTOQVWYYVZYGQDLBIQDVOZIWGOMGOBAUARICQZVNXD9UVEFBBAJKQBHRHXTBUOW'
-        b'VBFKYQWZWTMMXVKZRIZUBVPQ9XHLJHFHWFZUIZVSNAKBDHDFGJCYQETOMEDTOXIUT9'
-        b'OAJVIHWAGTCNPEZTERMMN9EZEWSJHKQAUMXPBZTNQOEQCVXIMAAYO9NIUFLTCFIMK9'
-        b'9AFAGWJFA9VOFPUDJLRAMORGSUDBLWWKXEDZ9XPQUZSGANGESHKKGGQSGSYDCRLHZD'
-        b'PKA9HKYBKLKKCXYRQQIPXCFETJJDZYPCLUNHGBKEJDRCIHEXKCQQNOV9QFHLGFXOCR'
-        b'HPAFCUTPMY9NOZVQHROYJSCMGRSVMOBWADAZNFIAHWGIQUUZBOVODSFAUNRTXSDU9W'
-        b'EIRBXQNRSJXFRAQGHA9DYOQJGLVZUJKAQ9CTUOTT9ZKQOQNNLJDUPDXZJYPRCVLRZT'
-        b'UCZPNBREYCCKHK9FUWGITAJATFPUOFLZDHPNJYUTXFGNYJOBRD9BVHKZENFXIUYDTL'
-        b'CE9JYIIYMXMCXMWTHOLTQFKFHDLVPGMQNITEUXSYLAQULCZOJVBIPYP9M9X9QCNKBX'
-        b'W9DVJEQFFY9KQVMKNVTAHQVRXUKEM9FZOJLHAGEECZBUHOQFZOSPRXKZOCCKAOHMSV'
-        b'QCFG9CWAHKVWNA9QTLYQI9NKOSHWJCNGPJBLEQPUIWJBIOAWKLBXUCERTSL9FVCLYN'
-        b'ADPYTPKJOIEMAQGWBVGSRCZINXEJODUDCT9FHOUMQM9ZHRMBJYSOMPNMEAJGEHICJI'
-        b'PVXRKCYX9RZVT9TDZIMXGZJAIYJRGIVMSOICSUINRBQILMJOUQYXCYNJ9WGGJFHYTU'
-        b'LWOIPUXXFNTIFNOJRZFSQQNAWBQZOLHHLVGHEPWTKKQEVIPVWZUN9ZBICZ9DZZBVII'
-        b'BF9EPHARZJUFJGBQXQFQIBUECAWRSEKYJNYKNSVBCOWTFBZ9NAHFSAMRBPEYGPRGKW'
-        b'WTWACZOAPEOECUO9OTMGABJVAIICIPXGSXACVINSYEQFTRCQPCEJXZCY9XZWVWVJRZ'
-        b'CYEYNFUUBKPWCHICGJZXKE9GSUDXZYUAPLHAKAHYHDXNPHENTERYMMBQOPSQIDENXK'
-        b'LKCEYCPVTZQLEEJVYJZV9BWU999999999999999999999999999FFL999999999999'
-        b'9999999999999RJQGVD99999999999A99999999USGBXHGJUEWAUAKNPPRHJXDDMQV'
-        b'YDSYZJSDWFYLOQVFGBOSLE9KHFDLDYHUYTXVSFAFCOCLQUHJXTEIQRNBTLHEGJFGVF'
-        b'DJCE9IKAOCSYHLCLWPVVNWNESKLYAJG9FGGZOFXCEYOTWLVIJUHGY9QCU9FMZJY999'
-        b'9999HYBUYQKKRNAVDPVGYBTVDZ9SVQBLCCVLJTPEQWWOIG9CQZIFQKCROH9YHUCNJT'
-        b'SYPBVZVBNESX999999D9TARGPQTNIYRZURQGVHCAWEDRBJIIEJIUZYENVE9LLJQMXH'
-        b'GSUUYUCPSOWBCXVFDCHHAZUDC9LUODYWO'
-      )
-
-    self.adapter.seed_response(
-      'getTrytes',
-
-      {
-        'duration': 99,
-        'trytes':   [binary_type(transaction_trytes)],
-      },
-    )
-
-    transaction = Transaction.from_tryte_string(transaction_trytes)
-
-    mock_get_bundles = Mock(return_value={
-      'bundles': [Bundle([transaction])],
-    })
+    self._seed_bundle_responses(trytes)
 
     mock_get_latest_inclusion = Mock(return_value={
       'states': {
-        transaction.hash: True,
+        tail_hash: True,
       },
     })
 
@@ -721,23 +676,21 @@ class GetTransfersCommandTestCase(TestCase):
         create_generator,
     ):
       with patch(
-          'cornode.commands.extended.get_bundles.GetBundlesCommand._execute',
-          mock_get_bundles,
+        'cornode.commands.extended.get_latest_inclusion.GetLatestInclusionCommand._execute',
+        mock_get_latest_inclusion,
       ):
-        with patch(
-          'cornode.commands.extended.get_latest_inclusion.GetLatestInclusionCommand._execute',
-          mock_get_latest_inclusion,
-        ):
-          response = self.command(
-            seed = Seed.random(),
+        response = self.command(
+          seed = Seed.random(),
 
-            inclusionStates = True,
+          inclusionStates = True,
 
-            # To keep the test focused, only retrieve a single
-            # transaction.
-            start = 0,
-            stop  = 1,
-          )
+          # To keep the test focused, only retrieve a single
+          # transaction.
+          start = 0,
+          stop  = 1,
+        )
 
     bundle = response['bundles'][0] # type: Bundle
+    self.assertTrue(bundle.is_confirmed)
     self.assertTrue(bundle[0].is_confirmed)
+    self.assertTrue(bundle[1].is_confirmed)
@@ -0,0 +1,202 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from itertools import islice
+from unittest import TestCase
+
+from mock import patch
+
+from cornode import Address, ProposedTransaction, Tag, TransactionHash, \
+  cornode
+from cornode.adapter import MockAdapter
+from cornode.adapter.local import LocalTangleAdapter
+from cornode.commands.extended.utils import \
+  get_bundles_from_transaction_hashes, iter_address_hashes, \
+  iter_used_addresses
+from cornode.crypto.types import Seed
+
+
+class IterUsedAddressesTestCase(TestCase):
+  # noinspection SpellCheckingInspection
+  def setUp(self):
+    super(IterUsedAddressesTestCase, self).setUp()
+
+    self.adapter = MockAdapter()
+
+    self.addresses = [
+      Address(b'TESTVALUE9ADDRESS' + (b'9' * i) + b'A', key_index=i)
+        for i in range(7)
+    ]
+
+    self.hashes = [
+      TransactionHash(b'TESTVALUE9HASH' + (b'9' * i) + b'A')
+        for i in range(7)
+    ]
+
+  def _scan(self, generator, **kwargs):
+    """
+    Runs a scan, using a mocked address generator.
+    """
+    # noinspection PyUnusedLocal
+    def mock_address_generator(ag, start, step=1):
+      for addy in self.addresses[start::step]:
+        yield addy
+
+    with patch(
+        'cornode.crypto.addresses.AddressGenerator.create_iterator',
+        mock_address_generator,
+    ):
+      return list(generator(self.adapter, Seed.random(), **kwargs))
+
+  def test_windows(self):
+    """
+    Addresses are checked in windows that double in size.
+    """
+    # Window 1: Address 0 (used).
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hashes[0]],
+    })
+
+    # Window 2: Addresses 1 (used) and 2 (used).
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hashes[1], self.hashes[2], self.hashes[3]],
+    })
+
+    # Address 1 (the first half of the window).  Address 2 gets the
+    # rest of the hashes.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hashes[2]],
+    })
+
+    # Window 3: Addresses 3 (used) through 6 (unused).
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hashes[4]],
+    })
+
+    # Addresses 3 and 4; addresses 5 and 6 must be unused.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hashes[4]],
+    })
+
+    # Address 3; address 4 must be unused.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hashes[4]],
+    })
+
+    self.assertListEqual(
+      self._scan(iter_used_addresses, start=0),
+
+      [
+        (self.addresses[0], [self.hashes[0]]),
+        (self.addresses[1], [self.hashes[2]]),
+        (self.addresses[2], [self.hashes[1], self.hashes[3]]),
+        (self.addresses[3], [self.hashes[4]]),
+      ],
+    )
+
+    # Transactions are never downloaded; the node might not be able to
+    # return them (e.g., after a snapshot).
+    self.assertListEqual(
+      [r['addresses'] for r in self.adapter.requests],
+
+      [
+        self.addresses[0:1],
+        self.addresses[1:3], self.addresses[1:2],
+        self.addresses[3:7], self.addresses[3:5], self.addresses[3:4],
+      ],
+    )
+
+  def test_window_size(self):
+    """
+    Limiting the size of each window.
+    """
+    for _ in range(4):
+      self.adapter.seed_response('findTransactions', {'hashes': []})
+
+    # :py:func:`iter_address_hashes` never stops on its own.
+    def scan(adapter, seed):
+      return islice(iter_address_hashes(adapter, seed, 0, window_size=2), 7)
+
+    self.assertListEqual(
+      self._scan(scan),
+      [(addy, []) for addy in self.addresses],
+    )
+
+    self.assertListEqual(
+      [len(r['addresses']) for r in self.adapter.requests],
+      [1, 2, 2, 2],
+    )
+
+  def test_gap_limit(self):
+    """
+    Skipping over unused addresses, up to the gap limit.
+    """
+    # Window 1: Address 0 (unused).
+    self.adapter.seed_response('findTransactions', {'hashes': []})
+
+    # Window 2: Addresses 1 (used) and 2 (unused).
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hashes[1]],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hashes[1]],
+    })
+
+    # Window 3: Addresses 3 through 6 (unused).
+    self.adapter.seed_response('findTransactions', {'hashes': []})
+
+    self.assertListEqual(
+      self._scan(iter_used_addresses, start=0, gap_limit=2),
+      [(self.addresses[1], [self.hashes[1]])],
+    )
+
+  def test_no_used_addresses(self):
+    """
+    The first address is unused.
+    """
+    self.adapter.seed_response('findTransactions', {'hashes': []})
+
+    self.assertListEqual(self._scan(iter_used_addresses, start=0), [])
+    self.assertEqual(len(self.adapter.requests), 1)
+
+
+class GetBundlesFromTransactionHashesTestCase(TestCase):
+  # noinspection SpellCheckingInspection
+  def test_transaction_hashes_not_recomputed(self):
+    """
+    The hashes of the fetched transactions are not recomputed; the
+    node returns the trytes in the same order as the request.
+    """
+    adapter = LocalTangleAdapter()
+
+    bundle = cornode(adapter).send_transfer(
+      depth     = 3,
+
+      transfers = [
+        ProposedTransaction(
+          address =
+            Address(
+              b'TESTVALUE9DONTUSEINPRODUCTION99999FBFFTG'
+              b'QFWEHEL9KCAFXBJBXGE9HID9XCOHFIDABHDG9AHDR'
+            ),
+
+          tag   = Tag(b'PYOTA9UNIT9TESTS'),
+          value = 0,
+        ),
+      ],
+    )['bundle']
+
+    tail_hash = bundle.tail_transaction.hash
+
+    with patch('cornode.transaction.Curl') as mocked_curl:
+      bundles = get_bundles_from_transaction_hashes(
+        adapter             = adapter,
+        transaction_hashes  = [tail_hash],
+        inclusion_states    = False,
+      )
+
+    self.assertEqual(len(bundles), 1)
+    self.assertEqual(bundles[0].tail_transaction.hash, tail_hash)
+    mocked_curl.assert_not_called()
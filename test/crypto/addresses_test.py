@@ -2,14 +2,19 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from threading import Thread
+from multiprocessing import Process
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event, Thread
 from time import sleep
 from unittest import TestCase
 
 from mock import Mock, patch
 
 from cornode import Address
-from cornode.crypto.addresses import AddressGenerator, MemoryAddressCache
+from cornode.crypto.addresses import AddressGenerator, LruAddressCache, \
+  MemoryAddressCache, SqliteAddressCache
 from cornode.crypto.signing import KeyIterator
 from cornode.crypto.types import Digest, Seed
 
@@ -158,6 +163,28 @@ class AddressGeneratorTestCase(TestCase):
       [self.addy1, self.addy0],
     )
 
+  def test_get_addresses_parallel(self):
+    """
+    Generating addresses using multiple processes.
+    """
+    ag = AddressGenerator(
+      seed = b'TESTSEED9DONTUSEINPRODUCTION99999FFRFYAMRNWLGSGZNYUJNEBNWJQNYF',
+    )
+
+    addresses = ag.get_addresses(start=1, count=2, workers=2)
+
+    self.assertListEqual(addresses, ag.get_addresses(start=1, count=2))
+    self.assertListEqual([a.key_index for a in addresses], [1, 2])
+
+  def test_get_addresses_error_workers_too_small(self):
+    """
+    Providing a ``workers`` value less than 1 to ``get_addresses``.
+    """
+    ag = AddressGenerator(seed=b'')
+
+    with self.assertRaises(ValueError):
+      ag.get_addresses(start=0, workers=0)
+
   def test_generator(self):
     """
     Creating a generator.
@@ -354,6 +381,48 @@ class MemoryAddressCacheTestCase(TestCase):
       generator2.get_addresses(42)
       self.assertEqual(mock_generate_address.call_count, 2)
 
+  def test_cache_hit_advances_generator(self):
+    """
+    A cache hit advances the generator, the same as a cache miss.
+    """
+    AddressGenerator.cache = MemoryAddressCache()
+
+    generator = AddressGenerator(Seed.random())
+    AddressGenerator.cache.set(generator.seed, 0, self.addy)
+
+    # noinspection PyUnusedLocal
+    def mock_generate_address(address_generator, key_iterator):
+      # type: (AddressGenerator, KeyIterator) -> Address
+      address = Address(self.addy, key_index=key_iterator.current)
+      key_iterator.current += key_iterator.step
+      return address
+
+    with patch(
+        'cornode.crypto.addresses.AddressGenerator._generate_address',
+        mock_generate_address,
+    ):
+      addresses = generator.get_addresses(0, count=2)
+
+    self.assertListEqual([a.key_index for a in addresses], [42, 1])
+
+  def test_parallel_cache(self):
+    """
+    Generating addresses in parallel uses the cache.
+    """
+    AddressGenerator.cache = MemoryAddressCache()
+
+    generator = AddressGenerator(Seed.random())
+    AddressGenerator.cache.set(generator.seed, 42, self.addy)
+
+    mock_pool = Mock()
+
+    with patch('cornode.crypto.addresses.Pool', mock_pool):
+      addresses = generator.get_addresses(42, workers=2)
+
+    # All of the addresses were cached, so no processes were needed.
+    mock_pool.assert_not_called()
+    self.assertIs(addresses[0], self.addy)
+
   def test_thread_safety(self):
     """
     Address cache is thread-safe, eliminating invalid cache misses when
@@ -403,3 +472,279 @@ class MemoryAddressCacheTestCase(TestCase):
       # Compare `id` values instead of using ``self.assertIs`` because
       # the failure message is a bit easier to understand.
       self.assertEqual(id(actual), id(expected))
+
+  def test_concurrent_misses_different_keys(self):
+    """
+    Cache misses for different addresses are resolved concurrently.
+    """
+    AddressGenerator.cache = MemoryAddressCache()
+
+    seed = Seed.random()
+
+    started     = [Event(), Event()]
+    concurrent  = [False, False]
+
+    def get_address(index):
+      AddressGenerator(seed).get_addresses(index)
+
+    # noinspection PyUnusedLocal
+    def mock_generate_address(address_generator, key_iterator):
+      # type: (AddressGenerator, KeyIterator) -> Address
+      index = key_iterator.current
+      started[index].set()
+
+      # If the threads were serialized, the other thread would not be
+      # able to start until this one finished.
+      concurrent[index] = started[1 - index].wait(5)
+
+      return Address(self.addy, key_index=index)
+
+    with patch(
+        'cornode.crypto.addresses.AddressGenerator._generate_address',
+        mock_generate_address,
+    ):
+      threads = [Thread(target=get_address, args=(i,)) for i in range(2)]
+
+      for t in threads:
+        t.start()
+
+      for t in threads:
+        t.join()
+
+    self.assertListEqual(concurrent, [True, True])
+
+    # Locks for individual addresses are cleaned up afterwards.
+    # noinspection PyProtectedMember
+    self.assertDictEqual(AddressGenerator.cache._key_locks, {})
+
+
+  def test_cache_lock_waits_for_key_locks(self):
+    """
+    Locking the entire cache waits for threads that have locked
+    individual addresses, and blocks new ones until it is released.
+    """
+    cache = MemoryAddressCache()
+    seed  = Seed.random()
+
+    events = []
+
+    cache_waiting = Event()
+    cache_locked  = Event()
+
+    def lock_cache():
+      cache_waiting.set()
+
+      with cache.acquire_lock():
+        events.append('cache locked')
+        cache_locked.set()
+
+        # Give the other thread a chance to (incorrectly) lock an
+        # address while we hold the cache lock.
+        sleep(0.1)
+        events.append('cache released')
+
+    def lock_address():
+      cache_locked.wait(5)
+
+      with cache.acquire_lock(seed, 1):
+        events.append('address locked')
+
+    with cache.acquire_lock(seed, 0):
+      cache_thread = Thread(target=lock_cache)
+      cache_thread.start()
+      cache_waiting.wait(5)
+
+      # The cache lock must not be acquired while we hold the address
+      # lock.
+      sleep(0.1)
+      events.append('address released')
+
+    address_thread = Thread(target=lock_address)
+    address_thread.start()
+
+    cache_thread.join(5)
+    address_thread.join(5)
+
+    self.assertListEqual(
+      events,
+
+      [
+        'address released',
+        'cache locked',
+        'cache released',
+        'address locked',
+      ],
+    )
+
+    # noinspection PyProtectedMember
+    self.assertDictEqual(cache._key_locks, {})
+
+
+class SqliteAddressCacheTestCase(TestCase):
+  # noinspection SpellCheckingInspection
+  def setUp(self):
+    super(SqliteAddressCacheTestCase, self).setUp()
+
+    self.directory = mkdtemp()
+    self.path = join(self.directory, 'addresses.db')
+
+    self.seed = Seed.random()
+
+    self.addy =\
+      Address(
+        trytes =
+          b'TESTVALUE9DONTUSEINPRODUCTION99999YDZE9T'
+          b'VMAHVAHBALF9LFRJIRH9ZJZZFDRPTEYEALB9T9SCA',
+
+        key_index = 42,
+      )
+
+  def tearDown(self):
+    super(SqliteAddressCacheTestCase, self).tearDown()
+
+    rmtree(self.directory)
+
+  def test_get_set(self):
+    """
+    Caching a single address.
+    """
+    cache = SqliteAddressCache(self.path)
+
+    self.assertIsNone(cache.get(self.seed, 42))
+
+    cache.set(self.seed, 42, self.addy)
+
+    address = cache.get(self.seed, 42)
+    self.assertEqual(address, self.addy)
+    self.assertEqual(address.key_index, 42)
+
+    # Cached addresses are keyed by seed.
+    self.assertIsNone(cache.get(Seed.random(), 42))
+
+  def test_get_set_many(self):
+    """
+    Caching multiple addresses at once.
+    """
+    cache = SqliteAddressCache(self.path)
+
+    cache.set_many(self.seed, {
+      i: Address(self.addy, key_index=i)
+        for i in range(0, 2 * cache.BULK_SIZE, 2)
+    })
+
+    addresses = cache.get_many(self.seed, range(2 * cache.BULK_SIZE))
+
+    # Only the addresses that were cached are returned.
+    self.assertListEqual(
+      sorted(addresses),
+      list(range(0, 2 * cache.BULK_SIZE, 2)),
+    )
+
+    self.assertEqual(addresses[4], self.addy)
+    self.assertEqual(addresses[4].key_index, 4)
+
+  def test_persistence(self):
+    """
+    Cached addresses are still available after reopening the database.
+    """
+    SqliteAddressCache(self.path).set(self.seed, 42, self.addy)
+
+    self.assertEqual(
+      SqliteAddressCache(self.path).get(self.seed, 42),
+      self.addy,
+    )
+
+  def test_multiple_processes(self):
+    """
+    Sharing the database with another process.
+    """
+    cache = SqliteAddressCache(self.path)
+
+    # Open a connection in this process before starting the other one.
+    self.assertIsNone(cache.get(self.seed, 42))
+
+    process = Process(target=cache.set, args=(self.seed, 42, self.addy))
+    process.start()
+    process.join()
+
+    self.assertEqual(process.exitcode, 0)
+    self.assertEqual(cache.get(self.seed, 42), self.addy)
+
+
+class LruAddressCacheTestCase(TestCase):
+  # noinspection SpellCheckingInspection
+  def setUp(self):
+    super(LruAddressCacheTestCase, self).setUp()
+
+    self.seed = Seed.random()
+
+    self.addy =\
+      Address(
+        trytes =
+          b'TESTVALUE9DONTUSEINPRODUCTION99999YDZE9T'
+          b'VMAHVAHBALF9LFRJIRH9ZJZZFDRPTEYEALB9T9SCA',
+
+        key_index = 42,
+      )
+
+  def test_eviction(self):
+    """
+    The least-recently-used address is evicted when the cache is full.
+    """
+    cache = LruAddressCache(max_size=2)
+
+    cache.set(self.seed, 0, self.addy)
+    cache.set(self.seed, 1, self.addy)
+
+    # Using address 0 makes address 1 the least-recently-used.
+    self.assertIs(cache.get(self.seed, 0), self.addy)
+
+    cache.set(self.seed, 2, self.addy)
+
+    self.assertIsNone(cache.get(self.seed, 1))
+    self.assertIs(cache.get(self.seed, 0), self.addy)
+    self.assertIs(cache.get(self.seed, 2), self.addy)
+
+  def test_stats(self):
+    """
+    The cache keeps track of hits, misses and evictions.
+    """
+    cache = LruAddressCache(max_size=1)
+
+    cache.get(self.seed, 0)
+    cache.set(self.seed, 0, self.addy)
+    cache.get(self.seed, 0)
+    cache.set(self.seed, 1, self.addy)
+
+    self.assertDictEqual(
+      cache.stats,
+
+      {
+        'size':       1,
+        'max_size':   1,
+        'hits':       1,
+        'misses':     1,
+        'evictions':  1,
+      },
+    )
+
+    cache.reset_stats()
+
+    self.assertDictEqual(
+      cache.stats,
+
+      {
+        'size':       1,
+        'max_size':   1,
+        'hits':       0,
+        'misses':     0,
+        'evictions':  0,
+      },
+    )
+
+  def test_error_max_size_too_small(self):
+    """
+    Creating a cache that can't hold any addresses.
+    """
+    with self.assertRaises(ValueError):
+      LruAddressCache(max_size=0)
@@ -0,0 +1,103 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from array import array
+from unittest import TestCase, skipIf
+
+from cornode import TryteString
+from cornode.crypto.pycurl import Curl as PythonCurl
+
+try:
+  from cornode.crypto.numpycurl import Curl as NumpyCurl
+except ImportError:
+  NumpyCurl = None
+
+
+# noinspection SpellCheckingInspection
+@skipIf(NumpyCurl is None, 'NumPy is not installed.')
+class NumpyCurlTestCase(TestCase):
+  """
+  Unit tests for the NumPy implementation of Curl.
+
+  The NumPy implementation must always produce exactly the same results
+  as the pure-Python implementation.
+  """
+  def setUp(self):
+    super(NumpyCurlTestCase, self).setUp()
+
+    self.trits = TryteString(
+      b'RBTC9D9DCDQAEASBYBCCKBFA9BCDXCCDFDXCGDPC'
+      b'TESTVALUE9DONTUSEINPRODUCTION99999J9XDHH'
+      b'LHKET9PHTEUAHFFCDCP9ECIDPALFMFSCTCIHMD9CY',
+    ).as_trits()
+
+  def test_absorb_squeeze(self):
+    """
+    Absorbing trits and squeezing out a hash.
+    """
+    expected = []
+    sponge = PythonCurl()
+    sponge.absorb(self.trits)
+    sponge.squeeze(expected)
+
+    actual = []
+    sponge = NumpyCurl()
+    sponge.absorb(self.trits)
+    sponge.squeeze(actual)
+
+    self.assertListEqual(actual, expected)
+
+  def test_squeeze_multiple(self):
+    """
+    Squeezing multiple hashes out of the sponge.
+    """
+    expected  = [0] * 243
+    actual    = [0] * 243
+
+    python_sponge = PythonCurl()
+    python_sponge.absorb(self.trits)
+
+    numpy_sponge = NumpyCurl()
+    numpy_sponge.absorb(self.trits)
+
+    for _ in range(3):
+      python_sponge.squeeze(expected)
+      numpy_sponge.squeeze(actual)
+
+      self.assertListEqual(actual, expected)
+
+  def test_reset(self):
+    """
+    Resetting the sponge between hashes.
+    """
+    sponge = NumpyCurl()
+    sponge.absorb(self.trits)
+    sponge.reset()
+    sponge.absorb(self.trits)
+
+    actual = []
+    sponge.squeeze(actual)
+
+    expected = []
+    sponge = PythonCurl()
+    sponge.absorb(self.trits)
+    sponge.squeeze(expected)
+
+    self.assertListEqual(actual, expected)
+
+  def test_trit_array(self):
+    """
+    Absorbing from and squeezing into trit arrays.
+    """
+    expected = []
+    sponge = PythonCurl()
+    sponge.absorb(self.trits)
+    sponge.squeeze(expected)
+
+    actual = array('b')
+    sponge = NumpyCurl()
+    sponge.absorb(array('b', self.trits))
+    sponge.squeeze(actual)
+
+    self.assertListEqual(actual.tolist(), expected)
@@ -0,0 +1,54 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from threading import Event
+from unittest import TestCase
+
+from cornode import TransactionTrytes
+from cornode.crypto.pow import find_nonce
+from cornode.crypto.pycurl import Curl
+
+
+class FindNonceTestCase(TestCase):
+  def setUp(self):
+    super(FindNonceTestCase, self).setUp()
+
+    self.trits = TransactionTrytes(b'TESTVALUE9DONTUSEINPRODUCTION').as_trits()
+
+  def test_find_nonce(self):
+    """
+    Finding a nonce that satisfies the min weight magnitude.
+    """
+    nonce = find_nonce(self.trits, 5)
+    self.assertEqual(len(nonce), 243)
+
+    hash_ = []
+    sponge = Curl()
+    sponge.absorb(self.trits[:-243] + nonce)
+    sponge.squeeze(hash_)
+
+    self.assertListEqual(hash_[-5:], [0] * 5)
+
+  def test_interrupted(self):
+    """
+    The search is interrupted before it completes.
+    """
+    interrupted = Event()
+    interrupted.set()
+
+    self.assertIsNone(find_nonce(self.trits, 5, interrupted=interrupted))
+
+  def test_fail_min_weight_magnitude_too_large(self):
+    """
+    ``min_weight_magnitude`` is larger than a hash.
+    """
+    with self.assertRaises(ValueError):
+      find_nonce(self.trits, 244)
+
+  def test_fail_wrong_length(self):
+    """
+    The trits do not end with a complete nonce.
+    """
+    with self.assertRaises(ValueError):
+      find_nonce(self.trits[:-1], 5)
@@ -0,0 +1,153 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from array import array
+from unittest import TestCase
+
+from cornode import TryteString
+from cornode.crypto.pycurl import BctCurl, Curl
+
+
+# noinspection SpellCheckingInspection
+class BctCurlTestCase(TestCase):
+  """
+  Unit tests for the bit-sliced implementation of Curl.
+
+  Each lane must always produce exactly the same results as a separate
+  :py:class:`Curl` instance.
+  """
+  def setUp(self):
+    super(BctCurlTestCase, self).setUp()
+
+    self.trit_sequences = [
+      TryteString(
+        b'RBTC9D9DCDQAEASBYBCCKBFA9BCDXCCDFDXCGDPC'
+        b'TESTVALUE9DONTUSEINPRODUCTION99999J9XDHH'
+        b'LHKET9PHTEUAHFFCDCP9ECIDPALFMFSCTCIHMD9CY',
+      ).as_trits(),
+
+      TryteString(
+        b'CCPCBDVC9DTCEAKDXC9D9DEARCWCPCBDVCTCEAHD'
+        b'WCTCEAKDCDFD9DSCSAJ9VDEAGDDDXCPCVDEAQDXC'
+        b'QDEAJDPCGDWCKDCCTCFDTCYBGDSCYBTCQDQDTC9AB',
+      ).as_trits(),
+
+      [0] * 363,
+    ]
+
+  @staticmethod
+  def _hash(trits, count=1):
+    sponge = Curl()
+    sponge.absorb(trits)
+
+    hashes = []
+    for _ in range(count):
+      hash_ = [0] * 243
+      sponge.squeeze(hash_)
+      hashes.append(hash_)
+
+    return hashes
+
+  def test_absorb_squeeze(self):
+    """
+    Absorbing trits into several lanes and squeezing out hashes.
+    """
+    sponge = BctCurl(len(self.trit_sequences))
+    sponge.absorb(self.trit_sequences)
+
+    self.assertListEqual(
+      sponge.squeeze(),
+      [self._hash(t)[0] for t in self.trit_sequences],
+    )
+
+  def test_squeeze_multiple(self):
+    """
+    Squeezing multiple hashes out of each lane.
+    """
+    sponge = BctCurl(len(self.trit_sequences))
+    sponge.absorb(self.trit_sequences)
+
+    expected = [self._hash(t, 3) for t in self.trit_sequences]
+
+    for i in range(3):
+      self.assertListEqual(sponge.squeeze(), [e[i] for e in expected])
+
+  def test_fail_wrong_lane_count(self):
+    """
+    The number of sequences does not match the number of lanes.
+    """
+    sponge = BctCurl(2)
+
+    with self.assertRaises(ValueError):
+      sponge.absorb(self.trit_sequences)
+
+  def test_fail_unequal_lengths(self):
+    """
+    The sequences do not all have the same length.
+    """
+    sponge = BctCurl(2)
+
+    with self.assertRaises(ValueError):
+      sponge.absorb([self.trit_sequences[0], self.trit_sequences[0][:-1]])
+
+
+class CurlTestCase(TestCase):
+  """
+  Unit tests for the pure-Python implementation of Curl.
+  """
+  def test_trit_array(self):
+    """
+    Absorbing from and squeezing into trit arrays.
+    """
+    trytes = TryteString(b'TESTVALUE9DONTUSEINPRODUCTION')
+
+    expected = []
+    sponge = Curl()
+    sponge.absorb(trytes.as_trits())
+    sponge.squeeze(expected)
+
+    actual = array('b')
+    sponge = Curl()
+    sponge.absorb(trytes.as_trit_array())
+    sponge.squeeze(actual)
+
+    self.assertListEqual(actual.tolist(), expected)
+
+    # Same deal with :py:class:`BctCurl`.
+    actual = array('b')
+    sponge = BctCurl(1)
+    sponge.absorb([trytes.as_trit_array()])
+    sponge.squeeze([actual])
+
+    self.assertListEqual(actual.tolist(), expected)
+
+
+class CurlHashManyTestCase(TestCase):
+  """
+  Unit tests for :py:meth:`Curl.hash_many`.
+  """
+  def test_mixed_lengths(self):
+    """
+    Hashing sequences that have different lengths.
+    """
+    trit_sequences = [
+      [(i % 3) - 1] * (243 * (1 + (i % 3)))
+        for i in range(10)
+    ]
+
+    expected = []
+    for trits in trit_sequences:
+      hash_ = [0] * 243
+      sponge = Curl()
+      sponge.absorb(trits)
+      sponge.squeeze(hash_)
+      expected.append(hash_)
+
+    self.assertListEqual(Curl.hash_many(trit_sequences), expected)
+
+  def test_empty(self):
+    """
+    Hashing an empty list of sequences.
+    """
+    self.assertListEqual(Curl.hash_many([]), [])
@@ -5,7 +5,9 @@ from __future__ import absolute_import, division, print_function, \
 from unittest import TestCase
 
 from cornode import Hash, TryteString
-from cornode.crypto.signing import KeyGenerator, SignatureFragmentGenerator
+from cornode.crypto.addresses import AddressGenerator
+from cornode.crypto.signing import KeyGenerator, SignatureFragmentGenerator, \
+  validate_signature_fragments, validate_signatures
 from cornode.crypto.types import PrivateKey
 
 
@@ -809,6 +811,34 @@ class KeyGeneratorTestCase(TestCase):
       ),
     )
 
+  def test_generator_seek(self):
+    """
+    Moving a generator to a different index.
+    """
+    kg = KeyGenerator(
+      seed = b'TESTSEED9DONTUSEINPRODUCTION99999FFRFYAMRNWLGSGZNYUJNEBNWJQNYF',
+    )
+
+    iterator = kg.create_iterator(start=1000000, step=2)
+    iterator.seek(3)
+
+    key = next(iterator)
+    self.assertEqual(key, kg.get_keys(start=3)[0])
+    self.assertEqual(key.key_index, 3)
+
+    # The generator continues from the new index.
+    self.assertEqual(next(iterator).key_index, 5)
+
+  def test_generator_seek_error_negative(self):
+    """
+    Attempting to move a generator to a negative index.
+    """
+    kg = KeyGenerator(b'')
+    iterator = kg.create_iterator()
+
+    with self.assertRaises(ValueError):
+      iterator.seek(-1)
+
 
 # noinspection SpellCheckingInspection
 class SignatureFragmentGeneratorTestCase(TestCase):
@@ -1075,3 +1105,56 @@ class SignatureFragmentGeneratorTestCase(TestCase):
     # in its private key.
     with self.assertRaises(StopIteration):
       next(generator)
+
+
+class ValidateSignaturesTestCase(TestCase):
+  # noinspection SpellCheckingInspection
+  def setUp(self):
+    super(ValidateSignaturesTestCase, self).setUp()
+
+    self.hash_ =\
+      Hash(
+        b'TESTVALUE9DONTUSEINPRODUCTION99999QARFLF'
+        b'TDVATBVFTFCGEHLFJBMHPBOBOHFBSGAGWCM9PG9GX'
+      )
+
+    keys = KeyGenerator(b'SEED').get_keys(start=0, count=2, iterations=2)
+
+    self.signatures = [
+      (
+        list(SignatureFragmentGenerator(key, self.hash_)),
+        self.hash_,
+        AddressGenerator.address_from_digest(key.get_digest()),
+      )
+        for key in keys
+    ]
+
+  def test_valid(self):
+    """
+    Validating multiple signatures at once.
+    """
+    self.assertListEqual(validate_signatures(self.signatures), [True, True])
+
+  def test_invalid(self):
+    """
+    Each signature is validated independently.
+    """
+    (fragments, hash_, public_key) = self.signatures[0]
+    fragments[1] = TryteString(b'9' * len(fragments[1]))
+
+    self.assertListEqual(validate_signatures(self.signatures), [False, True])
+
+    self.assertListEqual(
+      validate_signatures(self.signatures),
+
+      [
+        validate_signature_fragments(fragments, hash_, public_key)
+          for (fragments, hash_, public_key) in self.signatures
+      ],
+    )
+
+  def test_empty(self):
+    """
+    There are no signatures to validate.
+    """
+    self.assertListEqual(validate_signatures([]), [])
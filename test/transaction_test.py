@@ -9,7 +9,8 @@ from mock import patch
 from six import binary_type
 
 from cornode import Address, Bundle, BundleHash, Fragment, Hash, ProposedBundle, \
-  ProposedTransaction, Tag, Transaction, TransactionHash, TransactionTrytes, \
+  LazyTransaction, ProposedTransaction, Tag, Transaction, TransactionHash, \
+  TransactionTrytes, \
   TryteString, trits_from_int
 from cornode.crypto.addresses import AddressGenerator
 from cornode.crypto.signing import KeyGenerator
@@ -868,6 +869,63 @@ class BundleValidatorTestCase(TestCase):
     )
 
 
+  def test_validate_bundles(self):
+    """
+    Validating multiple bundles at once.
+    """
+    invalid_signature = Bundle.from_tryte_strings(self.bundle.as_tryte_strings())
+    invalid_signature[2].signature_message_fragment[:-1] = b'9'
+
+    invalid_balance = Bundle.from_tryte_strings(self.bundle.as_tryte_strings())
+    invalid_balance.transactions[0].value += 1
+
+    validators =\
+      BundleValidator.validate_bundles([
+        self.bundle,
+        invalid_signature,
+        invalid_balance,
+        Bundle(),
+      ])
+
+    self.assertEqual(len(validators), 4)
+    self.assertIs(validators[1].bundle, invalid_signature)
+
+    self.assertListEqual(
+      [v.errors for v in validators],
+
+      [
+        [],
+        ['Transaction 1 has invalid signature (using 2 fragments).'],
+        ['Bundle has invalid balance (expected 0, actual 1).'],
+        [],
+      ],
+    )
+
+  def test_validate_bundles_matches_individual(self):
+    """
+    Validating bundles together produces the same errors, in the same
+    order, as validating them one at a time.
+    """
+    invalid_signature = Bundle.from_tryte_strings(self.bundle.as_tryte_strings())
+    invalid_signature[2].signature_message_fragment[:-1] = b'9'
+
+    missing_fragment = Bundle.from_tryte_strings(self.bundle.as_tryte_strings())
+    missing_fragment[2].value = -1
+    missing_fragment[-1].value += 1
+
+    bundles = [invalid_signature, self.bundle, missing_fragment]
+
+    self.assertListEqual(
+      [v.errors for v in BundleValidator.validate_bundles(bundles)],
+      [BundleValidator(b).errors for b in bundles],
+    )
+
+    self.assertListEqual(
+      BundleValidator.validate_bundles(bundles)[2].errors,
+      ['Transaction 2 has invalid amount (expected 0, actual -1).'],
+    )
+
+
 # noinspection SpellCheckingInspection
 class ProposedBundleTestCase(TestCase):
   def setUp(self):
@@ -1326,6 +1384,61 @@ They both licked their dry lips.
         Fragment.from_trits(trits_from_int(j)),
       )
 
+  def test_sign_inputs_parallel(self):
+    """
+    Signing inputs using multiple processes.
+    """
+    seed = b'TESTVALUE9DONTUSEINPRODUCTION99999'
+    (addy0, addy1) = AddressGenerator(seed).get_addresses(0, 2)
+
+    self.bundle.add_transaction(ProposedTransaction(
+      address =
+        Address(
+          b'TESTVALUE9DONTUSEINPRODUCTION99999QARFLF'
+          b'TDVATBVFTFCGEHLFJBMHPBOBOHFBSGAGWCM9PG9GX'
+        ),
+
+      value = 84,
+    ))
+
+    self.bundle.add_inputs([
+      Address(addy0, balance=42, key_index=0),
+      Address(addy1, balance=42, key_index=1),
+    ])
+
+    self.bundle.finalize()
+
+    self.bundle.sign_inputs(KeyGenerator(seed), workers=2)
+    parallel = [t.signature_message_fragment for t in self.bundle]
+
+    self.bundle.sign_inputs(KeyGenerator(seed))
+    sequential = [t.signature_message_fragment for t in self.bundle]
+
+    self.assertListEqual(parallel, sequential)
+
+    # Sanity check: the signatures are valid.
+    bundle = Bundle.from_tryte_strings(self.bundle.as_tryte_strings())
+    self.assertListEqual(BundleValidator(bundle).errors, [])
+
+  def test_sign_inputs_error_workers_too_small(self):
+    """
+    Providing a ``workers`` value less than 1 to ``sign_inputs``.
+    """
+    self.bundle.add_transaction(ProposedTransaction(
+      address =
+        Address(
+          b'TESTVALUE9DONTUSEINPRODUCTION99999QARFLF'
+          b'TDVATBVFTFCGEHLFJBMHPBOBOHFBSGAGWCM9PG9GX'
+        ),
+
+      value = 0,
+    ))
+
+    self.bundle.finalize()
+
+    with self.assertRaises(ValueError):
+      self.bundle.sign_inputs(KeyGenerator(b''), workers=0)
+
   def test_sign_inputs_error_not_finalized(self):
     """
     Attempting to sign inputs in a bundle that hasn't been finalized
@@ -1677,3 +1790,84 @@ class TransactionTestCase(TestCase):
         b'999999999999999999999999999999999',
       ),
     )
+
+
+# noinspection SpellCheckingInspection
+class LazyTransactionTestCase(TestCase):
+  def setUp(self):
+    super(LazyTransactionTestCase, self).setUp()
+
+    self.trytes =\
+      Transaction(
+        hash_                       = None,
+        signature_message_fragment  = Fragment(b'TESTVALUE9DONTUSEINPRODUCTION'),
+        address                     = Address(b'TESTVALUE9ADDRESS'),
+        value                       = -42,
+        tag                         = Tag(b'TESTVALUE9TAG'),
+        timestamp                   = 1480690413,
+        current_index               = 1,
+        last_index                  = 2,
+        bundle_hash                 = BundleHash(b'TESTVALUE9BUNDLE'),
+        trunk_transaction_hash      = TransactionHash(b'TESTVALUE9TRUNK'),
+        branch_transaction_hash     = TransactionHash(b'TESTVALUE9BRANCH'),
+        nonce                       = Hash(b'TESTVALUE9NONCE'),
+      ).as_tryte_string()
+
+  def test_from_tryte_string(self):
+    """
+    Initializing a LazyTransaction object from a TryteString.
+    """
+    transaction = LazyTransaction.from_tryte_string(self.trytes)
+
+    self.assertIsInstance(transaction, Transaction)
+
+    self.assertDictEqual(
+      transaction.as_json_compatible(),
+      Transaction.from_tryte_string(self.trytes).as_json_compatible(),
+    )
+
+    self.assertIsNone(transaction.is_confirmed)
+
+  def test_fields_decoded_on_demand(self):
+    """
+    Fields are only decoded when they are accessed.
+    """
+    transaction = LazyTransaction.from_tryte_string(self.trytes)
+
+    self.assertEqual(transaction.current_index, 1)
+    self.assertEqual(transaction.bundle_hash, BundleHash(b'TESTVALUE9BUNDLE'))
+
+    self.assertIn('bundle_hash', vars(transaction))
+    self.assertNotIn('hash', vars(transaction))
+    self.assertNotIn('signature_message_fragment', vars(transaction))
+
+  def test_trusted_hash(self):
+    """
+    Providing the transaction hash up front.
+    """
+    hash_ = TransactionHash(b'TESTVALUE9HASH')
+
+    transaction = LazyTransaction.from_tryte_string(self.trytes, hash_)
+
+    # The hash is trusted, even though it doesn't match the trytes.
+    self.assertEqual(transaction.hash, hash_)
+
+  def test_from_tryte_strings(self):
+    """
+    Initializing multiple LazyTransaction objects, with hashes.
+    """
+    hashes = [TransactionHash(b'A'), TransactionHash(b'B')]
+
+    transactions =\
+      LazyTransaction.from_tryte_strings([self.trytes, self.trytes], hashes)
+
+    self.assertListEqual([t.hash for t in transactions], hashes)
+
+  def test_assign_field(self):
+    """
+    Lazy fields can be overwritten like regular attributes.
+    """
+    transaction = LazyTransaction.from_tryte_string(self.trytes)
+    transaction.value = 0
+
+    self.assertEqual(transaction.value, 0)
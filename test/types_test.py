@@ -2,6 +2,7 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
+from array import array
 from os import urandom
 from unittest import TestCase
 
@@ -675,6 +676,18 @@ class TryteStringTestCase(TestCase):
       ],
     )
 
+  def test_as_trit_array(self):
+    """
+    Converting a TryteString into a compact array of trit values.
+    """
+    trytes = TryteString(b'ZJVYUGTDRPDYFGFXMK')
+
+    trit_array = trytes.as_trit_array()
+
+    self.assertIsInstance(trit_array, array)
+    self.assertEqual(trit_array.typecode, 'b')
+    self.assertListEqual(trit_array.tolist(), trytes.as_trits())
+
   def test_from_bytes(self):
     """
     Converting a sequence of bytes into a TryteString.
@@ -794,6 +807,20 @@ class TryteStringTestCase(TestCase):
       b'RBTC',
     )
 
+  def test_from_trits_array(self):
+    """
+    Converting a trit array into a TryteString.
+    """
+    trytes = TryteString(b'RBTC9D9DCDQAEASBYBCCKBFA')
+
+    self.assertEqual(TryteString.from_trits(trytes.as_trit_array()), trytes)
+
+    # Arrays get padded, too.
+    self.assertEqual(
+      binary_type(TryteString.from_trits(array('b', [0, 0, -1, -1, 1]))),
+      b'RB',
+    )
+
 
 # noinspection SpellCheckingInspection
 class AddressTestCase(TestCase):